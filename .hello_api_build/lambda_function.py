@@ -1,14 +1,381 @@
+"""학원 예약 API Lambda (API Gateway proxy / Lambda function URL).
+
+라우트:
+    GET /hello                       요청 method/path 를 돌려주는 상태 확인용
+    GET /catalog/branches            캠퍼스 목록 (campusLocations.json)
+    GET /catalog/courses             과정 목록 (COURSE_VALUES)
+    GET /suggestions?slot=Branch     채팅 UI 의 slot 후보 (Express /api/suggestions 와 같은 모양)
+
+카탈로그는 페이지를 열 때마다 호출되므로 cold start 에서 응답 본문을 bytes 로 미리 직렬화하고
+gzip 본과 ETag 까지 만들어 둡니다. warm 호출은 라우트를 찾고 헤더만 비교합니다.
+
+- ``If-None-Match`` 가 ETag 와 같으면 본문 없이 304
+- ``Accept-Encoding: gzip`` 이면 gzip 본을 base64 로 (REST API 는 binary media type ``*/*`` 필요)
+- 경로 앞의 ``/api`` 는 있어도 없어도 됩니다 (Express 서버와 같은 경로로 호출 가능)
+
+SQS 이벤트(``Records``)가 오면 예약 적재로 처리합니다. 메시지 본문은 fulfillment 의
+``lastReservationSummary`` 와 같은 JSON (reservationId, branch, course, date, time, name, phone) 입니다.
+
+- 배치의 올바른 레코드는 ``executemany`` 한 번으로 넣고 commit 합니다 (reservation_id 중복은 무시)
+- DB 연결은 모듈 전역에 두어 warm 호출에서 재사용합니다
+- 실패한 레코드만 ``batchItemFailures`` 로 돌려줍니다 (event source mapping 에 ReportBatchItemFailures 필요)
+- ``RESERVATION_DB``: ``sqlite:////tmp/reservations.sqlite3`` (기본, 로컬 테스트용),
+  ``mysql://user:pw@host:3306/erp`` (pymysql), ``postgresql://...`` (psycopg2)
+"""
+
+import base64
+import gzip
+import hashlib
+import importlib
 import json
+import os
+import re
+import urllib.parse
 
-def lambda_handler(event, context):
+CATALOG_PATH = os.environ.get("CATALOG_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "campusLocations.json")
+DEFAULT_BRANCH_VALUES = "강남점,홍대점,잠실점,분당점,인천점"
+DEFAULT_COURSE_VALUES = "토익,오픽,영어회화,일본어,자격증"
+CACHE_CONTROL = os.environ.get("CATALOG_CACHE_CONTROL", "public, max-age=300")
+# 이보다 작은 본문은 gzip 해도 헤더/base64 비용이 더 큽니다.
+GZIP_MIN_BYTES = 256
+
+
+def _csv(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def load_branches():
+    try:
+        with open(CATALOG_PATH, encoding="utf-8") as f:
+            campuses = json.load(f)
+    except FileNotFoundError:
+        campuses = []
+    if campuses:
+        return campuses
+    return [{"id": name, "name": name} for name in _csv(os.environ.get("BRANCH_VALUES") or DEFAULT_BRANCH_VALUES)]
+
+
+def load_courses():
+    return [{"id": name, "name": name} for name in _csv(os.environ.get("COURSE_VALUES") or DEFAULT_COURSE_VALUES)]
+
+
+class Prebuilt:
+    """한 번 직렬화해 둔 JSON 응답 (원본/gzip 본문, ETag, 헤더)."""
+
+    def __init__(self, payload, status=200, cache_control=CACHE_CONTROL):
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        self.status = status
+        self.etag = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+        self.text = raw.decode("utf-8")
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Cache-Control": cache_control,
+            "ETag": self.etag,
+            "Vary": "Accept-Encoding",
+        }
+        self.headers = headers
+        self.not_modified_headers = {k: v for k, v in headers.items() if k != "Content-Type"}
+        self.gzip_body = None
+        if len(raw) >= GZIP_MIN_BYTES:
+            # mtime=0: 같은 본문이면 같은 bytes (배포마다 ETag/캐시가 흔들리지 않도록)
+            packed = gzip.compress(raw, compresslevel=9, mtime=0)
+            if len(packed) < len(raw):
+                self.gzip_body = base64.b64encode(packed).decode("ascii")
+                self.gzip_headers = dict(headers, **{"Content-Encoding": "gzip"})
+
+    def matches(self, if_none_match):
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == self.etag:
+                return True
+        return False
+
+    def respond(self, headers, head=False):
+        if self.status == 200 and self.matches(headers.get("if-none-match")):
+            return {"statusCode": 304, "headers": self.not_modified_headers, "body": ""}
+        if self.gzip_body is not None and accepts_gzip(headers.get("accept-encoding")):
+            body, out_headers, encoded = self.gzip_body, self.gzip_headers, True
+        else:
+            body, out_headers, encoded = self.text, self.headers, False
+        return {"statusCode": self.status, "headers": out_headers, "body": "" if head else body, "isBase64Encoded": encoded and not head}
+
+
+def accepts_gzip(accept_encoding):
+    """``gzip`` 항목의 q 값이 있으면 그것을, 없을 때만 ``*`` 의 q 값을 봅니다 (``*;q=0, gzip`` → gzip)."""
+    weights = {}
+    for part in (accept_encoding or "").lower().split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights.setdefault(coding, q)
+    q = weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0)))
+    return q > 0
+
+
+# --- cold start: 카탈로그 응답 미리 만들기 ---------------------------------------------
+
+BRANCHES = load_branches()
+COURSES = load_courses()
+CATALOG = {
+    "branches": Prebuilt({"items": BRANCHES}),
+    "courses": Prebuilt({"items": COURSES}),
+}
+SUGGESTIONS = {
+    "Branch": Prebuilt({"slot": "Branch", "suggestions": [b["name"] for b in BRANCHES if b.get("name")]}),
+    "CourseName": Prebuilt({"slot": "CourseName", "suggestions": [c["name"] for c in COURSES]}),
+}
+EMPTY_SUGGESTIONS = {}
+NOT_FOUND = Prebuilt({"error": "not found"}, status=404, cache_control="no-store")
+
+
+def _empty_suggestions(slot):
+    # 알 수 없는 slot 도 Express 서버처럼 빈 목록으로 답합니다 (slot 이름별로 한 번만 직렬화).
+    if slot not in EMPTY_SUGGESTIONS and len(EMPTY_SUGGESTIONS) < 64:
+        EMPTY_SUGGESTIONS[slot] = Prebuilt({"slot": slot, "suggestions": []})
+    return EMPTY_SUGGESTIONS.get(slot) or Prebuilt({"slot": slot, "suggestions": []})
+
+
+# --- 라우트 ----------------------------------------------------------------------------
+
+
+def hello(event, method, path, params, headers):
     return {
         "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json"
-        },
-        "body": json.dumps({
-            "message": "hello world",
-            "method": event.get("httpMethod"),
-            "path": event.get("path")
-        }, ensure_ascii=False)
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"message": "hello world", "method": method, "path": path}, ensure_ascii=False),
     }
+
+
+def catalog(event, method, path, params, headers):
+    return CATALOG[params["kind"]].respond(headers, method == "HEAD")
+
+
+def suggestions(event, method, path, params, headers):
+    slot = (event.get("queryStringParameters") or {}).get("slot") or ""
+    prebuilt = SUGGESTIONS.get(slot) or _empty_suggestions(slot)
+    return prebuilt.respond(headers, method == "HEAD")
+
+
+def compile_routes(table):
+    """``("GET", "/catalog/{kind:branches|courses}", fn)`` 목록 → (고정 경로 dict, 정규식 목록).
+
+    고정 경로는 dict 한 번으로 찾고, ``{name}``/``{name:regex}`` 가 있는 경로만 정규식으로 맞춥니다.
+    """
+    static, dynamic = {}, []
+    for methods, template, handler in table:
+        methods = frozenset(methods.split("|"))
+        if "{" not in template:
+            for prefix in ("", "/api"):
+                static[prefix + template] = (methods, handler)
+            continue
+        pattern = re.sub(r"\{(\w+)(?::([^}]+))?\}", lambda m: f"(?P<{m.group(1)}>{m.group(2) or '[^/]+'})", template)
+        dynamic.append((re.compile(f"^(?:/api)?{pattern}/?$"), methods, handler))
+    return static, dynamic
+
+
+STATIC_ROUTES, DYNAMIC_ROUTES = compile_routes(
+    [
+        ("GET|HEAD", "/hello", hello),
+        ("GET|HEAD", "/catalog/{kind:branches|courses}", catalog),
+        ("GET|HEAD", "/suggestions", suggestions),
+    ]
+)
+
+
+def match_route(path):
+    route = STATIC_ROUTES.get(path if len(path) < 2 else path.rstrip("/"))
+    if route is not None:
+        return route[0], route[1], {}
+    for pattern, methods, handler in DYNAMIC_ROUTES:
+        found = pattern.match(path)
+        if found:
+            return methods, handler, found.groupdict()
+    return None
+
+
+# --- 예약 적재 (SQS batch) -------------------------------------------------------------
+
+RESERVATION_DB = os.environ.get("RESERVATION_DB", "sqlite:////tmp/reservations.sqlite3")
+RESERVATION_ID_RE = re.compile(r"^R-[0-9A-Z]{4,20}$")
+REQUIRED_FIELDS = ("reservationId", "branch", "course", "date", "name", "phone")
+COLUMNS = ("reservation_id", "branch", "course", "date", "time", "student_name", "phone", "message_id")
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id TEXT PRIMARY KEY,
+    branch TEXT NOT NULL,
+    course TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT,
+    student_name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    message_id TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+)
+"""
+# scheme → (DB-API 모듈, placeholder, 중복 무시 INSERT 형태)
+DRIVERS = {
+    "sqlite": ("sqlite3", "?", "INSERT OR IGNORE INTO reservations ({cols}) VALUES ({marks})"),
+    "mysql": ("pymysql", "%s", "INSERT IGNORE INTO reservations ({cols}) VALUES ({marks})"),
+    "postgresql": ("psycopg2", "%s", "INSERT INTO reservations ({cols}) VALUES ({marks}) ON CONFLICT (reservation_id) DO NOTHING"),
+}
+# executemany 뒤 rowcount 가 배치 전체 합계인 드라이버 (psycopg2 는 마지막 문장 값만 남음)
+ROWCOUNT_TOTAL = frozenset({"sqlite3", "pymysql"})
+
+# (connection, DB-API 모듈, INSERT 문). warm 호출 사이에 재사용합니다.
+_db = None
+
+
+def _connect(url):
+    scheme = url.split(":", 1)[0]
+    if scheme not in DRIVERS:
+        raise ValueError(f"지원하지 않는 RESERVATION_DB: {scheme}")
+    module_name, mark, template = DRIVERS[scheme]
+    driver = importlib.import_module(module_name)
+    if scheme == "sqlite":
+        conn = driver.connect(url[len("sqlite:///") :])
+        conn.executescript(SQLITE_SCHEMA)
+    elif scheme == "mysql":
+        parts = urllib.parse.urlsplit(url)
+        conn = driver.connect(
+            host=parts.hostname,
+            port=parts.port or 3306,
+            user=urllib.parse.unquote(parts.username or ""),
+            password=urllib.parse.unquote(parts.password or ""),
+            database=parts.path.lstrip("/"),
+            charset="utf8mb4",
+            autocommit=False,
+        )
+    else:
+        conn = driver.connect(url)
+    sql = template.format(cols=", ".join(COLUMNS), marks=", ".join([mark] * len(COLUMNS)))
+    return conn, driver, sql
+
+
+def get_db():
+    global _db
+    if _db is None:
+        _db = _connect(RESERVATION_DB)
+    return _db
+
+
+def reset_db():
+    global _db
+    if _db is not None:
+        try:
+            _db[0].close()
+        except Exception:
+            pass
+    _db = None
+
+
+def parse_reservation(record):
+    """SQS 레코드 → INSERT 행. 잘못된 레코드는 ValueError."""
+    body = json.loads(record["body"])
+    if not isinstance(body, dict):
+        raise ValueError("본문이 JSON 객체가 아닙니다")
+    missing = [key for key in REQUIRED_FIELDS if not str(body.get(key) or "").strip()]
+    if missing:
+        raise ValueError(f"필수 값 없음: {', '.join(missing)}")
+    reservation_id = str(body["reservationId"]).strip().upper()
+    if not RESERVATION_ID_RE.match(reservation_id):
+        raise ValueError(f"예약번호 형식 오류: {reservation_id}")
+    values = [str(body.get(key) or "").strip() or None for key in ("branch", "course", "date", "time", "name", "phone")]
+    return (reservation_id, *values, record.get("messageId"))
+
+
+def _log(level, message, **fields):
+    print(json.dumps({"level": level, "message": message, **fields}, ensure_ascii=False))
+
+
+def write_reservations(rows):
+    """``(messageId, 행)`` 목록을 한 번의 executemany 로 넣습니다.
+
+    ``(실패한 messageId 목록, 새로 들어간 행 수)`` 를 돌려줍니다. 이미 있던 예약번호는 무시되므로 세지 않고,
+    드라이버가 배치 합계를 알려주지 않으면 행 수는 ``None`` 입니다.
+    """
+    if not rows:
+        return [], 0
+    ids = [message_id for message_id, _ in rows]
+    try:
+        conn, driver, sql = get_db()
+    except Exception as exc:
+        _log("error", "DB 연결 실패", error=str(exc))
+        return ids, 0
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(sql, [row for _, row in rows])
+        conn.commit()
+        return [], (cursor.rowcount if driver.__name__ in ROWCOUNT_TOTAL and cursor.rowcount >= 0 else None)
+    except (driver.OperationalError, driver.InterfaceError) as exc:
+        # 연결이 끊긴 경우: 다음 호출에서 다시 연결하고 배치 전체를 SQS 가 재전송하게 합니다.
+        _log("error", "DB 연결 오류", error=str(exc))
+        reset_db()
+        return ids, 0
+    except driver.Error as exc:
+        conn.rollback()
+        _log("warn", "배치 INSERT 실패: 레코드별로 다시 시도", error=str(exc))
+    # 제약 조건 위반 같은 데이터 오류는 어느 레코드인지 모르므로 한 건씩 넣어 골라냅니다.
+    failed, inserted = [], 0
+    for message_id, row in rows:
+        try:
+            cursor.execute(sql, row)
+            conn.commit()
+            inserted += max(cursor.rowcount, 0)
+        except driver.Error as exc:
+            conn.rollback()
+            _log("warn", "예약 INSERT 실패", messageId=message_id, error=str(exc))
+            failed.append(message_id)
+    return failed, inserted
+
+
+def ingest_reservations(event):
+    rows, failed, skipped = [], [], 0
+    for record in event["Records"]:
+        message_id = record.get("messageId")
+        if not message_id:
+            # batchItemFailures 에 itemIdentifier 가 없으면 Lambda 가 배치 전체를 실패로 봅니다.
+            _log("error", "messageId 없는 레코드는 건너뜁니다", eventSource=record.get("eventSource"))
+            skipped += 1
+            continue
+        try:
+            rows.append((message_id, parse_reservation(record)))
+        except (KeyError, TypeError, ValueError) as exc:
+            _log("warn", "잘못된 예약 레코드", messageId=message_id, error=str(exc))
+            failed.append(message_id)
+    write_failed, inserted = write_reservations(rows)
+    failed += write_failed
+    _log("info", "예약 적재", received=len(event["Records"]), inserted=inserted, failed=len(failed), skipped=skipped)
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed]}
+
+
+def _request(event):
+    # REST API(v1) 와 HTTP API / function URL(v2) 이벤트를 모두 받습니다.
+    http = (event.get("requestContext") or {}).get("http") or {}
+    method = (event.get("httpMethod") or http.get("method") or "GET").upper()
+    path = event.get("path") or event.get("rawPath") or "/"
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    return method, path, headers
+
+
+def lambda_handler(event, context):
+    if event.get("Records"):
+        return ingest_reservations(event)
+    method, path, headers = _request(event)
+    route = match_route(path)
+    if route is None:
+        return NOT_FOUND.respond(headers)
+    methods, handler, params = route
+    if method not in methods:
+        return {"statusCode": 405, "headers": {"Allow": ", ".join(sorted(methods))}, "body": ""}
+    return handler(event, method, path, params, headers)
@@ -23,7 +23,7 @@ mkdir -p "$WORKDIR"
 # Pre-check
 # ==========================================
 command -v aws >/dev/null 2>&1 || { echo "aws CLI 가 필요합니다."; exit 1; }
-command -v zip >/dev/null 2>&1 || { echo "zip 명령이 필요합니다."; exit 1; }
+command -v python3 >/dev/null 2>&1 || { echo "python3 가 필요합니다."; exit 1; }
 
 ACCOUNT_ID="$(aws sts get-caller-identity --query Account --output text)"
 echo "AWS_ACCOUNT_ID=$ACCOUNT_ID"
@@ -71,30 +71,17 @@ fi
 echo "ROLE_ARN=$ROLE_ARN"
 
 # ==========================================
-# 2) Create Lambda source
+# 2) Package Lambda source
+#    lambda_function.py 는 저장소의 파일을 그대로 씁니다 (라우트/카탈로그 응답 포함).
+#    캠퍼스 카탈로그는 채팅 UI 와 같은 lex-chat-ux/shared/campusLocations.json 을 함께 넣습니다.
+#    infra/lambda_package.py 가 결정적 zip 을 만들고 입력이 같으면 빌드를 건너뜁니다.
+#    의존성이 필요하면 LAMBDA_REQUIREMENTS=requirements.txt, import 시간 상한은 MAX_IMPORT_MS 로 줍니다.
 # ==========================================
-cat > "$PY_FILE" <<'PY'
-import json
-
-def lambda_handler(event, context):
-    return {
-        "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json"
-        },
-        "body": json.dumps({
-            "message": "hello world",
-            "method": event.get("httpMethod"),
-            "path": event.get("path")
-        }, ensure_ascii=False)
-    }
-PY
-
-rm -f "$ZIP_FILE"
-(
-  cd "$WORKDIR"
-  zip -q function.zip lambda_function.py
-)
+[[ -f "$PY_FILE" ]] || { echo "$PY_FILE 이 없습니다."; exit 1; }
+PACKAGE_ARGS=(--source "$WORKDIR" --out "$ZIP_FILE")
+[[ -n "${LAMBDA_REQUIREMENTS:-}" ]] && PACKAGE_ARGS+=(--requirements "$LAMBDA_REQUIREMENTS")
+[[ -n "${MAX_IMPORT_MS:-}" ]] && PACKAGE_ARGS+=(--max-import-ms "$MAX_IMPORT_MS")
+python3 "$(pwd)/infra/lambda_package.py" "${PACKAGE_ARGS[@]}"
 
 # ==========================================
 # 3) Create or update Lambda function
@@ -139,11 +126,21 @@ EXISTING_API_ID="$(aws apigateway get-rest-apis \
 if [[ "$EXISTING_API_ID" != "None" && -n "$EXISTING_API_ID" ]]; then
   API_ID="$EXISTING_API_ID"
   echo "[APIGW] existing API found: $API_NAME ($API_ID)"
+  # gzip 응답(isBase64Encoded)은 binary media type 이 없으면 base64 문자열 그대로 나갑니다.
+  # 아래 6) 에서 stage 를 다시 배포하므로 여기서는 설정만 바꿉니다.
+  if ! aws apigateway get-rest-api --rest-api-id "$API_ID" \
+      --query 'binaryMediaTypes' --output text | tr '\t' '\n' | grep -qxF '*/*'; then
+    echo "[APIGW] adding binary media type */*"
+    aws apigateway update-rest-api \
+      --rest-api-id "$API_ID" \
+      --patch-operations 'op=add,path=/binaryMediaTypes/*~1*' >/dev/null
+  fi
 else
   echo "[APIGW] creating REST API: $API_NAME"
   API_ID="$(aws apigateway create-rest-api \
     --name "$API_NAME" \
     --endpoint-configuration types=REGIONAL \
+    --binary-media-types '*/*' \
     --query 'id' \
     --output text)"
 fi
@@ -157,91 +154,86 @@ echo "API_ID=$API_ID"
 echo "ROOT_RESOURCE_ID=$ROOT_RESOURCE_ID"
 
 # ==========================================
-# 5) Create /hello resource if missing
+# 5) Resource / method / Lambda proxy integration / invoke permission
+#    NOTE: Lambda integration method must be POST
 # ==========================================
-RESOURCE_ID="$(aws apigateway get-resources \
-  --rest-api-id "$API_ID" \
-  --query "items[?path=='/${RESOURCE_PATH}'].id | [0]" \
-  --output text)"
+LAMBDA_URI="arn:aws:apigateway:${AWS_REGION}:lambda:path/2015-03-31/functions/${FUNCTION_ARN}/invocations"
 
-if [[ "$RESOURCE_ID" == "None" || -z "$RESOURCE_ID" ]]; then
-  echo "[APIGW] creating resource: /$RESOURCE_PATH"
-  RESOURCE_ID="$(aws apigateway create-resource \
+# ensure_resource <parent-id> <path-part> <full-path>  → resource id (stdout)
+ensure_resource() {
+  local parent_id="$1" path_part="$2" full_path="$3" resource_id
+  resource_id="$(aws apigateway get-resources \
     --rest-api-id "$API_ID" \
-    --parent-id "$ROOT_RESOURCE_ID" \
-    --path-part "$RESOURCE_PATH" \
-    --query 'id' \
+    --query "items[?path=='${full_path}'].id | [0]" \
     --output text)"
-else
-  echo "[APIGW] existing resource found: /$RESOURCE_PATH"
-fi
+  if [[ "$resource_id" == "None" || -z "$resource_id" ]]; then
+    echo "[APIGW] creating resource: $full_path" >&2
+    resource_id="$(aws apigateway create-resource \
+      --rest-api-id "$API_ID" \
+      --parent-id "$parent_id" \
+      --path-part "$path_part" \
+      --query 'id' \
+      --output text)"
+  else
+    echo "[APIGW] existing resource found: $full_path" >&2
+  fi
+  echo "$resource_id"
+}
 
-echo "RESOURCE_ID=$RESOURCE_ID"
+# connect_lambda <resource-id> <http-method> <statement-suffix> <source-arn-path>
+connect_lambda() {
+  local resource_id="$1" http_method="$2" statement_id="${FUNCTION_NAME}-${API_ID}-$3"
+  local source_arn="arn:aws:execute-api:${AWS_REGION}:${ACCOUNT_ID}:${API_ID}/*/$4"
 
-# ==========================================
-# 6) Create GET method if missing
-# ==========================================
-if aws apigateway get-method \
-  --rest-api-id "$API_ID" \
-  --resource-id "$RESOURCE_ID" \
-  --http-method GET >/dev/null 2>&1; then
-  echo "[APIGW] GET method already exists"
-else
-  echo "[APIGW] creating GET method"
-  aws apigateway put-method \
+  if aws apigateway get-method \
     --rest-api-id "$API_ID" \
-    --resource-id "$RESOURCE_ID" \
-    --http-method GET \
-    --authorization-type "NONE" >/dev/null
-fi
-
-# ==========================================
-# 7) Put Lambda proxy integration
-#    NOTE: Lambda integration method must be POST
-# ==========================================
-LAMBDA_URI="arn:aws:apigateway:${AWS_REGION}:lambda:path/2015-03-31/functions/${FUNCTION_ARN}/invocations"
-
-echo "[APIGW] configuring Lambda proxy integration"
-aws apigateway put-integration \
-  --rest-api-id "$API_ID" \
-  --resource-id "$RESOURCE_ID" \
-  --http-method GET \
-  --type AWS_PROXY \
-  --integration-http-method POST \
-  --uri "$LAMBDA_URI" >/dev/null
-
-# ==========================================
-# 8) Grant API Gateway permission to invoke Lambda
-# ==========================================
-STATEMENT_ID="${FUNCTION_NAME}-${API_ID}-get-${RESOURCE_PATH}"
+    --resource-id "$resource_id" \
+    --http-method "$http_method" >/dev/null 2>&1; then
+    echo "[APIGW] $http_method method already exists"
+  else
+    echo "[APIGW] creating $http_method method"
+    aws apigateway put-method \
+      --rest-api-id "$API_ID" \
+      --resource-id "$resource_id" \
+      --http-method "$http_method" \
+      --authorization-type "NONE" >/dev/null
+  fi
 
-SOURCE_ARN="arn:aws:execute-api:${AWS_REGION}:${ACCOUNT_ID}:${API_ID}/*/GET/${RESOURCE_PATH}"
+  echo "[APIGW] configuring Lambda proxy integration ($http_method)"
+  aws apigateway put-integration \
+    --rest-api-id "$API_ID" \
+    --resource-id "$resource_id" \
+    --http-method "$http_method" \
+    --type AWS_PROXY \
+    --integration-http-method POST \
+    --uri "$LAMBDA_URI" >/dev/null
 
-if aws lambda get-policy --function-name "$FUNCTION_NAME" >/dev/null 2>&1; then
   if aws lambda get-policy --function-name "$FUNCTION_NAME" \
-      --query "Policy" --output text | grep -q "$STATEMENT_ID"; then
-    echo "[Lambda] permission already exists: $STATEMENT_ID"
+      --query "Policy" --output text 2>/dev/null | grep -q "$statement_id"; then
+    echo "[Lambda] permission already exists: $statement_id"
   else
-    echo "[Lambda] adding invoke permission"
+    echo "[Lambda] adding invoke permission: $statement_id"
     aws lambda add-permission \
       --function-name "$FUNCTION_NAME" \
-      --statement-id "$STATEMENT_ID" \
+      --statement-id "$statement_id" \
       --action lambda:InvokeFunction \
       --principal apigateway.amazonaws.com \
-      --source-arn "$SOURCE_ARN" >/dev/null
+      --source-arn "$source_arn" >/dev/null
   fi
-else
-  echo "[Lambda] adding invoke permission"
-  aws lambda add-permission \
-    --function-name "$FUNCTION_NAME" \
-    --statement-id "$STATEMENT_ID" \
-    --action lambda:InvokeFunction \
-    --principal apigateway.amazonaws.com \
-    --source-arn "$SOURCE_ARN" >/dev/null
-fi
+}
+
+# /hello (GET)
+RESOURCE_ID="$(ensure_resource "$ROOT_RESOURCE_ID" "$RESOURCE_PATH" "/${RESOURCE_PATH}")"
+echo "RESOURCE_ID=$RESOURCE_ID"
+connect_lambda "$RESOURCE_ID" GET "get-${RESOURCE_PATH}" "GET/${RESOURCE_PATH}"
+
+# 나머지 경로(/catalog/{kind}, /suggestions, /api/...)는 {proxy+} 하나로 Lambda 에 넘기고 라우팅은 Lambda 가 합니다.
+PROXY_RESOURCE_ID="$(ensure_resource "$ROOT_RESOURCE_ID" "{proxy+}" "/{proxy+}")"
+echo "PROXY_RESOURCE_ID=$PROXY_RESOURCE_ID"
+connect_lambda "$PROXY_RESOURCE_ID" ANY "any-proxy" "*/*"
 
 # ==========================================
-# 9) Deploy to dev and prod stages
+# 6) Deploy to dev and prod stages
 #    create-deployment with stage-name creates or updates that stage
 # ==========================================
 echo "[APIGW] deploying to stage: dev"
@@ -259,7 +251,7 @@ aws apigateway create-deployment \
   --description "Deployment to prod" >/dev/null
 
 # ==========================================
-# 10) Output
+# 7) Output
 # ==========================================
 DEV_URL="https://${API_ID}.execute-api.${AWS_REGION}.amazonaws.com/dev/${RESOURCE_PATH}"
 PROD_URL="https://${API_ID}.execute-api.${AWS_REGION}.amazonaws.com/prod/${RESOURCE_PATH}"
@@ -276,4 +268,5 @@ echo "PROD URL        : $PROD_URL"
 echo
 echo "테스트:"
 echo "curl \"$DEV_URL\""
-echo "curl \"$PROD_URL\""
\ No newline at end of file
+echo "curl \"$PROD_URL\""
+echo "curl \"https://${API_ID}.execute-api.${AWS_REGION}.amazonaws.com/dev/catalog/branches\" --compressed"
\ No newline at end of file
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""API Lambda 배포 zip 빌더 (``.hello_api_build/function.zip``) + cold start import 프로파일러.
+
+- 결정적 zip: 항목 이름순 정렬, 고정 timestamp(1980-01-01), 고정 권한(0644), 같은 압축 수준.
+  입력이 같으면 어느 머신에서 만들어도 같은 bytes(같은 sha256) 가 나옵니다.
+- 증분 빌드: 입력 파일 내용(+ requirements, 빌더 버전)의 해시가 이전 빌드 manifest 와 같으면 건너뜁니다.
+- 의존성: ``--requirements`` 를 ``pip install --target`` 으로 설치하고(requirements 해시별 캐시)
+  ``__pycache__``/``*.pyc``/tests/docs/타입 stub/C 소스 같은 실행에 필요 없는 파일을 뺍니다.
+- import 프로파일: 빌드한 파일들을 임시 디렉터리에 풀고 ``python -X importtime -c "import <handler>"`` 로
+  모듈별 import 비용을 재서 보고합니다. 이전 빌드보다 늘어난 모듈을 함께 보여주고,
+  ``--max-import-ms`` 를 넘으면 종료 코드 1 입니다.
+
+예::
+
+    python3 infra/lambda_package.py
+    python3 infra/lambda_package.py --requirements .hello_api_build/requirements.txt --max-import-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from lex_cache import write_atomic
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT_DIR / ".hello_api_build"
+DEFAULT_HANDLER = "lambda_function"
+# zip 안 경로 → 저장소 파일 (소스 디렉터리 밖에서 가져오는 데이터)
+EXTRA_FILES = {"campusLocations.json": ROOT_DIR / "lex-chat-ux" / "shared" / "campusLocations.json"}
+# 빌드 규칙(정렬/제외 목록/zip 형식)이 바뀌면 올려서 이전 manifest 를 무효화합니다.
+BUILDER_VERSION = 1
+
+FIXED_DATE = (1980, 1, 1, 0, 0, 0)
+FILE_MODE = 0o100644
+STRIP_DIRS = frozenset({"__pycache__", "tests", "test", "docs", "doc", "examples", "benchmarks"})
+STRIP_PATTERNS = ("*.pyc", "*.pyo", "*.pyi", "*.c", "*.h", "*.pxd", "*.pyx", "py.typed")
+# dist-info 는 importlib.metadata 가 쓰는 파일만 남깁니다 (RECORD 는 지운 파일 목록이 안 맞게 됨).
+DIST_INFO_KEEP = frozenset({"METADATA", "top_level.txt", "entry_points.txt"})
+
+
+@dataclass(frozen=True)
+class ImportCost:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _stripped(rel: str) -> bool:
+    parts = rel.split("/")
+    if any(part in STRIP_DIRS for part in parts[:-1]):
+        return True
+    name = parts[-1]
+    if any(fnmatch.fnmatch(name, pattern) for pattern in STRIP_PATTERNS):
+        return True
+    return len(parts) > 1 and parts[-2].endswith(".dist-info") and name not in DIST_INFO_KEEP
+
+
+def collect_files(source_dir: Path, include: list[str], deps_dir: Path | None) -> dict[str, Path]:
+    """zip 안 경로 → 원본 파일. 소스는 ``include`` glob 에 맞는 최상위 파일만, 의존성은 제외 규칙 적용."""
+    files: dict[str, Path] = {}
+    if deps_dir is not None:
+        for path in deps_dir.rglob("*"):
+            rel = path.relative_to(deps_dir).as_posix()
+            if path.is_file() and not rel.startswith("bin/") and not _stripped(rel):
+                files[rel] = path
+    for path in source_dir.iterdir():
+        if path.is_file() and any(fnmatch.fnmatch(path.name, pattern) for pattern in include):
+            files[path.name] = path
+    for rel, path in EXTRA_FILES.items():
+        if path.exists():
+            files[rel] = path
+    return dict(sorted(files.items()))
+
+
+def content_hash(files: dict[str, Path], requirements: str = "") -> str:
+    digest = hashlib.sha256(f"builder={BUILDER_VERSION}\nrequirements={requirements}\n".encode("utf-8"))
+    for rel, path in files.items():
+        digest.update(rel.encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def write_zip(files: dict[str, Path], out: Path) -> str:
+    """결정적 zip 을 원자적으로 씁니다. zip 파일의 sha256 을 돌려줍니다."""
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w") as zf:
+        for rel, path in sorted(files.items()):
+            info = zipfile.ZipInfo(rel, FIXED_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = FILE_MODE << 16
+            info.create_system = 3
+            zf.writestr(info, path.read_bytes(), compresslevel=9)
+    os.replace(tmp, out)
+    return hashlib.sha256(out.read_bytes()).hexdigest()
+
+
+def install_requirements(requirements: Path, cache_dir: Path, pip_args: list[str]) -> tuple[Path, str]:
+    """requirements 내용별로 ``pip install --target`` 결과를 캐시해 둡니다."""
+    text = requirements.read_text(encoding="utf-8")
+    key = hashlib.sha256((text + "\0" + " ".join(pip_args)).encode("utf-8")).hexdigest()[:16]
+    target = cache_dir / f"deps-{key}"
+    if not (target / ".complete").exists():
+        print(f" - 의존성 설치: {requirements} → {target}")
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", "--quiet", "--no-compile", "--target", str(target), "-r", str(requirements), *pip_args],
+            check=True,
+        )
+        (target / ".complete").write_text(key, encoding="utf-8")
+    return target, f"{text}\0{' '.join(pip_args)}"
+
+
+# --- import 프로파일 -----------------------------------------------------------------
+
+
+def parse_importtime(stderr: str) -> list[ImportCost]:
+    """``-X importtime`` 출력 (``import time: self [us] | cumulative | imported package``) 을 읽습니다."""
+    costs = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:") :].split("|", 2))
+        costs.append(ImportCost(module.strip(), int(self_us), int(cumulative_us)))
+    return costs
+
+
+def profile_imports(files: dict[str, Path], handler: str, env: dict[str, str] | None = None) -> list[ImportCost]:
+    """빌드 파일만 있는 디렉터리에서 handler 모듈을 새 인터프리터로 import 해 모듈별 비용을 잽니다."""
+    with tempfile.TemporaryDirectory(prefix="lambda-import-") as stage:
+        for rel, path in files.items():
+            dest = Path(stage) / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(path.read_bytes())
+        run_env = {**os.environ, **(env or {}), "PYTHONPATH": stage, "PYTHONDONTWRITEBYTECODE": "1"}
+        # 인터프리터 시작(site, encodings 등)에서 이미 import 되는 모듈은 handler 비용에서 뺍니다.
+        startup = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], cwd=stage, env=run_env, capture_output=True, text=True)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {handler}"], cwd=stage, env=run_env, capture_output=True, text=True
+        )
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise SystemExit(f"handler import 실패 ({handler}):\n{tail}")
+    preloaded = {c.module for c in parse_importtime(startup.stderr)}
+    return [c for c in parse_importtime(proc.stderr) if c.module not in preloaded]
+
+
+def handler_cost(costs: list[ImportCost], handler: str) -> int:
+    return next((c.cumulative_us for c in reversed(costs) if c.module == handler), 0)
+
+
+def format_profile(costs: list[ImportCost], handler: str, previous: dict[str, int] | None = None, limit: int = 15) -> str:
+    """cumulative 기준 상위 모듈. ``previous``(이전 빌드의 모듈 → self us)가 있으면 증감을 붙입니다."""
+    total = handler_cost(costs, handler)
+    lines = [f"   handler import {total / 1000:.1f}ms ({len(costs)}개 모듈, -X importtime)", f"   {'cumulative':>10} {'self':>8}  module"]
+    for cost in sorted(costs, key=lambda c: -c.cumulative_us)[:limit]:
+        delta = ""
+        if previous is not None:
+            before = previous.get(cost.module)
+            delta = "  (new)" if before is None else f"  ({(cost.self_us - before) / 1000:+.1f}ms)"
+        lines.append(f"   {cost.cumulative_us / 1000:>8.1f}ms {cost.self_us / 1000:>6.1f}ms  {cost.module}{delta}")
+    if previous is not None:
+        added = sorted({c.module for c in costs} - set(previous))
+        if added:
+            lines.append(f"   새로 import 되는 모듈: {', '.join(added[:20])}{' ...' if len(added) > 20 else ''}")
+    return "\n".join(lines)
+
+
+# --- 빌드 ------------------------------------------------------------------------
+
+
+def read_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="API Lambda 결정적 zip 빌드 + import 프로파일")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR, help="handler 소스 디렉터리 (기본 .hello_api_build)")
+    parser.add_argument("--include", nargs="*", default=["*.py"], help="소스 디렉터리에서 넣을 파일 glob")
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="import 프로파일할 handler 모듈")
+    parser.add_argument("--out", type=Path, help="zip 경로 (기본 <source>/function.zip)")
+    parser.add_argument("--requirements", type=Path, help="함께 넣을 의존성 requirements.txt")
+    parser.add_argument("--pip-arg", action="append", default=[], help="pip install 추가 인자 (예: --pip-arg=--platform=manylinux2014_x86_64)")
+    parser.add_argument("--force", action="store_true", help="해시가 같아도 다시 빌드합니다.")
+    parser.add_argument("--no-profile", action="store_true", help="import 프로파일을 건너뜁니다.")
+    parser.add_argument("--max-import-ms", type=float, default=0.0, help="handler import 시간이 이보다 크면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    out = args.out or args.source / "function.zip"
+    manifest_path = out.with_name(out.name + ".json")
+    previous = read_manifest(manifest_path)
+
+    deps_dir, requirements = None, ""
+    if args.requirements:
+        deps_dir, requirements = install_requirements(args.requirements, Path(tempfile.gettempdir()) / "lambda-package-cache", args.pip_arg)
+    files = collect_files(args.source, args.include, deps_dir)
+    if not any(rel == f"{args.handler}.py" for rel in files):
+        raise SystemExit(f"handler 모듈이 없습니다: {args.source / (args.handler + '.py')}")
+    source_hash = content_hash(files, requirements)
+
+    unchanged = (
+        not args.force
+        and previous.get("sourceHash") == source_hash
+        and out.exists()
+        and hashlib.sha256(out.read_bytes()).hexdigest() == previous.get("zipSha256")
+    )
+    if unchanged:
+        print(f"변경 없음: {out} (source {source_hash[:12]}, zip {previous['zipSha256'][:12]})")
+        zip_sha = previous["zipSha256"]
+    else:
+        zip_sha = write_zip(files, out)
+        print(f"빌드: {out} ({len(files)}개 파일, {out.stat().st_size} bytes, sha256 {zip_sha[:12]})")
+
+    manifest = {"sourceHash": source_hash, "zipSha256": zip_sha, "files": list(files), "importProfile": previous.get("importProfile")}
+    status = 0
+    if not args.no_profile:
+        if unchanged and previous.get("importProfile"):
+            # 같은 입력이면 이전 측정값을 그대로 씁니다 (--max-import-ms 검사는 그대로 합니다).
+            costs = [ImportCost(**c) for c in previous["importProfile"]]
+        else:
+            costs = profile_imports(files, args.handler)
+            before = {c["module"]: c["self_us"] for c in previous["importProfile"]} if previous.get("importProfile") else None
+            print("\ncold start import 프로파일:")
+            print(format_profile(costs, args.handler, before))
+            manifest["importProfile"] = [asdict(c) for c in costs]
+        total_ms = handler_cost(costs, args.handler) / 1000
+        if args.max_import_ms and total_ms > args.max_import_ms:
+            print(f"❌ handler import {total_ms:.1f}ms > --max-import-ms {args.max_import_ms:g}")
+            status = 1
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2) + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
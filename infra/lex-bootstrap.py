@@ -2,31 +2,59 @@
 """Amazon Lex V2 bootstrap script (Python CLI wrapper).
 
 `infra/lex-bootstrap.sh`의 동작을 Python으로 옮긴 버전입니다.
-AWS CLI가 설치되어 있고 인증이 구성되어 있어야 합니다.
+boto3가 있으면 in-process SDK 백엔드를, 없으면 AWS CLI를 사용합니다
+(`AWS_BACKEND=auto|sdk|cli`, `infra/lex_client.py` 참고). 인증이 구성되어 있어야 합니다.
 """
 
 from __future__ import annotations
 
+import argparse
+import dataclasses
+import functools
+import hashlib
 import json
 import os
 import re
 import shlex
 import subprocess
 import sys
-import time
+import threading
 from pathlib import Path
-from typing import Any
-
+from typing import Any, Iterable, Iterator
+
+import lex_trace
+from lex_cache import DAY, MetadataCache, open_cache
+from lex_catalog import load_catalog
+from lex_collisions import DEFAULT_THRESHOLD, find_collisions, format_report
+from lex_client import AwsCallError, CliBackend, ScriptError, format_call_stats, get_backend, name_filter, paginate, parse_args, to_text
+from lex_import import import_archive, render_archive
+from lex_journal import Journal, open_journal
+from lex_plan import (
+    DEFINITION_HASH_TAG,
+    BotModel,
+    Change,
+    IntentSpec,
+    Plan,
+    SlotSpec,
+    SlotTypeSpec,
+    apply_plan,
+    definition_hash,
+    describe_draft,
+    diff,
+    differs,
+    find_version_by_hash,
+    missing_ids,
+    resource_ids,
+)
+from lex_scheduler import TaskGraph, raise_for_errors
+from lex_utterances import load_corpus
+from lex_waiters import BUILD, QUICK, WaitPolicy, Watch, collect_stats, format_stats, wait_all
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_CFG = ROOT_DIR / "infra" / "config.env"
 FALLBACK_CFG = ROOT_DIR / "infra" / "config.example.env"
 
 
-class ScriptError(RuntimeError):
-    pass
-
-
 def load_env_file(path: Path) -> dict[str, str]:
     data: dict[str, str] = {}
     for raw in path.read_text(encoding="utf-8").splitlines():
@@ -58,54 +86,36 @@ def require_bin(name: str) -> None:
 
 
 def run_aws(cfg: dict[str, str], *args: str, output_json: bool = True, allow_fail: bool = False) -> Any:
-    aws_bin = cfg.get("AWS_BIN", "aws")
-    cmd = [aws_bin, "--region", cfg["AWS_REGION"], *args]
-    if output_json and "--output" not in args:
-        cmd.extend(["--output", "json"])
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
+    request, output = parse_args(args)
+    try:
+        result = get_backend(cfg).call(request)
+    except AwsCallError:
         if allow_fail:
             return None
-        raise ScriptError(f"명령 실패: {' '.join(cmd)}\n{proc.stderr.strip()}")
-    if output_json:
-        out = proc.stdout.strip()
-        return json.loads(out) if out else {}
-    return proc.stdout.strip()
+        raise
+    if output_json and output == "json":
+        return result
+    return to_text(result) if output == "text" else json.dumps(result, ensure_ascii=False)
 
 
 def get_text(cfg: dict[str, str], *args: str, allow_fail: bool = False) -> str:
-    aws_bin = cfg.get("AWS_BIN", "aws")
-    cmd = [aws_bin, "--region", cfg["AWS_REGION"], *args, "--output", "text"]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
+    request, _ = parse_args(args)
+    try:
+        return to_text(get_backend(cfg).call(request))
+    except AwsCallError:
         if allow_fail:
             return ""
-        raise ScriptError(proc.stderr.strip())
-    return proc.stdout.strip()
+        raise
 
 
-def wait_until(label: str, fn, ok: set[str], fail: set[str], timeout: int, interval: int) -> str:
-    waited = 0
-    print(f" - {label} 대기", file=sys.stderr)
-    while True:
-        status = fn() or "Unknown"
-        print(f"   * status={status}", file=sys.stderr)
-        if status in ok:
-            return status
-        if status in fail:
-            raise ScriptError(f"{label} 실패(status={status})")
-        time.sleep(interval)
-        waited += interval
-        if waited >= timeout:
-            raise ScriptError(f"Timed out: {label} 대기 실패")
+def step(message: str) -> None:
+    """``[n/9]`` 진행 표시를 출력하고 trace 단계를 시작합니다 (fleet 진행 표시도 이 줄을 읽음)."""
+    print(message)
+    lex_trace.step(message)
 
 
-def split_csv(value: str) -> list[str]:
-    return [item.strip() for item in value.split(",") if item.strip()]
-
-
-def make_slot_type_values(items: list[str]) -> list[dict[str, Any]]:
-    return [{"sampleValue": {"value": item}} for item in items]
+def wait_until(label: str, fn, ok: set[str], fail: set[str], timeout: int, policy: WaitPolicy = QUICK) -> str:
+    return wait_all([Watch(label, fn, ok, fail)], timeout, policy)[label]
 
 
 def assert_id(label: str, value: str) -> None:
@@ -113,32 +123,23 @@ def assert_id(label: str, value: str) -> None:
         raise ScriptError(f"ERROR: {label} 값이 비정상입니다: '{value}'")
 
 
-def list_builtins(cfg: dict[str, str], cache_file: Path) -> set[str]:
-    force_refresh = cfg.get("FORCE_REFRESH_BUILTIN_CACHE", "false").lower() == "true"
-    if force_refresh and cache_file.exists():
-        cache_file.unlink()
-
-    if cache_file.exists() and cache_file.stat().st_size > 0:
-        print(f" - Built-in cache 사용: {cache_file}", file=sys.stderr)
-        return set(cache_file.read_text(encoding="utf-8").splitlines())
-
-    next_token = ""
-    values: list[str] = []
-    while True:
-        args = ["lexv2-models", "list-built-in-slot-types", "--locale-id", cfg["LOCALE_ID"], "--max-results", "20"]
-        if next_token:
-            args.extend(["--next-token", next_token])
-        payload = run_aws(cfg, *args)
-        for item in payload.get("builtInSlotTypeSummaries", []):
-            sig = item.get("slotTypeSignature")
-            if sig:
-                values.append(sig)
-        next_token = payload.get("nextToken", "")
-        if not next_token:
-            break
-
-    cache_file.write_text("\n".join(values) + ("\n" if values else ""), encoding="utf-8")
-    print(f" - Built-in cache 생성 완료: {cache_file} (lines={len(values)})", file=sys.stderr)
+def list_builtins(cfg: dict[str, str], cache: MetadataCache) -> set[str]:
+    key = f"builtins/{cfg['LOCALE_ID']}"
+    if cfg.get("FORCE_REFRESH_BUILTIN_CACHE", "false").lower() == "true":
+        cache.invalidate(key)
+
+    cached = cache.get(key)
+    if cached:
+        print(f" - Built-in cache 사용: {key} (lines={len(cached)})", file=sys.stderr)
+        return set(cached)
+
+    items = paginate(
+        functools.partial(run_aws, cfg), "lexv2-models", "list-built-in-slot-types", "--locale-id", cfg["LOCALE_ID"], items_key="builtInSlotTypeSummaries"
+    )
+    values = sorted({item["slotTypeSignature"] for item in items if item.get("slotTypeSignature")})
+    if values:
+        cache.put(key, values, float(cfg.get("CACHE_TTL_BUILTINS", str(7 * DAY))))
+    print(f" - Built-in cache 생성 완료: {key} (lines={len(values)})", file=sys.stderr)
     return set(values)
 
 
@@ -149,51 +150,144 @@ def pick_builtin(builtins: set[str], *candidates: str) -> str:
     return "AMAZON.AlphaNumeric" if "AMAZON.AlphaNumeric" in builtins else ""
 
 
-def find_summary_id(items: list[dict[str, Any]], name_key: str, id_key: str, wanted_name: str) -> str:
-    for item in items:
-        if item.get(name_key) == wanted_name:
-            return item.get(id_key, "")
-    return ""
-
-
-def main() -> int:
-    cfg = get_config()
-    require_bin(cfg.get("AWS_BIN", "aws"))
-
-    tmp_dir = Path(cfg.get("TMP_DIR", "/tmp"))
-    cache_file = tmp_dir / f"lexv2_builtin_slot_types_{cfg['LOCALE_ID']}.txt"
+def pick_builtin_types(builtins: set[str]) -> dict[str, str]:
+    picked = {
+        "name": pick_builtin(builtins, "AMAZON.Person", "AMAZON.FirstName", "AMAZON.LastName"),
+        "date": pick_builtin(builtins, "AMAZON.Date", "AMAZON.DateTime"),
+        "time": pick_builtin(builtins, "AMAZON.Time", "AMAZON.DateTime"),
+        "phone": pick_builtin(builtins, "AMAZON.PhoneNumber"),
+        "reservation_id": pick_builtin(builtins, "AMAZON.AlphaNumeric"),
+    }
+    if not all(picked.values()):
+        raise ScriptError("사용할 수 있는 built-in slot type을 찾지 못했습니다.")
+    return picked
+
+
+# slot prompt / 기본 발화는 locale 언어로 둡니다. 여기에 없는 locale 은 배포하지 않습니다 (한국어 문구가 섞이지 않도록).
+LOCALE_PROMPTS = {
+    "ko_KR": {
+        "Branch": "어느 지점으로 예약할까요? (예: 강남점)",
+        "CourseName": "어떤 과정을 원하세요? (예: 토익)",
+        "Date": "희망 날짜를 알려주세요. (예: 2026-02-10 또는 2월 10일)",
+        "Time": "희망 시간을 알려주세요. (예: 19:30)",
+        "StudentName": "예약자 이름을 알려주세요.",
+        "PhoneNumber": "연락처를 알려주세요. (예: 010-1234-5678)",
+        "ReservationId": "예약번호를 알려주세요. (예: R-ABC123)",
+        "CourseInfo.CourseName": "어떤 과정이 궁금하세요? (예: 토익)",
+    },
+    "en_US": {
+        "Branch": "Which branch would you like to book? (e.g. Gangnam)",
+        "CourseName": "Which course are you interested in? (e.g. TOEIC)",
+        "Date": "What date would you like? (e.g. February 10)",
+        "Time": "What time works for you? (e.g. 7:30 pm)",
+        "StudentName": "What name should the reservation be under?",
+        "PhoneNumber": "What is your phone number?",
+        "ReservationId": "What is your reservation number? (e.g. R-ABC123)",
+        "CourseInfo.CourseName": "Which course would you like to know about? (e.g. TOEIC)",
+    },
+}
+# 고객 첫 발화로 자주 쓰는 짧은 문장 (MakeReservation initial response 용)
+LOCALE_INITIAL_UTTERANCES = {
+    "ko_KR": ("상담 예약할래요", "예약하고 싶어요", "수강 상담 예약"),
+    "en_US": ("I'd like to book a consultation", "I want to make a reservation", "Book a class"),
+}
+# UTTERANCE_SOURCES가 비어 있을 때 쓰는 기본 발화 (ko_KR 전용, MakeReservation만 배포)
+DEFAULT_RESERVATION_UTTERANCES = (
+    "강남점 토익 예약하고 싶어요",
+    "{Branch} {CourseName} 상담 예약할래요",
+    "{Date} {Time}에 {Branch} {CourseName} 예약",
+)
+
+
+def bot_model(cfg: dict[str, str], builtin_types: dict[str, str]) -> BotModel:
+    """배포할 봇 정의 (slot type / intent / slot / 발화 / 우선순위). intent 목록은 docs/lex-design.md 기준."""
+    locale_id = cfg.get("LOCALE_ID", "ko_KR")
+    if locale_id not in LOCALE_PROMPTS:
+        raise ScriptError(f"{locale_id}: slot prompt 문구가 없는 locale 입니다 (지원: {', '.join(LOCALE_PROMPTS)}).")
+    prompts = LOCALE_PROMPTS[locale_id]
+    reservation_slots = (
+        SlotSpec("Branch", "BranchType", prompts["Branch"], custom=True),
+        SlotSpec("CourseName", "CourseType", prompts["CourseName"], custom=True),
+        SlotSpec("Date", builtin_types["date"], prompts["Date"]),
+        SlotSpec("Time", builtin_types["time"], prompts["Time"]),
+        SlotSpec("StudentName", builtin_types["name"], prompts["StudentName"]),
+        SlotSpec("PhoneNumber", builtin_types["phone"], prompts["PhoneNumber"]),
+    )
+    # 예약번호는 세션의 lastReservationId 로 대신할 수 있어 선택 slot 입니다.
+    reservation_id = SlotSpec("ReservationId", builtin_types["reservation_id"], prompts["ReservationId"], required=False)
+    intents = (
+        IntentSpec(
+            "MakeReservation",
+            "상담/수강 예약 생성",
+            utterances=DEFAULT_RESERVATION_UTTERANCES,
+            slots=reservation_slots,
+            fulfillment_code_hook=True,
+            initial_utterances=LOCALE_INITIAL_UTTERANCES[locale_id],
+        ),
+        IntentSpec("CheckReservation", "예약 조회", (), slots=(reservation_id,), fulfillment_code_hook=True),
+        IntentSpec("CancelReservation", "예약 취소", (), slots=(reservation_id,), fulfillment_code_hook=True),
+        IntentSpec(
+            "CourseInfo",
+            "과정/수업 정보 문의",
+            (),
+            slots=(SlotSpec("CourseName", "CourseType", prompts["CourseInfo.CourseName"], custom=True, required=False),),
+            fulfillment_code_hook=True,
+        ),
+        IntentSpec("Help", "기능 안내/도움말", (), fulfillment_code_hook=True),
+    )
+    slot_types = (
+        SlotTypeSpec("BranchType", "학원 지점", load_catalog(cfg, "BRANCH")),
+        SlotTypeSpec("CourseType", "수강 과정", load_catalog(cfg, "COURSE")),
+    )
+    corpus = load_corpus(
+        cfg,
+        ROOT_DIR,
+        {intent.name: tuple(slot.name for slot in intent.slots) for intent in intents},
+        {"Branch": slot_types[0].values, "CourseName": slot_types[1].values},
+    )
+    if corpus is None:
+        if locale_id != "ko_KR":
+            raise ScriptError(f"{locale_id}: 기본 발화는 한국어뿐입니다. UTTERANCE_SOURCES 에 {locale_id} 발화 파일을 지정하세요.")
+        return BotModel(slot_types=slot_types, intents=intents[:1])
+    # 발화가 하나도 없는 intent 는 build 가 실패하므로 배포하지 않습니다.
+    return BotModel(
+        slot_types=slot_types,
+        intents=tuple(dataclasses.replace(intent, utterances=corpus[intent.name]) for intent in intents if corpus[intent.name]),
+    )
 
-    reuse_existing = cfg.get("REUSE_EXISTING_BOT", "true").lower() == "true"
-    create_new_ver = cfg.get("CREATE_NEW_VERSION", "true").lower() == "true"
 
-    # [1/9] IAM Role
-    print(f"[1/9] IAM Role 준비: {cfg['LEX_ROLE_NAME']}")
-    account_id = get_text(cfg, "sts", "get-caller-identity", "--query", "Account")
-    lex_role_arn = f"arn:aws:iam::{account_id}:role/{cfg['LEX_ROLE_NAME']}"
+# fleet 모드는 같은 LEX_ROLE_NAME 을 여러 봇이 동시에 준비하므로 role 이름별로 생성/정책 설정을 한 번에 하나씩 합니다.
+_role_locks: dict[str, threading.Lock] = {}
+_role_locks_guard = threading.Lock()
 
-    role_exists = subprocess.run(
-        [cfg.get("AWS_BIN", "aws"), "--region", cfg["AWS_REGION"], "iam", "get-role", "--role-name", cfg["LEX_ROLE_NAME"]],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    ).returncode == 0
 
-    if not role_exists:
+def ensure_role(cfg: dict[str, str]) -> bool:
+    """Lex 서비스 role 을 만들고 inline policy 를 넣습니다. 이미 있던 role 이면 ``False`` (policy 는 다시 넣음)."""
+    with _role_locks_guard:
+        lock = _role_locks.setdefault(cfg["LEX_ROLE_NAME"], threading.Lock())
+    with lock:
         trust_doc = {
             "Version": "2012-10-17",
             "Statement": [{"Effect": "Allow", "Principal": {"Service": "lexv2.amazonaws.com"}, "Action": "sts:AssumeRole"}],
         }
-        trust_file = tmp_dir / "lexv2-trust.json"
-        trust_file.write_text(json.dumps(trust_doc), encoding="utf-8")
-        run_aws(
-            cfg,
-            "iam",
-            "create-role",
-            "--role-name",
-            cfg["LEX_ROLE_NAME"],
-            "--assume-role-policy-document",
-            f"file://{trust_file}",
-            output_json=False,
-        )
+        created = True
+        try:
+            run_aws(
+                cfg,
+                "iam",
+                "create-role",
+                "--role-name",
+                cfg["LEX_ROLE_NAME"],
+                "--assume-role-policy-document",
+                json.dumps(trust_doc),
+                output_json=False,
+            )
+        except AwsCallError as exc:
+            # 조회와 생성 사이에 다른 봇/실행이 먼저 만든 경우: 기존 role 을 확인하고 policy 만 맞춥니다.
+            if exc.code != "EntityAlreadyExists":
+                raise
+            run_aws(cfg, "iam", "get-role", "--role-name", cfg["LEX_ROLE_NAME"])
+            created = False
 
         invoke_resource = cfg.get("LAMBDA_ARN") or "*"
         policy_doc = {
@@ -213,8 +307,6 @@ def main() -> int:
                 },
             ],
         }
-        policy_file = tmp_dir / "lexv2-inline-policy.json"
-        policy_file.write_text(json.dumps(policy_doc), encoding="utf-8")
         run_aws(
             cfg,
             "iam",
@@ -224,55 +316,74 @@ def main() -> int:
             "--policy-name",
             "LexLabInlinePolicy",
             "--policy-document",
-            f"file://{policy_file}",
+            json.dumps(policy_doc),
             output_json=False,
         )
-        print(f" - 생성 완료: {lex_role_arn}")
-    else:
-        print(f" - 이미 존재: {lex_role_arn}")
-
-    # [2/9] Bot
-    print(f"[2/9] Bot 생성 또는 재사용: {cfg['BOT_NAME']}")
-    bot_id = cfg.get("BOT_ID", "")
-    if not bot_id and reuse_existing:
-        bots = run_aws(cfg, "lexv2-models", "list-bots", "--max-results", "50")
-        same = [b for b in bots.get("botSummaries", []) if b.get("botName") == cfg["BOT_NAME"]]
-        same.sort(key=lambda x: x.get("lastUpdatedDateTime", ""))
-        if same:
-            bot_id = same[-1].get("botId", "")
-            print(f" - 기존 Bot 재사용: botId={bot_id}")
+    return created
+
+
+def check_utterances(cfg: dict[str, str], models: dict[str, BotModel]) -> None:
+    """build 전에 intent 간 발화 충돌을 검사합니다 (``COLLISION_CHECK=warn|fail|off``)."""
+    mode = cfg.get("COLLISION_CHECK", "warn").lower()
+    if mode == "off":
+        return
+    threshold = float(cfg.get("COLLISION_THRESHOLD", str(DEFAULT_THRESHOLD)))
+    failed = []
+    for locale_id, model in models.items():
+        collisions = find_collisions({intent.name: intent.utterances for intent in model.intents}, threshold)
+        prefix = f"[{locale_id}] " if len(models) > 1 else ""
+        print(f" - {prefix}{format_report(collisions)}")
+        if any(c.kind == "collision" for c in collisions):
+            failed.append(locale_id)
+    if failed and mode == "fail":
+        raise ScriptError(f"intent 간 발화 충돌이 있어 중단합니다 ({', '.join(failed)}). 발화를 고치거나 COLLISION_THRESHOLD를 조정하세요.")
+
+
+def list_versions_newest_first(aws: Any, bot_id: str) -> Iterator[dict[str, Any]]:
+    return paginate(
+        aws,
+        "lexv2-models",
+        "list-bot-versions",
+        "--bot-id",
+        bot_id,
+        "--sort-by",
+        json.dumps({"attribute": "BotVersion", "order": "Descending"}),
+        items_key="botVersionSummaries",
+    )
 
-    if not bot_id:
-        bot = run_aws(
-            cfg,
-            "lexv2-models",
-            "create-bot",
-            "--bot-name",
-            cfg["BOT_NAME"],
-            "--description",
-            cfg["BOT_DESCRIPTION"],
-            "--role-arn",
-            lex_role_arn,
-            "--data-privacy",
-            "childDirected=false",
-            "--idle-session-ttl-in-seconds",
-            cfg["IDLE_SESSION_TTL"],
-        )
-        bot_id = bot["botId"]
-    print(f" - botId={bot_id}")
 
-    wait_until(
-        f"Bot Available: botId={bot_id}",
-        lambda: get_text(cfg, "lexv2-models", "describe-bot", "--bot-id", bot_id, "--query", "botStatus", allow_fail=True),
-        {"Available"},
-        {"Failed"},
-        300,
-        5,
+def find_summary(items: Iterable[dict[str, Any]], name_key: str, wanted_name: str) -> dict[str, Any] | None:
+    # items 가 paginate() generator 면 찾는 즉시 멈추므로 나머지 page는 요청하지 않습니다.
+    for item in items:
+        if item.get(name_key) == wanted_name:
+            return item
+    return None
+
+
+def find_summary_id(items: Iterable[dict[str, Any]], name_key: str, id_key: str, wanted_name: str) -> str:
+    item = find_summary(items, name_key, wanted_name)
+    return item.get(id_key, "") if item else ""
+
+
+def parse_cli(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Amazon Lex V2 bootstrap")
+    parser.add_argument("--plan", action="store_true", help="변경 계획만 출력하고 적용하지 않습니다.")
+    parser.add_argument("--resume", action="store_true", help="journal에 기록된 단계를 확인한 뒤 끝나지 않은 단계부터 이어서 진행합니다.")
+    parser.add_argument("--regression", action="store_true", help="배포가 끝난 alias 로 scripts/seed-testcases.json 회귀 테스트를 실행합니다.")
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="단계/호출/대기 시간을 Chrome trace JSON 으로 저장합니다 (기본 $TMP_DIR/lex-trace/).",
     )
+    parser.add_argument("--fleet", metavar="MANIFEST", help="여러 봇/locale을 manifest(JSON)대로 동시에 배포합니다.")
+    parser.add_argument("--max-parallel", type=int, default=0, help="fleet 모드에서 동시에 처리할 봇 수 (기본 FLEET_CONCURRENCY)")
+    return parser.parse_args(argv)
+
 
-    # [3/9] Locale
-    print(f"[3/9] Locale 생성/확인: {cfg['LOCALE_ID']}")
-    locale_exists = run_aws(
+def locale_status_fn(cfg: dict[str, str], bot_id: str, locale_id: str, allow_fail: bool = True):
+    return lambda: get_text(
         cfg,
         "lexv2-models",
         "describe-bot-locale",
@@ -281,195 +392,395 @@ def main() -> int:
         "--bot-version",
         "DRAFT",
         "--locale-id",
-        cfg["LOCALE_ID"],
-        allow_fail=True,
-    ) is not None
-    if locale_exists:
-        print(f" - 이미 존재: {cfg['LOCALE_ID']}")
+        locale_id,
+        "--query",
+        "botLocaleStatus",
+        allow_fail=allow_fail,
+    )
+
+
+def version_hash(locale_hashes: dict[str, str]) -> str:
+    # locale 이 여러 개면 locale별 해시를 합쳐 버전 전체의 해시로 씁니다.
+    if len(locale_hashes) == 1:
+        return next(iter(locale_hashes.values()))
+    return hashlib.sha256("|".join(f"{lid}={h}" for lid, h in locale_hashes.items()).encode("utf-8")).hexdigest()
+
+
+def import_definition(
+    cfg: dict[str, str],
+    locale_cfgs: list[dict[str, str]],
+    bot_id: str,
+    lex_role_arn: str,
+    cache: MetadataCache,
+    journal: Journal,
+) -> tuple[str, dict[str, tuple[Any, ...]], dict[str, str]]:
+    """[2/9] 봇 생성 ~ [5/9] 적용을 import archive 하나로 대신합니다 (``BOOTSTRAP_ENGINE=import``).
+
+    반환값은 ``bootstrap``의 API 경로와 같은 모양의 (botId, locale별 plan, locale 상태) 입니다.
+    """
+    aws = functools.partial(run_aws, cfg)
+    locale_ids = [lc["LOCALE_ID"] for lc in locale_cfgs]
+    models = {lc["LOCALE_ID"]: bot_model(lc, pick_builtin_types(list_builtins(lc, cache))) for lc in locale_cfgs}
+    hashes = {lc["LOCALE_ID"]: definition_hash(models[lc["LOCALE_ID"]], lc["LOCALE_ID"], lc["NLU_CONFIDENCE"]) for lc in locale_cfgs}
+    check_utterances(cfg, models)
+
+    # 같은 정의가 이미 DRAFT에 반영(journal)되었거나 버전으로 남아 있으면 import 하지 않습니다.
+    done_apply = (journal.get(5) or {}).get("locales", {})
+    current = bool(bot_id) and all(done_apply.get(lid, {}).get("defHash") == hashes[lid] for lid in locale_ids)
+    if bot_id and not current:
+        current = bool(find_version_by_hash(list_versions_newest_first(aws, bot_id), version_hash(hashes)))
+
+    step(f"[3/9] Import archive 생성: {', '.join(locale_ids)}")
+    if current:
+        print(" - 정의 해시 일치: import 생략")
+        step("[4/9] Import 생략")
     else:
-        run_aws(
-            cfg,
-            "lexv2-models",
-            "create-bot-locale",
-            "--bot-id",
-            bot_id,
-            "--bot-version",
-            "DRAFT",
-            "--locale-id",
-            cfg["LOCALE_ID"],
-            "--nlu-intent-confidence-threshold",
-            cfg["NLU_CONFIDENCE"],
-            output_json=False,
+        archive = render_archive(
+            cfg["BOT_NAME"],
+            cfg["BOT_DESCRIPTION"],
+            int(cfg["IDLE_SESSION_TTL"]),
+            {lc["LOCALE_ID"]: (float(lc["NLU_CONFIDENCE"]), models[lc["LOCALE_ID"]]) for lc in locale_cfgs},
         )
-        print(" - 생성 요청 완료")
+        print(f" - archive {len(archive)} bytes")
+
+        step("[4/9] Import 실행 (Overwrite)")
+        bot_spec = {
+            "botName": cfg["BOT_NAME"],
+            "roleArn": lex_role_arn,
+            "dataPrivacy": {"childDirected": False},
+            "idleSessionTTLInSeconds": int(cfg["IDLE_SESSION_TTL"]),
+        }
+        bot_id = import_archive(aws, archive, bot_spec)
+    print(f" - botId={bot_id}")
+    journal.record(2, botId=bot_id)
 
     wait_until(
-        f"Locale Creating 탈출: {cfg['LOCALE_ID']}",
-        lambda: get_text(
-            cfg,
-            "lexv2-models",
-            "describe-bot-locale",
-            "--bot-id",
-            bot_id,
-            "--bot-version",
-            "DRAFT",
-            "--locale-id",
-            cfg["LOCALE_ID"],
-            "--query",
-            "botLocaleStatus",
-            allow_fail=True,
-        ),
-        {"Built", "ReadyExpressTesting", "NotBuilt", "Failed"},
+        f"Bot Available: botId={bot_id}",
+        lambda: get_text(cfg, "lexv2-models", "describe-bot", "--bot-id", bot_id, "--query", "botStatus", allow_fail=True),
+        {"Available"},
         {"Failed"},
         300,
-        5,
     )
+    statuses = wait_all(
+        [
+            Watch(f"Locale 준비: {lid}", locale_status_fn(cfg, bot_id, lid), {"Built", "Building", "NotBuilt", "ReadyExpressTesting"}, {"Failed"})
+            for lid in locale_ids
+        ],
+        300,
+    )
+    journal.record(3, locales=locale_ids)
+    journal.record(4, defHashes=hashes)
 
-    # [4/9] Slot types
-    print("[4/9] SlotType 생성/갱신")
-    slot_types = run_aws(cfg, "lexv2-models", "list-slot-types", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--max-results", "100")
-    branch_values = make_slot_type_values(split_csv(cfg["BRANCH_VALUES"]))
-    course_values = make_slot_type_values(split_csv(cfg["COURSE_VALUES"]))
+    step("[5/9] Import 완료: slot type/intent/slot 반영")
+    # import 는 DRAFT 전체를 덮어쓰므로 import 한 경우 모든 locale 을 변경된 것으로 보고 build 합니다.
+    plan = Plan() if current else Plan([Change("import", "bot", cfg["BOT_NAME"])])
+    plans = {lid: (["--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", lid], models[lid], None, plan, hashes[lid]) for lid in locale_ids}
+    journal.record(5, locales={lid: {"defHash": hashes[lid]} for lid in locale_ids})
+    return bot_id, plans, {lid: statuses[f"Locale 준비: {lid}"] for lid in locale_ids}
 
-    def upsert_slot_type(name: str, desc: str, values: list[dict[str, Any]]) -> str:
-        found_id = find_summary_id(slot_types.get("slotTypeSummaries", []), "slotTypeName", "slotTypeId", name)
-        args = [
-            "lexv2-models",
-            "update-slot-type" if found_id else "create-slot-type",
-            "--bot-id",
-            bot_id,
-            "--bot-version",
-            "DRAFT",
-            "--locale-id",
-            cfg["LOCALE_ID"],
-            "--slot-type-name",
-            name,
-            "--description",
-            desc,
-            "--slot-type-values",
-            json.dumps(values, ensure_ascii=False),
-            "--value-selection-setting",
-            "resolutionStrategy=TopResolution",
-        ]
-        if found_id:
-            args.extend(["--slot-type-id", found_id])
-            run_aws(cfg, *args, output_json=False)
-            print(f" - {name} 갱신: {found_id}")
-            return found_id
-        created = run_aws(cfg, *args)
-        created_id = created["slotTypeId"]
-        print(f" - {name} 생성: {created_id}")
-        return created_id
-
-    branch_type_id = upsert_slot_type("BranchType", "학원 지점", branch_values)
-    course_type_id = upsert_slot_type("CourseType", "수강 과정", course_values)
-
-    # [5/9] Intent/slots
-    print("[5/9] Intent 생성/갱신 + Slots 구성")
-    intents = run_aws(cfg, "lexv2-models", "list-intents", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--max-results", "100")
-    make_intent_id = find_summary_id(intents.get("intentSummaries", []), "intentName", "intentId", "MakeReservation")
-
-    base_utt = [{"utterance": "상담 예약할래요"}, {"utterance": "예약하고 싶어요"}, {"utterance": "수강 상담 예약"}]
-    if make_intent_id:
-        run_aws(cfg, "lexv2-models", "update-intent", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--intent-id", make_intent_id, "--intent-name", "MakeReservation", "--description", "상담/수강 예약 생성", "--sample-utterances", json.dumps(base_utt, ensure_ascii=False), output_json=False)
+
+def bootstrap(cfg: dict[str, str], locale_cfgs: list[dict[str, str]], plan_only: bool = False, resume: bool = False) -> dict[str, Any]:
+    """봇 하나와 그 locale 들을 배포합니다. ``locale_cfgs``는 locale별로 덮어쓴 설정입니다.
+
+    같은 봇의 locale 들은 plan/적용/build 를 동시에 진행하고, 버전과 alias 는 한 번에 만듭니다.
+    단계별 결과는 journal에 기록되며, ``resume``이면 기록을 확인한 뒤 끝나지 않은 단계부터 진행합니다.
+    """
+    if isinstance(get_backend(cfg).inner, CliBackend):
+        require_bin(cfg.get("AWS_BIN", "aws"))
+
+    locale_ids = [lc["LOCALE_ID"] for lc in locale_cfgs]
+    locale_cfg = {lc["LOCALE_ID"]: lc for lc in locale_cfgs}
+
+    reuse_existing = cfg.get("REUSE_EXISTING_BOT", "true").lower() == "true"
+    create_new_ver = cfg.get("CREATE_NEW_VERSION", "true").lower() == "true"
+    workers = int(cfg.get("UPSERT_CONCURRENCY", "4"))
+    bot_id = cfg.get("BOT_ID", "")
+    engine = cfg.get("BOOTSTRAP_ENGINE", "api").lower()
+    aws = functools.partial(run_aws, cfg)
+    journal = open_journal(cfg, locale_ids, resume, readonly=plan_only)
+
+    # journal의 botId는 describe-bot 한 번으로 아직 존재하는지만 확인합니다.
+    done_role, done_bot = journal.get(1), journal.get(2)
+    if done_bot and run_aws(cfg, "lexv2-models", "describe-bot", "--bot-id", done_bot["botId"], allow_fail=True) is None:
+        print(f" - (resume) 기록된 botId={done_bot['botId']}가 없어 [2/9]부터 다시 진행합니다", file=sys.stderr)
+        journal.invalidate_from(2)
+        done_bot = None
+    # role도 get-role 한 번으로 확인합니다. 같은 이름으로 다시 만들면 ARN이 같으므로 [1/9]만 다시 진행합니다.
+    if done_role and run_aws(cfg, "iam", "get-role", "--role-name", cfg["LEX_ROLE_NAME"], allow_fail=True) is None:
+        print(f" - (resume) 기록된 role {cfg['LEX_ROLE_NAME']}이 없어 [1/9]을 다시 진행합니다", file=sys.stderr)
+        done_role = None
+
+    # [1/9], [2/9]의 조회(account/role/list-bots)는 서로 독립적이라 한 번에 실행합니다.
+    lookups = TaskGraph()
+    if not done_role:
+        lookups.add("account", lambda: get_text(cfg, "sts", "get-caller-identity", "--query", "Account"))
+        lookups.add("role", lambda: run_aws(cfg, "iam", "get-role", "--role-name", cfg["LEX_ROLE_NAME"], allow_fail=True) is not None)
+    if not bot_id and reuse_existing and not done_bot:
+        lookups.add(
+            "list-bots",
+            lambda: find_summary_id(
+                paginate(aws, "lexv2-models", "list-bots", *name_filter("BotName", cfg["BOT_NAME"]), items_key="botSummaries"),
+                "botName",
+                "botId",
+                cfg["BOT_NAME"],
+            ),
+        )
+    raise_for_errors(lookups.run(workers))
+
+    # [1/9] IAM Role
+    step(f"[1/9] IAM Role 준비: {cfg['LEX_ROLE_NAME']}")
+    if done_role:
+        account_id, lex_role_arn = done_role["accountId"], done_role["roleArn"]
+    else:
+        account_id = lookups.value("account")
+        lex_role_arn = f"arn:aws:iam::{account_id}:role/{cfg['LEX_ROLE_NAME']}"
+    cache = open_cache(cfg, account_id)
+    describe_ttl = float(cfg.get("CACHE_TTL_DESCRIBE", str(DAY)))
+
+    role_exists = bool(done_role) or lookups.value("role")
+
+    if done_role:
+        print(f" - (resume) 완료된 단계: {lex_role_arn}")
+    elif not role_exists and plan_only:
+        print(f" - (plan) 생성 예정: {lex_role_arn}")
+    elif not role_exists:
+        created = ensure_role(cfg)
+        print(f" - {'생성 완료' if created else '이미 존재 (다른 실행이 먼저 생성)'}: {lex_role_arn}")
+    else:
+        print(f" - 이미 존재: {lex_role_arn}")
+    journal.record(1, accountId=account_id, roleArn=lex_role_arn)
+
+    # [2/9] Bot
+    step(f"[2/9] Bot 생성 또는 재사용: {cfg['BOT_NAME']}")
+    if done_bot:
+        bot_id = done_bot["botId"]
+        print(f" - (resume) 완료된 단계: botId={bot_id}")
+    elif not bot_id and reuse_existing:
+        # 봇 이름은 계정/리전 안에서 유일하므로 EQ 필터로 찾은 첫 항목을 씁니다.
+        bot_id = lookups.value("list-bots")
+        if bot_id:
+            print(f" - 기존 Bot 재사용: botId={bot_id}")
+
+    if not bot_id and plan_only:
+        print(" - (plan) Bot/Locale 생성 후 전체 slot type/intent/slot 생성 예정")
+        return {"botId": "", "planned": True}
+    if engine == "import" and not plan_only:
+        bot_id, plans, locale_status = import_definition(cfg, locale_cfgs, bot_id, lex_role_arn, cache, journal)
     else:
-        make_intent_id = run_aws(cfg, "lexv2-models", "create-intent", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--intent-name", "MakeReservation", "--description", "상담/수강 예약 생성", "--sample-utterances", json.dumps(base_utt, ensure_ascii=False))["intentId"]
-    assert_id("MAKE_INTENT_ID", make_intent_id)
-
-    builtins = list_builtins(cfg, cache_file)
-    name_type = pick_builtin(builtins, "AMAZON.Person", "AMAZON.FirstName", "AMAZON.LastName")
-    date_type = pick_builtin(builtins, "AMAZON.Date", "AMAZON.DateTime")
-    time_type = pick_builtin(builtins, "AMAZON.Time", "AMAZON.DateTime")
-    phone_type = pick_builtin(builtins, "AMAZON.PhoneNumber")
-    if not all([name_type, date_type, time_type, phone_type]):
-        raise ScriptError("ko_KR에서 사용할 수 있는 built-in slot type을 찾지 못했습니다.")
-
-    slots = run_aws(cfg, "lexv2-models", "list-slots", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--intent-id", make_intent_id, "--max-results", "100")
-
-    def upsert_slot(name: str, slot_type: str, prompt: str, priority: int) -> tuple[str, dict[str, Any]]:
-        slot_id = find_summary_id(slots.get("slotSummaries", []), "slotName", "slotId", name)
-        elicitation = {
-            "slotConstraint": "Required",
-            "promptSpecification": {
-                "maxRetries": 2,
-                "messageGroups": [{"message": {"plainTextMessage": {"value": prompt}}}],
+        if not bot_id:
+            bot = run_aws(
+                cfg,
+                "lexv2-models",
+                "create-bot",
+                "--bot-name",
+                cfg["BOT_NAME"],
+                "--description",
+                cfg["BOT_DESCRIPTION"],
+                "--role-arn",
+                lex_role_arn,
+                "--data-privacy",
+                "childDirected=false",
+                "--idle-session-ttl-in-seconds",
+                cfg["IDLE_SESSION_TTL"],
+            )
+            bot_id = bot["botId"]
+        print(f" - botId={bot_id}")
+        journal.record(2, botId=bot_id)
+
+        wait_until(
+            f"Bot Available: botId={bot_id}",
+            lambda: get_text(cfg, "lexv2-models", "describe-bot", "--bot-id", bot_id, "--query", "botStatus", allow_fail=True),
+            {"Available"},
+            {"Failed"},
+            300,
+        )
+
+        # [3/9] Locale
+        step(f"[3/9] Locale 생성/확인: {', '.join(locale_ids)}")
+
+        def ensure_locale(lc: dict[str, str]) -> str:
+            locale_id = lc["LOCALE_ID"]
+            described = run_aws(
+                cfg, "lexv2-models", "describe-bot-locale", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", locale_id, allow_fail=True
+            )
+            if described is not None:
+                return "이미 존재"
+            if plan_only:
+                return "(plan) 생성 예정"
+            run_aws(
+                cfg,
+                "lexv2-models",
+                "create-bot-locale",
+                "--bot-id",
+                bot_id,
+                "--bot-version",
+                "DRAFT",
+                "--locale-id",
+                locale_id,
+                "--nlu-intent-confidence-threshold",
+                lc["NLU_CONFIDENCE"],
+                output_json=False,
+            )
+            return "생성 요청 완료"
+
+        done_locales = journal.get(3)
+        locale_graph = TaskGraph()
+        for lc in locale_cfgs:
+            if done_locales:
+                # 상태 대기(아래)가 어차피 describe-bot-locale 을 호출하므로 여기서는 다시 확인하지 않습니다.
+                locale_graph.add(lc["LOCALE_ID"], lambda: "(resume) 완료된 단계")
+            else:
+                locale_graph.add(lc["LOCALE_ID"], lambda lc=lc: ensure_locale(lc))
+        locale_results = locale_graph.run(workers)
+        raise_for_errors(locale_results)
+        for result in locale_results:
+            print(f" - {result.name}: {result.value}")
+        existing_locales = [r.name for r in locale_results if not r.value.startswith("(plan)")]
+
+        statuses = wait_all(
+            [
+                Watch(
+                    f"Locale Creating 탈출: {locale_id}",
+                    locale_status_fn(cfg, bot_id, locale_id),
+                    {"Built", "Building", "ReadyExpressTesting", "NotBuilt", "Failed"},
+                    {"Failed"},
+                )
+                for locale_id in existing_locales
+            ],
+            300,
+        )
+        locale_status = {locale_id: statuses[f"Locale Creating 탈출: {locale_id}"] for locale_id in existing_locales}
+        journal.record(3, locales=existing_locales)
+
+        # [4/9] Plan
+        # 현재 DRAFT를 한 번 describe 한 스냅샷과 선언적 모델을 비교해 필요한 호출만 만듭니다.
+        step("[4/9] DRAFT 스냅샷 비교 (plan)")
+
+        # 이전 실행이 같은 정의로 [5/9]까지 마쳤다면 describe/적용 없이 기록된 id를 그대로 씁니다.
+        done_apply = (journal.get(5) or {}).get("locales", {})
+
+        def plan_locale(locale_id: str) -> tuple[Any, ...]:
+            lc = locale_cfg[locale_id]
+            locale_args = ["--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", locale_id]
+            model = bot_model(lc, pick_builtin_types(list_builtins(lc, cache)))
+            locale_hash = definition_hash(model, locale_id, lc["NLU_CONFIDENCE"])
+            recorded = done_apply.get(locale_id, {})
+            # import 엔진이 남긴 기록(id 없음)은 확인할 수 없으므로 다시 비교합니다.
+            if recorded.get("defHash") == locale_hash and "slotTypes" in recorded:
+                # 정의가 같아도 기록된 id가 DRAFT에 그대로 있는지는 list 호출로 확인합니다.
+                missing = missing_ids(aws, locale_args, recorded, workers)
+                if not missing:
+                    return locale_args, model, None, Plan(), locale_hash
+                print(f" - (resume) {locale_id}: 기록된 {', '.join(missing)}이 없어 다시 비교합니다", file=sys.stderr)
+            snapshot = describe_draft(aws, locale_args, model, workers, cache, describe_ttl)
+            return locale_args, model, snapshot, diff(model, snapshot), locale_hash
+
+        plan_graph = TaskGraph()
+        for locale_id in existing_locales:
+            plan_graph.add(locale_id, lambda locale_id=locale_id: plan_locale(locale_id))
+        plan_results = plan_graph.run(workers)
+        raise_for_errors(plan_results)
+        plans = {r.name: r.value for r in plan_results}
+        for locale_id, (_, _, snapshot, plan, def_hash) in plans.items():
+            prefix = f"[{locale_id}] " if len(locale_ids) > 1 else ""
+            print(prefix + ("(resume) 완료된 단계: 정의 해시 일치, describe/적용 생략" if snapshot is None else plan.render()))
+            print(f" - {prefix}definition hash: {def_hash[:12]}")
+        check_utterances(cfg, {locale_id: p[1] for locale_id, p in plans.items()})
+        journal.record(4, defHashes={locale_id: p[4] for locale_id, p in plans.items()})
+        if plan_only:
+            return {"botId": bot_id, "planned": True, "changes": sum(len(p[3].changes) for p in plans.values())}
+
+        # [5/9] Apply
+        # 순서 제약은 "slot type → 이를 참조하는 slot → slot-priorities 갱신" 뿐이므로
+        # 변경 호출을 작업 그래프로 구성해 제한된 worker 풀에서 동시에 실행합니다.
+        step("[5/9] SlotType/Intent/Slot 변경 적용")
+        apply_graph = TaskGraph()
+        for locale_id, (locale_args, model, snapshot, plan, _) in plans.items():
+            if plan:
+                apply_graph.add(
+                    locale_id,
+                    lambda locale_args=locale_args, model=model, snapshot=snapshot, plan=plan: apply_plan(
+                        aws, locale_args, model, snapshot, plan, workers
+                    ),
+                )
+        apply_results = apply_graph.run(workers)
+        raise_for_errors(apply_results)
+        for result in apply_results:
+            for task in result.value:
+                prefix = f"[{result.name}] " if len(locale_ids) > 1 else ""
+                print(f" - {prefix}{task.name}: {task.value}")
+        if not apply_results:
+            print(" - 변경 없음")
+        applied = {r.name: r.value for r in apply_results}
+        journal.record(
+            5,
+            locales={
+                locale_id: done_apply[locale_id]
+                if snapshot is None
+                else {"defHash": locale_hash, **resource_ids(snapshot, applied.get(locale_id, []))}
+                for locale_id, (_, _, snapshot, _, locale_hash) in plans.items()
             },
-        }
-        common = [
-            "lexv2-models",
-            "update-slot" if slot_id else "create-slot",
-            "--bot-id",
-            bot_id,
-            "--bot-version",
-            "DRAFT",
-            "--locale-id",
-            cfg["LOCALE_ID"],
-            "--intent-id",
-            make_intent_id,
-            "--slot-name",
-            name,
-            "--slot-type-id",
-            slot_type,
-            "--value-elicitation-setting",
-            json.dumps(elicitation, ensure_ascii=False),
-        ]
-        if slot_id:
-            common.extend(["--slot-id", slot_id])
-            run_aws(cfg, *common, output_json=False)
-            sid = slot_id
-        else:
-            sid = run_aws(cfg, *common)["slotId"]
-        assert_id("slotId", sid)
-        return sid, {"priority": priority, "slotId": sid}
+        )
+        print("✅ [5/9] slot type/intent/slot 적용 완료")
 
-    priority_entries = []
-    for idx, spec in enumerate(
-        [
-            ("Branch", branch_type_id, "어느 지점으로 예약할까요? (예: 강남점)"),
-            ("CourseName", course_type_id, "어떤 과정을 원하세요? (예: 토익)"),
-            ("Date", date_type, "희망 날짜를 알려주세요. (예: 2026-02-10 또는 2월 10일)"),
-            ("Time", time_type, "희망 시간을 알려주세요. (예: 19:30)"),
-            ("StudentName", name_type, "예약자 이름을 알려주세요."),
-            ("PhoneNumber", phone_type, "연락처를 알려주세요. (예: 010-1234-5678)"),
-        ],
-        1,
-    ):
-        _, entry = upsert_slot(spec[0], spec[1], spec[2], idx)
-        priority_entries.append(entry)
-
-    full_utt = [
-        {"utterance": "강남점 토익 예약하고 싶어요"},
-        {"utterance": "{Branch} {CourseName} 상담 예약할래요"},
-        {"utterance": "{Date} {Time}에 {Branch} {CourseName} 예약"},
-    ]
-    run_aws(cfg, "lexv2-models", "update-intent", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--intent-id", make_intent_id, "--intent-name", "MakeReservation", "--description", "상담/수강 예약 생성", "--sample-utterances", json.dumps(full_utt, ensure_ascii=False), "--slot-priorities", json.dumps(priority_entries), "--fulfillment-code-hook", "enabled=true", output_json=False)
-    print("✅ [5/9] MakeReservation intent/slots OK")
+    def_hash = version_hash({locale_id: plans[locale_id][4] for locale_id in locale_ids})
+
+    # 같은 정의로 이미 만들어 둔 버전이 있으면 build/버전 생성을 건너뛰고 그 버전을 재사용합니다.
+    reuse_version = ""
+    done_version = journal.get(7)
+    if create_new_ver and done_version and done_version.get("defHash") == def_hash:
+        described = run_aws(cfg, "lexv2-models", "describe-bot-version", "--bot-id", bot_id, "--bot-version", done_version["version"], allow_fail=True)
+        if described is not None:
+            reuse_version = done_version["version"]
+    if create_new_ver and not reuse_version:
+        reuse_version = find_version_by_hash(list_versions_newest_first(aws, bot_id), def_hash)
 
     # [6/9] Build
-    print("[6/9] Locale Build 시작")
-    run_aws(cfg, "lexv2-models", "build-bot-locale", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], output_json=False)
-    wait_until(
-        f"Build 완료: {cfg['LOCALE_ID']}",
-        lambda: get_text(cfg, "lexv2-models", "describe-bot-locale", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", cfg["LOCALE_ID"], "--query", "botLocaleStatus"),
-        {"Built"},
-        {"Failed"},
-        900,
-        10,
-    )
+    # locale build 는 서로 독립적이므로 모두 요청한 뒤 한 루프에서 함께 기다립니다.
+    step("[6/9] Locale Build 시작")
+    if reuse_version:
+        print(f" - 정의 해시 일치(version={reuse_version}): build 생략")
+    else:
+        for locale_id in locale_ids:
+            if not plans[locale_id][3] and locale_status[locale_id] == "Built":
+                print(f" - {locale_id}: 변경 없음 + 이미 Built: build 생략")
+            elif not plans[locale_id][3] and locale_status[locale_id] == "Building":
+                # 중단된 이전 실행의 build 가 아직 진행 중이면 다시 요청하지 않고 기다리기만 합니다.
+                print(f" - {locale_id}: 이전 build 진행 중: 완료 대기")
+            else:
+                run_aws(cfg, "lexv2-models", "build-bot-locale", "--bot-id", bot_id, "--bot-version", "DRAFT", "--locale-id", locale_id, output_json=False)
+        wait_all(
+            [Watch(f"Build 완료: {locale_id}", locale_status_fn(cfg, bot_id, locale_id, allow_fail=False), {"Built"}, {"Failed"}) for locale_id in locale_ids],
+            900,
+            BUILD,
+        )
+    journal.record(6, defHash=def_hash, locales=locale_ids)
 
     # [7/9] Version
-    print("[7/9] Bot Version")
-    if create_new_ver:
-        version = run_aws(cfg, "lexv2-models", "create-bot-version", "--bot-id", bot_id, "--bot-version-locale-specification", json.dumps({cfg["LOCALE_ID"]: {"sourceBotVersion": "DRAFT"}}))["botVersion"]
+    step("[7/9] Bot Version")
+    if reuse_version:
+        version = reuse_version
+        print(f" - 정의 해시 일치 버전 재사용: {version}")
+    elif create_new_ver:
+        version = run_aws(
+            cfg,
+            "lexv2-models",
+            "create-bot-version",
+            "--bot-id",
+            bot_id,
+            "--description",
+            f"lex-bootstrap {DEFINITION_HASH_TAG}{def_hash}",
+            "--bot-version-locale-specification",
+            json.dumps({locale_id: {"sourceBotVersion": "DRAFT"} for locale_id in locale_ids}),
+        )["botVersion"]
         print(f" - 새 버전 생성: {version}")
     else:
-        versions = run_aws(cfg, "lexv2-models", "list-bot-versions", "--bot-id", bot_id, "--max-results", "50")
-        items = [v for v in versions.get("botVersionSummaries", []) if v.get("botVersion") != "DRAFT"]
-        items.sort(key=lambda x: x.get("creationDateTime", ""))
-        if not items:
+        latest = next((v for v in list_versions_newest_first(aws, bot_id) if v.get("botVersion") != "DRAFT"), None)
+        if not latest:
             raise ScriptError("재사용할 버전이 없어 새 버전을 생성하세요.")
-        version = items[-1]["botVersion"]
+        version = latest["botVersion"]
         print(f" - 기존 최신 버전 재사용: {version}")
+    journal.record(7, version=version, defHash=def_hash)
 
     wait_until(
         f"Bot Available: botId={bot_id}",
@@ -477,28 +788,33 @@ def main() -> int:
         {"Available"},
         {"Failed"},
         300,
-        5,
     )
 
     # [8/9] Alias
-    print(f"[8/9] Alias 생성/갱신: {cfg['BOT_ALIAS_NAME']}")
-    aliases = run_aws(cfg, "lexv2-models", "list-bot-aliases", "--bot-id", bot_id, "--max-results", "50")
-    alias_id = find_summary_id(aliases.get("botAliasSummaries", []), "botAliasName", "botAliasId", cfg["BOT_ALIAS_NAME"])
-    if cfg.get("LAMBDA_ARN"):
-        locale_settings = {cfg["LOCALE_ID"]: {"enabled": True, "codeHookSpecification": {"lambdaCodeHook": {"lambdaARN": cfg["LAMBDA_ARN"], "codeHookInterfaceVersion": "1.0"}}}}
-    else:
-        locale_settings = {cfg["LOCALE_ID"]: {"enabled": True}}
-
-    wait_until(
-        f"Bot Available: botId={bot_id}",
-        lambda: get_text(cfg, "lexv2-models", "describe-bot", "--bot-id", bot_id, "--query", "botStatus", allow_fail=True),
-        {"Available"},
-        {"Failed"},
-        300,
-        5,
-    )
-
-    if alias_id:
+    step(f"[8/9] Alias 생성/갱신: {cfg['BOT_ALIAS_NAME']}")
+    # list-bot-aliases 는 서버 측 필터가 없어 이름이 나올 때까지만 page를 읽습니다.
+    alias = find_summary(paginate(aws, "lexv2-models", "list-bot-aliases", "--bot-id", bot_id, items_key="botAliasSummaries"), "botAliasName", cfg["BOT_ALIAS_NAME"])
+    alias_id = alias.get("botAliasId", "") if alias else ""
+    alias_version = alias.get("botVersion", "") if alias else ""
+    locale_settings: dict[str, Any] = {}
+    for locale_id in locale_ids:
+        lambda_arn = locale_cfg[locale_id].get("LAMBDA_ARN")
+        if lambda_arn:
+            locale_settings[locale_id] = {"enabled": True, "codeHookSpecification": {"lambdaCodeHook": {"lambdaARN": lambda_arn, "codeHookInterfaceVersion": "1.0"}}}
+        else:
+            locale_settings[locale_id] = {"enabled": True}
+
+    alias_current = False
+    if alias_id and alias_version == version:
+        # alias 가 바뀌면 list 의 lastUpdatedDateTime 도 바뀌므로 그때만 다시 describe 합니다.
+        stamp = alias.get("lastUpdatedDateTime") if alias else None
+        describe_alias = lambda: run_aws(cfg, "lexv2-models", "describe-bot-alias", "--bot-id", bot_id, "--bot-alias-id", alias_id)
+        described = cache.cached(f"{bot_id}/alias/{alias_id}", describe_alias, describe_ttl, stamp) if stamp else describe_alias()
+        alias_current = not differs(locale_settings, described.get("botAliasLocaleSettings"))
+
+    if alias_current:
+        print(f" - Alias 변경 없음: {alias_id} (version={version})")
+    elif alias_id:
         run_aws(cfg, "lexv2-models", "update-bot-alias", "--bot-id", bot_id, "--bot-alias-id", alias_id, "--bot-alias-name", cfg["BOT_ALIAS_NAME"], "--bot-version", version, "--bot-alias-locale-settings", json.dumps(locale_settings), output_json=False)
         print(f" - Alias 갱신: {alias_id}")
     else:
@@ -512,16 +828,70 @@ def main() -> int:
         {"Available"},
         {"Failed"},
         300,
-        5,
     )
+    journal.record(8, aliasId=alias_id, version=version)
+    print(f" - 메타데이터 캐시: hit={cache.stats.hits} miss={cache.stats.misses} stale={cache.stats.stale}", file=sys.stderr)
+    result = {"botId": bot_id, "version": version, "aliasId": alias_id, "locales": locale_ids}
+    journal.record(9, **result)
+    return result
+
+
+def traced_bootstrap(cfg: dict[str, str], locale_cfgs: list[dict[str, str]], plan_only: bool, resume: bool) -> dict[str, Any]:
+    try:
+        return bootstrap(cfg, locale_cfgs, plan_only, resume)
+    finally:
+        lex_trace.end_step()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_cli(argv)
+    cfg = get_config()
+    trace_to = args.trace if args.trace is not None else ("" if cfg.get("TRACE", "false").lower() == "true" else None)
+    if trace_to is None:
+        return run(args, cfg)
+
+    lex_trace.start_trace()
+    try:
+        return run(args, cfg)
+    finally:
+        tracer = lex_trace.stop_trace()
+        if tracer is not None:
+            tracer.end_step()
+            path = lex_trace.trace_path(cfg, trace_to)
+            summary = lex_trace.write_trace(tracer, path, {"botName": cfg["BOT_NAME"], "region": cfg["AWS_REGION"], "argv": sys.argv[1:]})
+            print("\n타이밍 요약:")
+            print(lex_trace.format_summary(summary))
+            print(f"   trace: {path} (chrome://tracing 또는 ui.perfetto.dev 에서 열기)")
+
+
+def run(args: argparse.Namespace, cfg: dict[str, str]) -> int:
+    if args.fleet:
+        from lex_fleet import load_manifest, run_fleet
+
+        jobs = load_manifest(Path(args.fleet), cfg)
+        max_parallel = args.max_parallel or int(cfg.get("FLEET_CONCURRENCY", "4"))
+        results = run_fleet(jobs, lambda job: traced_bootstrap(job.cfg, job.locale_cfgs, args.plan, args.resume), max_parallel, Path(cfg.get("TMP_DIR", "/tmp")))
+        print("\nAPI 호출 통계:")
+        print(format_call_stats(get_backend(cfg).counters()))
+        return 0 if all(r.ok for r in results) else 1
+
+    with collect_stats() as waits:
+        result = traced_bootstrap(cfg, [cfg], args.plan, args.resume)
+    if result.get("planned"):
+        return 0
 
     # [9/9] Summary
-    print("[9/9] 결과 요약")
+    bot_id, version, alias_id = result["botId"], result["version"], result["aliasId"]
+    step("[9/9] 결과 요약")
     print("✅ 완료")
     print(f"- BOT_ID={bot_id}")
     print(f"- BOT_VERSION={version}")
     print(f"- BOT_ALIAS_ID={alias_id}")
     print(f"- LOCALE_ID={cfg['LOCALE_ID']}")
+    print("\n대기 통계:")
+    print(format_stats(waits))
+    print("\nAPI 호출 통계:")
+    print(format_call_stats(get_backend(cfg).counters()))
     print("\nNode 서버에서 사용할 환경변수:")
     print(f"export AWS_REGION={cfg['AWS_REGION']}")
     print(f"export LEX_BOT_ID={bot_id}")
@@ -529,6 +899,11 @@ def main() -> int:
     print(f"export LEX_LOCALE_ID={cfg['LOCALE_ID']}")
     print("\n(참고) ko_KR에서 Date/Time 전용 built-in이 없으면 AMAZON.AlphaNumeric로 수집됩니다.")
     print("→ CodeHook(Lambda)에서 정규화/검증 권장.")
+    if args.regression:
+        from lex_regression import regression_after_bootstrap
+
+        print(f"\n회귀 테스트: alias={alias_id}")
+        return 0 if regression_after_bootstrap(cfg, bot_id, alias_id) else 1
     return 0
 
 
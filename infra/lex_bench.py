@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""lex-bootstrap 벤치마크 (오프라인 fake control plane, ``lex_fakeaws.py``).
+
+같은 fake 계정 상태에서 세 시나리오를 순서대로 실행합니다.
+
+- cold-create : 빈 계정에서 role/bot/locale/slot type/intent/slot 생성 → build → version → alias
+- no-op       : 같은 설정으로 다시 실행 (정의 해시 일치 → build/버전 생략이 기대값)
+- small-change: BRANCH_VALUES 에 값 하나 추가 (slot type 1개 갱신 → build → 새 버전 → alias 갱신)
+
+시나리오마다 wall time, API 호출 수(재시도 포함), 변경 호출 수, throttle 수, 상태 대기 시간,
+호출 속도 제한 대기 시간을 잽니다. ``--repeat`` 번 반복하면 중앙값을 씁니다.
+
+예::
+
+    python3 infra/lex_bench.py --json-out /tmp/bench.json
+    python3 infra/lex_bench.py --baseline /tmp/bench.json          # 기준보다 나빠지면 종료 코드 1
+    python3 infra/lex_bench.py --latency-ms 30,build-bot-locale=200 --throttle-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import lex_trace
+from lex_client import use_backend
+from lex_fakeaws import FakeLexControlPlane, per_operation
+
+BOOTSTRAP_PATH = Path(__file__).resolve().parent / "lex-bootstrap.py"
+SMALL_CHANGE_VALUE = "벤치마크점"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    configure: Callable[[dict[str, str]], dict[str, str]]
+
+
+def _small_change(cfg: dict[str, str]) -> dict[str, str]:
+    return {**cfg, "BRANCH_VALUES": f"{cfg['BRANCH_VALUES']},{SMALL_CHANGE_VALUE}"}
+
+
+SCENARIOS = (
+    Scenario("cold-create", dict),
+    Scenario("no-op", dict),
+    Scenario("small-change", _small_change),
+)
+
+
+@dataclass
+class BenchResult:
+    scenario: str
+    wall_s: float
+    calls: int
+    mutations: int
+    throttles: int
+    wait_s: float
+    limited_s: float
+
+
+def load_bootstrap() -> Any:
+    spec = importlib.util.spec_from_file_location("lex_bootstrap", BOOTSTRAP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_config(bootstrap: Any, tmp_dir: str) -> dict[str, str]:
+    # 사용자 config 의 BOT_ID/파일 카탈로그/trace 설정이 결과에 섞이지 않도록 고정합니다.
+    cfg = bootstrap.get_config()
+    for key in ("BOT_ID", "BRANCH_VALUES_FILE", "COURSE_VALUES_FILE", "CACHE_DIR", "TRACE_DIR"):
+        cfg.pop(key, None)
+    cfg.update({"TMP_DIR": tmp_dir, "BOOTSTRAP_ENGINE": "api", "REUSE_EXISTING_BOT": "true", "CREATE_NEW_VERSION": "true"})
+    return cfg
+
+
+def run_scenario(bootstrap: Any, fake: FakeLexControlPlane, scenario: Scenario, base_cfg: dict[str, str], verbose: bool = False) -> BenchResult:
+    cfg = scenario.configure(base_cfg)
+    # 시나리오마다 RetryingBackend 를 새로 감싸 token bucket/카운터를 초기화합니다.
+    use_backend(fake)
+    calls, mutations, throttles = len(fake.calls), fake.mutations, sum(fake.throttled.values())
+    log = io.StringIO()
+    tracer = lex_trace.start_trace()
+    started = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(log))
+                stack.enter_context(contextlib.redirect_stderr(log))
+            bootstrap.traced_bootstrap(cfg, [cfg], False, False)
+    except Exception:
+        print(log.getvalue()[-4000:], file=sys.stderr)
+        raise
+    finally:
+        wall = time.perf_counter() - started
+        lex_trace.stop_trace()
+    summary = lex_trace.summarize(tracer.events)
+    return BenchResult(
+        scenario.name,
+        round(wall, 3),
+        len(fake.calls) - calls,
+        fake.mutations - mutations,
+        sum(fake.throttled.values()) - throttles,
+        round(sum(w["ms"] for w in summary["waits"]) / 1000, 3),
+        round(sum(op["limitedMs"] for op in summary["calls"].values()) / 1000, 3),
+    )
+
+
+def run_suite(make_fake: Callable[[], FakeLexControlPlane], repeat: int = 1, verbose: bool = False) -> list[BenchResult]:
+    """시나리오 묶음을 ``repeat``번 실행하고 시나리오별 중앙값을 돌려줍니다 (반복마다 새 fake 계정)."""
+    bootstrap = load_bootstrap()
+    runs: dict[str, list[BenchResult]] = {s.name: [] for s in SCENARIOS}
+    try:
+        for _ in range(max(1, repeat)):
+            fake = make_fake()
+            with tempfile.TemporaryDirectory(prefix="lex-bench-") as tmp_dir:
+                base_cfg = bench_config(bootstrap, tmp_dir)
+                for scenario in SCENARIOS:
+                    runs[scenario.name].append(run_scenario(bootstrap, fake, scenario, base_cfg, verbose))
+    finally:
+        use_backend(None)
+    return [_median(name, results) for name, results in runs.items()]
+
+
+def _median(name: str, results: list[BenchResult]) -> BenchResult:
+    def mid(key: str) -> Any:
+        values = [getattr(r, key) for r in results]
+        value = statistics.median(values)
+        return round(value) if isinstance(values[0], int) else round(value, 3)
+
+    return BenchResult(name, *(mid(key) for key in ("wall_s", "calls", "mutations", "throttles", "wait_s", "limited_s")))
+
+
+def format_results(results: list[BenchResult]) -> str:
+    lines = [f"   {'scenario':<13} {'wall':>8} {'calls':>6} {'mutations':>9} {'throttles':>9} {'wait':>8} {'limit':>8}"]
+    for r in results:
+        lines.append(f"   {r.scenario:<13} {r.wall_s:>7.2f}s {r.calls:>6} {r.mutations:>9} {r.throttles:>9} {r.wait_s:>7.2f}s {r.limited_s:>7.2f}s")
+    return "\n".join(lines)
+
+
+def compare(baseline: list[dict[str, Any]], results: list[BenchResult], time_tolerance: float = 0.25, call_tolerance: float = 0.1) -> list[str]:
+    """기준 결과보다 나빠진 항목을 설명하는 문장 목록 (비어 있으면 통과).
+
+    변경 호출 수는 늘면 안 되고, 전체 호출 수와 wall time 은 허용 비율까지 봐줍니다
+    (wait polling 횟수와 jitter 때문에 실행마다 조금씩 다릅니다).
+    """
+    base = {b["scenario"]: b for b in baseline}
+    problems = []
+    for r in results:
+        b = base.get(r.scenario)
+        if b is None:
+            continue
+        if r.mutations > b["mutations"]:
+            problems.append(f"{r.scenario}: 변경 호출 {b['mutations']} → {r.mutations}")
+        if r.calls > b["calls"] * (1 + call_tolerance) + 1:
+            problems.append(f"{r.scenario}: API 호출 {b['calls']} → {r.calls}")
+        # 아주 짧은 시나리오의 측정 잡음은 50ms 까지 무시합니다.
+        if r.wall_s > b["wall_s"] * (1 + time_tolerance) + 0.05:
+            problems.append(f"{r.scenario}: wall time {b['wall_s']:.2f}s → {r.wall_s:.2f}s")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="lex-bootstrap 오프라인 벤치마크")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (시나리오별 중앙값 보고)")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="상태 전이 시간 배율 (1 이면 실제 서비스와 비슷한 build 90초)")
+    parser.add_argument("--latency-ms", default="0", help="호출 지연, 예: 30,build-bot-locale=200")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="호출마다 ThrottlingException 을 낼 확률")
+    parser.add_argument("--tps", default="0", help="작업별 초당 호출 한도 (넘으면 throttle), 예: 10,create-slot=2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", type=Path, help="결과를 JSON 으로 저장 (다음 실행의 --baseline)")
+    parser.add_argument("--baseline", type=Path, help="이 결과보다 나빠지면 종료 코드 1")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="wall time 허용 증가 비율")
+    parser.add_argument("--verbose", action="store_true", help="bootstrap 출력을 그대로 보여줍니다.")
+    args = parser.parse_args(argv)
+
+    latency, latency_by_op = per_operation(args.latency_ms, 0.001)
+    tps, tps_by_op = per_operation(args.tps)
+
+    def make_fake() -> FakeLexControlPlane:
+        return FakeLexControlPlane(
+            time_scale=args.time_scale,
+            latency=latency,
+            latency_by_op=latency_by_op,
+            throttle_rate=args.throttle_rate,
+            tps=tps,
+            tps_by_op=tps_by_op,
+            seed=args.seed,
+        )
+
+    results = run_suite(make_fake, args.repeat, args.verbose)
+    print(f"bootstrap 벤치마크 (time-scale={args.time_scale}, repeat={args.repeat})")
+    print(format_results(results))
+    if args.json_out:
+        args.json_out.write_text(json.dumps([asdict(r) for r in results], ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        problems = compare(json.loads(args.baseline.read_text(encoding="utf-8")), results, args.time_tolerance)
+        for problem in problems:
+            print(f"❌ 회귀: {problem}")
+        if problems:
+            return 1
+        print(f"✅ 기준({args.baseline}) 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""디스크 메타데이터 캐시 (lex-bootstrap.py 공용).
+
+재실행마다 같은 built-in 목록과 describe 응답을 다시 받지 않도록 응답을
+``$CACHE_DIR/v<버전>/<account>/<region>/`` 아래에 항목별 JSON 파일로 저장합니다.
+
+- 항목마다 TTL을 두고, 만료되면 miss로 처리합니다.
+- ``stamp``(보통 list 응답의 ``lastUpdatedDateTime``)가 저장 시점과 다르면 miss로 처리합니다.
+- 파일은 임시 파일에 쓴 뒤 ``os.replace``로 바꿔 fleet 모드의 동시 실행이 서로의 반쪽 파일을 읽지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# 저장 형식이 바뀌면 올립니다. 이전 버전 디렉터리는 읽지 않습니다.
+CACHE_VERSION = 1
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+
+
+class MetadataCache:
+    def __init__(self, root: Path, account: str, region: str, clock: Callable[[], float] = time.time) -> None:
+        self.dir = root / f"v{CACHE_VERSION}" / _safe(account) / _safe(region)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self.dir / f"{_safe(key)[:80]}-{digest}.json"
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def get(self, key: str, stamp: str | None = None) -> Any:
+        """유효한 값이 있으면 돌려주고, 없거나 만료/변경되었으면 ``None``."""
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        if (
+            entry.get("version") != CACHE_VERSION
+            or entry.get("key") != key
+            or self._clock() >= entry.get("storedAt", 0) + entry.get("ttl", 0)
+            or (stamp is not None and entry.get("stamp") != stamp)
+        ):
+            self._count("stale")
+            return None
+        self._count("hits")
+        return entry.get("value")
+
+    def put(self, key: str, value: Any, ttl: float, stamp: str | None = None) -> None:
+        entry = {"version": CACHE_VERSION, "key": key, "storedAt": self._clock(), "ttl": ttl, "stamp": stamp, "value": value}
+        write_atomic(self._path(key), json.dumps(entry, ensure_ascii=False))
+
+    def invalidate(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def cached(self, key: str, fn: Callable[[], Any], ttl: float, stamp: str | None = None) -> Any:
+        """캐시에 있으면 그 값을, 없으면 ``fn()``을 호출해 저장한 뒤 돌려줍니다."""
+        value = self.get(key, stamp)
+        if value is not None:
+            return value
+        value = fn()
+        if value is not None:
+            self.put(key, value, ttl, stamp)
+        return value
+
+
+class NullCache(MetadataCache):
+    """캐시를 끈 경우 (``METADATA_CACHE=false``). 항상 miss 이고 아무것도 저장하지 않습니다."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, stamp: str | None = None) -> Any:
+        self._count("misses")
+        return None
+
+    def put(self, key: str, value: Any, ttl: float, stamp: str | None = None) -> None:
+        return None
+
+    def invalidate(self, key: str) -> None:
+        return None
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """같은 디렉터리의 임시 파일에 쓴 뒤 rename 해서, 읽는 쪽이 반쪽 파일을 보지 않게 합니다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _safe(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]", "_", text) or "_"
+
+
+def open_cache(cfg: dict[str, str], account: str) -> MetadataCache:
+    if cfg.get("METADATA_CACHE", "true").lower() != "true":
+        return NullCache()
+    root = Path(cfg.get("CACHE_DIR") or Path(cfg.get("TMP_DIR", "/tmp")) / "lex-cache")
+    return MetadataCache(root, account, cfg["AWS_REGION"])
@@ -0,0 +1,157 @@
+"""대용량 slot type 값 카탈로그 (CSV / JSONL) 로더.
+
+``BRANCH_VALUES``/``COURSE_VALUES`` 같은 쉼표 문자열 대신 파일에서 값과 동의어를 읽습니다.
+
+- CSV  : ``value,synonyms`` (동의어는 ``|``로 구분, header 행은 선택)
+- JSONL: 한 줄에 ``{"value": "토익", "synonyms": ["TOEIC", "토익반"]}``
+
+파일은 한 줄씩 읽으며 값은 대소문자/공백을 무시한 set 으로 중복을 거릅니다 (먼저 나온 행 우선).
+Lex V2 에는 slot 값 일부만 추가/삭제하는 API 가 없어 update-slot-type 은 항상 전체 목록을 보내므로,
+``value_diff``로 실제 변경이 있을 때만 update 하도록 plan 단계에서 비교합니다.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from lex_client import ScriptError
+
+# (값, 동의어들)
+SlotValue = tuple[str, tuple[str, ...]]
+
+# slot type 하나에 넣을 수 있는 값/동의어 수의 기본 한도 (계정 quota 에 맞게 설정으로 조정)
+DEFAULT_MAX_VALUES = 10000
+DEFAULT_MAX_SYNONYMS = 20
+
+
+@dataclass
+class CatalogStats:
+    rows: int = 0
+    values: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+
+def split_csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _rows(path: Path) -> Iterator[tuple[str, list[str]]]:
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as exc:
+                    raise ScriptError(f"{path}:{lineno}: JSON 형식 오류 ({exc})") from exc
+                if isinstance(item, str):
+                    yield item, []
+                else:
+                    yield str(item.get("value", "")), [str(s) for s in item.get("synonyms") or []]
+            return
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#") or [c.strip().lower() for c in row[:1]] == ["value"]:
+                continue
+            synonyms = row[1].split("|") if len(row) > 1 else []
+            yield row[0], synonyms
+
+
+def read_catalog(
+    path: Path,
+    max_values: int = DEFAULT_MAX_VALUES,
+    max_synonyms: int = DEFAULT_MAX_SYNONYMS,
+    stats: CatalogStats | None = None,
+) -> Iterator[SlotValue]:
+    """카탈로그 파일을 스트리밍으로 읽어 중복이 제거된 ``(값, 동의어)``를 내놓습니다."""
+    stats = stats if stats is not None else CatalogStats()
+    seen: set[str] = set()
+    for raw_value, raw_synonyms in _rows(path):
+        stats.rows += 1
+        value = " ".join(raw_value.split())
+        if not value:
+            stats.skipped += 1
+            continue
+        key = _key(value)
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        synonyms: list[str] = []
+        synonym_keys = {key}
+        for raw in raw_synonyms:
+            synonym = " ".join(raw.split())
+            if synonym and _key(synonym) not in synonym_keys:
+                synonym_keys.add(_key(synonym))
+                synonyms.append(synonym)
+        if len(synonyms) > max_synonyms:
+            raise ScriptError(f"{path}: '{value}'의 동의어가 {len(synonyms)}개로 한도({max_synonyms})를 넘습니다.")
+        stats.values += 1
+        if stats.values > max_values:
+            raise ScriptError(f"{path}: 값이 한도({max_values}개)를 넘습니다. slot type 을 나누거나 한도를 조정하세요.")
+        yield value, tuple(synonyms)
+
+
+def load_catalog(cfg: dict[str, str], name: str) -> tuple[str | SlotValue, ...]:
+    """``<name>_VALUES_FILE``이 있으면 파일에서, 없으면 ``<name>_VALUES`` 쉼표 문자열에서 값을 읽습니다."""
+    file_name = cfg.get(f"{name}_VALUES_FILE", "")
+    if not file_name:
+        return tuple(split_csv(cfg[f"{name}_VALUES"]))
+    path = Path(file_name)
+    if not path.is_file():
+        raise ScriptError(f"{name}_VALUES_FILE을 찾을 수 없습니다: {path}")
+    stats = CatalogStats()
+    values = tuple(
+        read_catalog(
+            path,
+            int(cfg.get("CATALOG_MAX_VALUES", str(DEFAULT_MAX_VALUES))),
+            int(cfg.get("CATALOG_MAX_SYNONYMS", str(DEFAULT_MAX_SYNONYMS))),
+            stats,
+        )
+    )
+    print(
+        f" - {name}_VALUES_FILE: {path} (rows={stats.rows} values={stats.values} 중복={stats.duplicates} 빈 값={stats.skipped})",
+        file=sys.stderr,
+    )
+    return values
+
+
+@dataclass
+class ValueDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def render(self) -> str:
+        return f"slotTypeValues +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+
+def value_index(slot_type_values: list[dict[str, Any]] | None) -> dict[str, frozenset[str]]:
+    """``slotTypeValues`` API 형식을 값 → 동의어 set 으로 바꿉니다 (순서 무시)."""
+    out: dict[str, frozenset[str]] = {}
+    for item in slot_type_values or []:
+        value = (item.get("sampleValue") or {}).get("value", "")
+        out[value] = frozenset(s.get("value", "") for s in item.get("synonyms") or [])
+    return out
+
+
+def value_diff(desired: list[dict[str, Any]], current: list[dict[str, Any]] | None) -> ValueDiff:
+    want, have = value_index(desired), value_index(current)
+    return ValueDiff(
+        added=[v for v in want if v not in have],
+        removed=[v for v in have if v not in want],
+        changed=[v for v in want if v in have and want[v] != have[v]],
+    )
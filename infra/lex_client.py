@@ -0,0 +1,620 @@
+"""AWS 호출 백엔드 (lex-bootstrap.py 공용).
+
+`run_aws`/`get_text`가 사용하는 호출 계층입니다.
+
+- ``sdk`` : boto3 세션 하나와 풀링된 HTTPS 연결을 재사용하는 in-process 백엔드
+- ``cli`` : 호출마다 ``aws`` 프로세스를 띄우는 기존 방식 (boto3가 없을 때 fallback)
+- ``fake``: 오프라인 Lex control plane (``lex_fakeaws.py``, 상태 전이/지연/throttling 흉내)
+
+백엔드 선택은 ``AWS_BACKEND`` (auto|sdk|cli|fake) 설정으로 합니다. 테스트에서는 ``use_backend``로 직접 주입합니다.
+모든 백엔드는 ``RetryingBackend``로 감싸져, 재시도 가능한 오류(Throttling/Conflict/
+PreconditionFailed 등)를 backoff 후 다시 시도하고 API별 token bucket으로 호출 속도를 제한합니다.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import random
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import lex_trace
+
+
+class ScriptError(RuntimeError):
+    pass
+
+
+class AwsCallError(ScriptError):
+    """AWS API 호출 실패. ``code``에는 ThrottlingException 같은 오류 코드가 들어갑니다."""
+
+    def __init__(self, message: str, code: str = "", operation: str = "") -> None:
+        super().__init__(message)
+        self.code = code
+        self.operation = operation
+
+
+@dataclass(frozen=True)
+class AwsRequest:
+    """``aws <service> <operation> --opt value ...`` 한 번에 해당하는 호출."""
+
+    service: str
+    operation: str
+    options: dict[str, str] = field(default_factory=dict)
+    query: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.service} {self.operation}"
+
+    def argv(self) -> list[str]:
+        out = [self.service, self.operation]
+        for key, value in self.options.items():
+            out.extend([f"--{key}", value])
+        return out
+
+
+def parse_args(args: tuple[str, ...] | list[str]) -> tuple[AwsRequest, str]:
+    """CLI 스타일 인자를 ``AwsRequest``와 출력 형식(json/text)으로 분해합니다."""
+    if len(args) < 2:
+        raise ScriptError(f"잘못된 AWS 호출 인자: {list(args)}")
+    service, operation, rest = args[0], args[1], list(args[2:])
+    options: dict[str, str] = {}
+    query = ""
+    output = "json"
+    i = 0
+    while i < len(rest):
+        token = rest[i]
+        if not token.startswith("--"):
+            raise ScriptError(f"잘못된 AWS 호출 인자: {token}")
+        name = token[2:]
+        has_value = i + 1 < len(rest) and not rest[i + 1].startswith("--")
+        value = rest[i + 1] if has_value else ""
+        i += 2 if has_value else 1
+        if name == "query":
+            query = value
+        elif name == "output":
+            output = value or "json"
+        elif not has_value:
+            # boolean 플래그: --flag / --no-flag
+            if name.startswith("no-"):
+                options[name[3:]] = "false"
+            else:
+                options[name] = "true"
+        else:
+            options[name] = value
+    return AwsRequest(service, operation, options, query), output
+
+
+def apply_query(data: Any, expr: str) -> Any:
+    if not expr:
+        return data
+    try:
+        import jmespath
+    except ImportError:
+        jmespath = None
+    if jmespath is not None:
+        return jmespath.search(expr, data)
+    # jmespath가 없으면 단순 점(.) 경로만 지원
+    cur = data
+    for part in expr.split("."):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
+
+
+def to_text(value: Any) -> str:
+    """``--output text``와 같은 형태로 값을 문자열로 바꿉니다."""
+    if value is None:
+        return "None"
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    if isinstance(value, list) and all(not isinstance(v, (dict, list)) for v in value):
+        return "\t".join(to_text(v) for v in value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _jsonable(value: Any) -> Any:
+    """SDK 응답을 CLI JSON 출력과 같은 모양으로 맞춥니다 (datetime → ISO 문자열)."""
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items() if k != "ResponseMetadata"}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (_dt.datetime, _dt.date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+# API가 허용하는 최대 page 크기 (대부분의 Lex V2 list-* 는 1000, built-in 목록은 20)
+MAX_PAGE_SIZE = {"list-built-in-slot-types": 20, "list-built-in-intents": 20}
+DEFAULT_MAX_PAGE_SIZE = 1000
+
+
+def paginate(run: Callable[..., Any], *args: str, items_key: str) -> Iterator[dict[str, Any]]:
+    """``nextToken``을 따라가며 ``items_key`` 항목을 하나씩 내놓는 lazy generator.
+
+    ``run``은 CLI 스타일 인자를 받아 응답 dict를 돌려주는 함수입니다 (``run_aws`` 등).
+    소비하는 쪽이 멈추면 다음 page는 요청하지 않습니다.
+    """
+    operation = args[1]
+    page_size = MAX_PAGE_SIZE.get(operation, DEFAULT_MAX_PAGE_SIZE)
+    token = ""
+    while True:
+        page_args = [*args, "--max-results", str(page_size)]
+        if token:
+            page_args.extend(["--next-token", token])
+        page = run(*page_args) or {}
+        yield from page.get(items_key, [])
+        token = page.get("nextToken") or ""
+        if not token:
+            return
+
+
+def name_filter(name: str, value: str, operator: str = "EQ") -> list[str]:
+    """Lex V2 list-* 의 서버 측 ``--filters`` 인자 (예: ``name_filter("BotName", "X")``)."""
+    return ["--filters", json.dumps([{"name": name, "values": [value], "operator": operator}])]
+
+
+_ERROR_CODE_RE = re.compile(r"An error occurred \(([^)]+)\)")
+
+
+class CliBackend:
+    """호출마다 ``aws`` CLI 프로세스를 실행하는 백엔드."""
+
+    name = "cli"
+    # Linux 는 인자 하나를 128KiB(MAX_ARG_STRLEN)까지만 허용하므로 큰 값(대용량 slot 값 목록 등)은 file:// 로 넘깁니다.
+    max_arg_bytes = 100_000
+
+    def __init__(self, region: str, aws_bin: str = "aws") -> None:
+        self.region = region
+        self.aws_bin = aws_bin
+
+    def call(self, request: AwsRequest) -> Any:
+        with tempfile.TemporaryDirectory(prefix="lex-cli-") as spill_dir:
+            cmd = [self.aws_bin, "--region", self.region, *self._argv(request, Path(spill_dir))]
+            if request.query:
+                cmd.extend(["--query", request.query])
+            cmd.extend(["--output", "json"])
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            stderr = proc.stderr.strip()
+            match = _ERROR_CODE_RE.search(stderr)
+            raise AwsCallError(
+                f"명령 실패: {shlex.join(cmd)}\n{stderr}",
+                code=match.group(1) if match else "",
+                operation=request.label,
+            )
+        out = proc.stdout.strip()
+        return json.loads(out) if out else {}
+
+    def _argv(self, request: AwsRequest, spill_dir: Path) -> list[str]:
+        out = [request.service, request.operation]
+        for key, value in request.options.items():
+            if len(value.encode("utf-8")) > self.max_arg_bytes:
+                path = spill_dir / f"{key}.json"
+                path.write_text(value, encoding="utf-8")
+                value = f"file://{path}"
+            out.extend([f"--{key}", value])
+        return out
+
+
+class SdkBackend:
+    """boto3 세션 하나를 재사용하는 in-process 백엔드.
+
+    CLI 옵션(``--bot-name``)은 botocore 서비스 모델로 API 파라미터(``botName``)와
+    타입(int/float/bool/JSON/shorthand)으로 변환합니다.
+    """
+
+    name = "sdk"
+
+    def __init__(self, region: str, profile: str = "", max_pool_connections: int = 32) -> None:
+        import boto3
+        from botocore.config import Config
+
+        self.region = region
+        self._session = boto3.session.Session(profile_name=profile or None, region_name=region)
+        # 재시도는 RetryingBackend 한 곳에서만 합니다 (botocore 재시도와 중복되지 않도록).
+        self._config = Config(max_pool_connections=max_pool_connections, retries={"mode": "standard", "total_max_attempts": 1})
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, service: str) -> Any:
+        # boto3 Session 자체는 thread-safe 하지 않으므로 client 생성만 잠금으로 보호합니다.
+        with self._lock:
+            client = self._clients.get(service)
+            if client is None:
+                client = self._session.client(service, config=self._config)
+                self._clients[service] = client
+            return client
+
+    def call(self, request: AwsRequest) -> Any:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        client = self.client(request.service)
+        op_name = client.meta.method_to_api_mapping.get(request.operation.replace("-", "_"))
+        if not op_name:
+            raise ScriptError(f"지원하지 않는 작업: {request.label}")
+        op_model = client.meta.service_model.operation_model(op_name)
+        params = self._build_params(op_model.input_shape, request)
+        method = getattr(client, request.operation.replace("-", "_"))
+        try:
+            result = method(**params)
+        except ClientError as exc:
+            error = exc.response.get("Error", {})
+            raise AwsCallError(
+                f"명령 실패: aws {request.label}\n{exc}",
+                code=error.get("Code", ""),
+                operation=request.label,
+            ) from exc
+        except BotoCoreError as exc:
+            raise AwsCallError(f"명령 실패: aws {request.label}\n{exc}", operation=request.label) from exc
+        return apply_query(_jsonable(result), request.query)
+
+    @classmethod
+    def _build_params(cls, input_shape: Any, request: AwsRequest) -> dict[str, Any]:
+        if input_shape is None:
+            return {}
+        from botocore import xform_name
+
+        by_cli_name = {xform_name(name, "-"): name for name in input_shape.members}
+        params: dict[str, Any] = {}
+        for key, raw in request.options.items():
+            member = by_cli_name.get(key)
+            if member is None:
+                raise ScriptError(f"알 수 없는 옵션: --{key} ({request.label})")
+            params[member] = cls._coerce(input_shape.members[member], raw)
+        return params
+
+    @classmethod
+    def _coerce(cls, shape: Any, value: Any) -> Any:
+        kind = shape.type_name
+        if isinstance(value, str):
+            if value.startswith(("file://", "fileb://")):
+                path = Path(value.split("://", 1)[1])
+                if value.startswith("fileb://"):
+                    return path.read_bytes()
+                value = path.read_text(encoding="utf-8")
+            if kind == "string":
+                return value
+            if kind in ("integer", "long"):
+                return int(value)
+            if kind in ("float", "double"):
+                return float(value)
+            if kind == "boolean":
+                return value.lower() == "true"
+            if kind == "blob":
+                return value.encode("utf-8")
+            if kind in ("structure", "list", "map"):
+                if value.lstrip()[:1] in ("{", "["):
+                    value = json.loads(value)
+                elif kind == "list":
+                    value = [item for item in value.split(",") if item]
+                else:
+                    value = _parse_shorthand(value)
+        if kind == "structure" and isinstance(value, dict):
+            return {k: cls._coerce(shape.members[k], v) if k in shape.members else v for k, v in value.items()}
+        if kind == "list" and isinstance(value, list):
+            return [cls._coerce(shape.member, v) for v in value]
+        if kind == "map" and isinstance(value, dict):
+            return {k: cls._coerce(shape.value, v) for k, v in value.items()}
+        return value
+
+
+def _parse_shorthand(text: str) -> dict[str, str]:
+    """``childDirected=false,enabled=true`` 형태의 단순 shorthand만 지원합니다."""
+    out: dict[str, str] = {}
+    for part in text.split(","):
+        if "=" not in part:
+            raise ScriptError(f"shorthand 구문을 해석할 수 없습니다: {text}")
+        key, value = part.split("=", 1)
+        out[key.strip()] = value.strip()
+    return out
+
+
+Handler = Callable[[AwsRequest], Any]
+
+
+class FakeBackend:
+    """오프라인 테스트용 백엔드.
+
+    ``responses``는 ``"service operation"`` → 응답(dict) 또는 ``AwsRequest``를 받는 callable 입니다.
+    등록되지 않은 호출은 ``ResourceNotFoundException``으로 실패합니다. 모든 호출은 ``calls``에 기록됩니다.
+    """
+
+    name = "fake"
+
+    def __init__(self, responses: dict[str, Any] | None = None, handler: Handler | None = None) -> None:
+        self.responses = dict(responses or {})
+        self.handler = handler
+        self.calls: list[AwsRequest] = []
+        self._lock = threading.Lock()
+
+    def call(self, request: AwsRequest) -> Any:
+        with self._lock:
+            self.calls.append(request)
+        if self.handler is not None:
+            result = self.handler(request)
+        elif request.label in self.responses:
+            result = self.responses[request.label]
+            if callable(result):
+                result = result(request)
+        else:
+            raise AwsCallError(
+                f"명령 실패: aws {request.label}\nfake backend: 등록되지 않은 호출",
+                code="ResourceNotFoundException",
+                operation=request.label,
+            )
+        return apply_query(result, request.query)
+
+
+# LimitExceededException 은 계정/서비스 quota 초과라 기다려도 풀리지 않으므로 넣지 않습니다.
+THROTTLE_CODES = frozenset({"ThrottlingException", "Throttling", "TooManyRequestsException"})
+RETRYABLE_CODES = THROTTLE_CODES | frozenset(
+    {
+        # 다른 작업(build 등)이 진행 중이거나 리소스가 아직 준비되지 않은 경우
+        "ConflictException",
+        "PreconditionFailedException",
+        "InternalServerException",
+        "InternalFailure",
+        "ServiceUnavailable",
+        "ServiceUnavailableException",
+        "RequestTimeout",
+        "RequestTimeoutException",
+    }
+)
+WRITE_PREFIXES = ("create-", "update-", "delete-", "build-", "put-", "start-", "tag-", "untag-")
+
+
+def is_retryable(error: AwsCallError, operation: str = "") -> bool:
+    """``create-*`` 는 멱등이 아니어서 throttle 일 때만 다시 보냅니다.
+
+    시간 초과/5xx 로 실패한 생성이 실제로는 반영됐을 수 있고, 다시 보내면 버전이 하나 더 생기거나
+    이름 충돌(ConflictException)이 납니다. throttle 은 요청이 처리되기 전에 거절된 것이라 안전합니다.
+    """
+    if operation.startswith("create-"):
+        return error.code in THROTTLE_CODES
+    return error.code in RETRYABLE_CODES
+
+
+class TokenBucket:
+    """초당 ``rate``개, 최대 ``burst``개까지 모아 둘 수 있는 토큰 버킷 (스레드 공유)."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._clock = clock
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> None:
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            sleep(wait)
+
+    def drain(self) -> None:
+        """throttle 응답을 받으면 모아 둔 토큰을 버려 같은 API를 쓰는 모든 스레드가 함께 늦춥니다."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+@dataclass
+class CallCounter:
+    calls: int = 0
+    retries: int = 0
+    throttles: int = 0
+    errors: int = 0
+
+
+class RetryingBackend:
+    """재시도 + API별 token bucket 계층. 모든 워커 스레드가 같은 인스턴스를 공유합니다."""
+
+    def __init__(
+        self,
+        inner: Any,
+        max_attempts: int = 8,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        read_rate: float = 10.0,
+        write_rate: float = 5.0,
+        rates: dict[str, float] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.inner = inner
+        self.name = getattr(inner, "name", "")
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.read_rate = read_rate
+        self.write_rate = write_rate
+        self.rates = dict(rates or {})
+        self._sleep = sleep
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._counters: dict[str, CallCounter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_cfg(cls, inner: Any, cfg: dict[str, str]) -> "RetryingBackend":
+        rates: dict[str, float] = {}
+        for item in cfg.get("AWS_API_RATE_LIMITS", "").split(","):
+            if "=" in item:
+                op, rate = item.split("=", 1)
+                rates[op.strip()] = float(rate)
+        return cls(
+            inner,
+            max_attempts=int(cfg.get("AWS_MAX_ATTEMPTS", "8")),
+            base_delay=float(cfg.get("AWS_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(cfg.get("AWS_RETRY_MAX_DELAY", "20")),
+            read_rate=float(cfg.get("AWS_API_READ_RATE", "10")),
+            write_rate=float(cfg.get("AWS_API_WRITE_RATE", "5")),
+            rates=rates,
+        )
+
+    def _bucket(self, request: AwsRequest) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(request.label)
+            if bucket is None:
+                default = self.write_rate if request.operation.startswith(WRITE_PREFIXES) else self.read_rate
+                rate = self.rates.get(request.operation, default)
+                bucket = TokenBucket(rate, max(1.0, rate), self._clock)
+                self._buckets[request.label] = bucket
+            return bucket
+
+    def _count(self, label: str, **deltas: int) -> None:
+        with self._lock:
+            counter = self._counters.setdefault(label, CallCounter())
+            for key, delta in deltas.items():
+                setattr(counter, key, getattr(counter, key) + delta)
+
+    def counters(self) -> dict[str, CallCounter]:
+        with self._lock:
+            return {label: CallCounter(**vars(c)) for label, c in sorted(self._counters.items())}
+
+    def call(self, request: AwsRequest) -> Any:
+        tracing = lex_trace.active() is not None
+        started = time.perf_counter() if tracing else 0.0
+        bucket = self._bucket(request)
+        limited = 0.0
+        for attempt in range(1, self.max_attempts + 1):
+            if tracing:
+                before = time.perf_counter()
+                bucket.acquire(self._sleep)
+                limited += time.perf_counter() - before
+            else:
+                bucket.acquire(self._sleep)
+            self._count(request.label, calls=1)
+            try:
+                result = self.inner.call(request)
+            except AwsCallError as exc:
+                if not is_retryable(exc, request.operation) or attempt == self.max_attempts:
+                    self._count(request.label, errors=1)
+                    if tracing:
+                        lex_trace.record_call(
+                            request.label, started, attempt - 1, limited, lex_trace.payload_size(request.options), 0, exc.code or "error"
+                        )
+                    raise
+                throttled = exc.code in THROTTLE_CODES
+                if throttled:
+                    bucket.drain()
+                self._count(request.label, retries=1, throttles=int(throttled))
+                # full jitter: 여러 스레드가 같은 순간에 다시 몰리지 않도록
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                print(f"   ~ 재시도 {request.label} ({exc.code}, {attempt}/{self.max_attempts}, {delay:.1f}s 후)", file=sys.stderr)
+                self._sleep(delay)
+                continue
+            if tracing:
+                lex_trace.record_call(
+                    request.label, started, attempt - 1, limited, lex_trace.payload_size(request.options), lex_trace.payload_size(result)
+                )
+            return result
+        raise AssertionError("unreachable")
+
+
+def format_call_stats(counters: dict[str, CallCounter]) -> str:
+    if not counters:
+        return "   (호출 없음)"
+    width = max(len(label) for label in counters)
+    lines = [f"   {'operation':<{width}}  {'calls':>5} {'retries':>7} {'throttles':>9} {'errors':>6}"]
+    for label, c in counters.items():
+        lines.append(f"   {label:<{width}}  {c.calls:>5} {c.retries:>7} {c.throttles:>9} {c.errors:>6}")
+    return "\n".join(lines)
+
+
+def _make_cli(cfg: dict[str, str]) -> CliBackend:
+    return CliBackend(cfg["AWS_REGION"], cfg.get("AWS_BIN", "aws"))
+
+
+def _make_sdk(cfg: dict[str, str]) -> SdkBackend:
+    return SdkBackend(
+        cfg["AWS_REGION"],
+        cfg.get("AWS_PROFILE", ""),
+        int(cfg.get("AWS_MAX_POOL_CONNECTIONS", "32")),
+    )
+
+
+def _make_fake(cfg: dict[str, str]) -> Any:
+    from lex_fakeaws import FakeLexControlPlane
+
+    return FakeLexControlPlane.from_cfg(cfg)
+
+
+def _make_auto(cfg: dict[str, str]) -> Any:
+    try:
+        return _make_sdk(cfg)
+    except ImportError:
+        return _make_cli(cfg)
+
+
+BACKEND_FACTORIES: dict[str, Callable[[dict[str, str]], Any]] = {
+    "auto": _make_auto,
+    "sdk": _make_sdk,
+    "cli": _make_cli,
+    "fake": _make_fake,
+}
+
+_backends: dict[tuple[str, ...], RetryingBackend] = {}
+_override: Any = None
+_override_wrapped: RetryingBackend | None = None
+_backends_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[dict[str, str]], Any]) -> None:
+    BACKEND_FACTORIES[name] = factory
+
+
+def use_backend(backend: Any) -> None:
+    """설정과 무관하게 모든 호출을 ``backend``로 보냅니다. ``None``이면 해제합니다."""
+    global _override, _override_wrapped
+    with _backends_lock:
+        _override = backend
+        _override_wrapped = None
+
+
+def get_backend(cfg: dict[str, str]) -> RetryingBackend:
+    """설정에 맞는 백엔드를 ``RetryingBackend``로 감싸 돌려줍니다 (같은 설정이면 같은 인스턴스)."""
+    global _override_wrapped
+    kind = cfg.get("AWS_BACKEND", "auto").lower()
+    key = (kind, cfg["AWS_REGION"], cfg.get("AWS_PROFILE", ""), cfg.get("AWS_BIN", "aws"))
+    with _backends_lock:
+        if _override is not None:
+            if _override_wrapped is None:
+                _override_wrapped = RetryingBackend.from_cfg(_override, cfg)
+            return _override_wrapped
+        backend = _backends.get(key)
+        if backend is None:
+            factory = BACKEND_FACTORIES.get(kind)
+            if factory is None:
+                raise ScriptError(f"알 수 없는 AWS_BACKEND: {kind}")
+            try:
+                backend = RetryingBackend.from_cfg(factory(cfg), cfg)
+            except ImportError as exc:
+                raise ScriptError(f"AWS_BACKEND={kind}에는 boto3가 필요합니다: {exc}") from exc
+            _backends[key] = backend
+        return backend
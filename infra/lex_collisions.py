@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""샘플 발화 충돌 분석 (build 전 로컬 검사).
+
+발화가 다른 intent 의 발화와 거의 같으면 build-bot-locale(수 분~15분)을 기다린 뒤에야,
+혹은 운영에서 오분류로 드러납니다. build 전에 모든 intent 발화의 문자 n-gram TF-IDF 행렬을 만들고
+코사인 유사도가 임계값 이상인 쌍을 찾아 보고합니다.
+
+- collision: 서로 다른 intent 의 발화 쌍 (예: "예약 취소해줘" / "예약 조회해줘")
+- duplicate: 같은 intent 안의 거의 같은 발화 쌍 (학습에 보탬이 되지 않음)
+
+NumPy 가 있으면 행렬을 CSR 배열로 만들고 행 블록 단위로 유사도를 계산합니다. 문서 빈도가 높은
+n-gram(예: "예약")은 작은 dense 행렬로 떼어 BLAS 행렬곱으로, 나머지는 역색인 join 으로 더하므로
+발화 수만 개에서도 메모리를 블록 크기만큼만 씁니다. NumPy 가 없으면 같은 결과를 역색인으로 계산합니다.
+
+단독 실행::
+
+    python3 infra/lex_collisions.py docs/utterances-100.md scripts/seed-testcases.json --threshold 0.7
+    python3 infra/lex_collisions.py --bench 30000        # 합성 발화 3만 개로 검사 시간 측정
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_THRESHOLD = 0.85
+NGRAM_RANGE = (2, 4)
+DEFAULT_BLOCK = 256
+
+_SLOT_REF = re.compile(r"\{(\w+)\}")
+
+# 행 하나 = (열 번호, 가중치) 목록 (L2 정규화됨)
+Row = list[tuple[int, float]]
+
+
+@dataclass(frozen=True)
+class Collision:
+    score: float
+    intent_a: str
+    text_a: str
+    intent_b: str
+    text_b: str
+
+    @property
+    def kind(self) -> str:
+        return "duplicate" if self.intent_a == self.intent_b else "collision"
+
+
+def _ngrams(text: str, slot_chars: dict[str, str]) -> Counter[str]:
+    # {Slot} 참조는 slot 별 문자 하나로 바꿔 slot 이름 길이가 유사도에 섞이지 않게 합니다.
+    def slot_char(match: re.Match[str]) -> str:
+        return slot_chars.setdefault(match.group(1), chr(0xE000 + len(slot_chars)))
+
+    padded = " " + " ".join(_SLOT_REF.sub(slot_char, text).casefold().split()) + " "
+    low, high = NGRAM_RANGE
+    return Counter(padded[i : i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1))
+
+
+def tfidf_rows(texts: list[str]) -> tuple[list[Row], int]:
+    """문자 n-gram TF-IDF (sublinear tf, smooth idf, L2 정규화). ``(행 목록, 열 수)``를 돌려줍니다."""
+    slot_chars: dict[str, str] = {}
+    counts = [_ngrams(text, slot_chars) for text in texts]
+    vocab: dict[str, int] = {}
+    df: Counter[int] = Counter()
+    for grams in counts:
+        for gram in grams:
+            df[vocab.setdefault(gram, len(vocab))] += 1
+    n = len(texts)
+    idf = {col: math.log((1 + n) / (1 + d)) + 1 for col, d in df.items()}
+    rows: list[Row] = []
+    for grams in counts:
+        row = [(vocab[g], (1 + math.log(tf)) * idf[vocab[g]]) for g, tf in grams.items()]
+        norm = math.sqrt(sum(w * w for _, w in row)) or 1.0
+        rows.append(sorted((col, w / norm) for col, w in row))
+    return rows, len(vocab)
+
+
+def _pairs_python(rows: list[Row], threshold: float) -> Iterator[tuple[int, int, float]]:
+    postings: dict[int, list[tuple[int, float]]] = defaultdict(list)
+    for i, row in enumerate(rows):
+        acc: dict[int, float] = defaultdict(float)
+        for col, w in row:
+            for j, v in postings[col]:
+                acc[j] += w * v
+        for j, score in acc.items():
+            if score >= threshold:
+                yield j, i, score
+        for col, w in row:
+            postings[col].append((i, w))
+
+
+def _pairs_numpy(rows: list[Row], n_cols: int, threshold: float, block: int) -> Iterator[tuple[int, int, float]]:
+    import numpy as np
+
+    n = len(rows)
+    lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=n)
+    indices = np.fromiter((c for r in rows for c, _ in r), dtype=np.int64, count=int(lengths.sum()))
+    data = np.fromiter((w for r in rows for _, w in r), dtype=np.float32, count=len(indices))
+    row_of = np.repeat(np.arange(n), lengths)
+
+    # 문서 빈도가 n/32 를 넘는 열은 dense 로 (BLAS), 나머지는 열 기준 역색인(CSC)으로 계산합니다.
+    # 역색인 join 비용은 빈도의 제곱에 비례하므로 아주 흔한 n-gram 만 dense 로 보내는 편이 빠릅니다.
+    df = np.bincount(indices, minlength=n_cols)
+    head = np.flatnonzero(df > max(16, n // 32))
+    head_pos = np.full(n_cols, -1, dtype=np.int64)
+    head_pos[head] = np.arange(len(head))
+    in_head = head_pos[indices] >= 0
+    dense = np.zeros((n, len(head)), dtype=np.float32)
+    dense[row_of[in_head], head_pos[indices[in_head]]] = data[in_head]
+
+    t_rows, t_cols, t_vals = row_of[~in_head], indices[~in_head], data[~in_head]
+    order = np.argsort(t_cols, kind="stable")
+    c_rows, c_vals = t_rows[order], t_vals[order]
+    c_ptr = np.zeros(n_cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(t_cols, minlength=n_cols), out=c_ptr[1:])
+    r_ptr = np.searchsorted(t_rows, np.arange(n + 1))
+
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        width = n - start
+        # 블록 행 × (start 이후 열) 만 계산합니다 (대칭이므로 아래 삼각은 필요 없음).
+        sims = dense[start:stop] @ dense[start:].T if len(head) else np.zeros((stop - start, width), dtype=np.float32)
+
+        lo, hi = r_ptr[start], r_ptr[stop]
+        e_rows, e_cols, e_vals = t_rows[lo:hi] - start, t_cols[lo:hi], t_vals[lo:hi]
+        counts = c_ptr[e_cols + 1] - c_ptr[e_cols]
+        total = int(counts.sum())
+        if total:
+            entry = np.repeat(np.arange(len(e_cols)), counts)
+            offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            pos = c_ptr[e_cols][entry] + offset
+            other = c_rows[pos] - start
+            keep = other >= 0
+            flat = e_rows[entry[keep]] * width + other[keep]
+            np.add.at(sims.reshape(-1), flat, e_vals[entry[keep]] * c_vals[pos[keep]])
+
+        for a, b in zip(*np.nonzero(sims >= threshold)):
+            if b > a:
+                yield start + int(a), start + int(b), float(sims[a, b])
+
+
+def _numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def find_collisions(
+    utterances: dict[str, Iterable[str]],
+    threshold: float = DEFAULT_THRESHOLD,
+    block: int = DEFAULT_BLOCK,
+    use_numpy: bool | None = None,
+) -> list[Collision]:
+    """intent → 발화 목록에서 유사도가 ``threshold`` 이상인 발화 쌍을 점수 내림차순으로 돌려줍니다."""
+    labels = [(intent, text) for intent, texts in utterances.items() for text in texts]
+    if len(labels) < 2:
+        return []
+    rows, n_cols = tfidf_rows([text for _, text in labels])
+    if use_numpy is None:
+        use_numpy = _numpy_available()
+    # 부동소수 오차로 동일 발화(1.0)가 빠지지 않도록 약간 여유를 둡니다.
+    cutoff = threshold - 1e-6
+    pairs = _pairs_numpy(rows, n_cols, cutoff, block) if use_numpy else _pairs_python(rows, cutoff)
+    found = [Collision(min(score, 1.0), *labels[i], *labels[j]) for i, j, score in pairs]
+    return sorted(found, key=lambda c: (-c.score, c.intent_a, c.text_a, c.intent_b, c.text_b))
+
+
+# 합성 발화용 음절/공통 표현 (실제 코퍼스처럼 "예약", "해줘" 같은 흔한 n-gram 이 섞이도록)
+_SYLLABLES = "가나다라마바사아자차카타파하강남홍대잠실분당인천토익오픽회화일본어자격증수업상담등록취소조회변경"
+_COMMON = ("예약", "상담", "해줘", "할래요", "가능해요", "알려줘", "부탁해", "하고 싶어요", "{Branch}", "{CourseName}", "{Date}", "{Time}")
+
+
+def synthetic_corpus(size: int, intents: int = 5, seed: int = 0) -> dict[str, list[str]]:
+    """벤치마크용 합성 발화 ``size``개 (같은 ``seed``면 같은 결과).
+
+    intent 마다 고유 단어 200개를 만들고 발화 하나에 고유 단어 2~3개와 공통 표현 1~2개를 섞습니다.
+    """
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    vocab = {f"Intent{k}": [word() for _ in range(200)] for k in range(intents)}
+    names = list(vocab)
+    corpus: dict[str, list[str]] = {name: [] for name in names}
+    for i in range(size):
+        name = names[i % intents]
+        words = rng.sample(vocab[name], rng.randint(2, 3)) + rng.sample(_COMMON, rng.randint(1, 2))
+        rng.shuffle(words)
+        corpus[name].append(" ".join(words))
+    return corpus
+
+
+def bench(size: int, threshold: float = DEFAULT_THRESHOLD, use_numpy: bool | None = None, seed: int = 0) -> tuple[float, int]:
+    """합성 발화 ``size``개의 충돌 검사 시간(초)과 찾은 쌍 수."""
+    corpus = synthetic_corpus(size, seed=seed)
+    started = time.perf_counter()
+    found = find_collisions(corpus, threshold, use_numpy=use_numpy)
+    return time.perf_counter() - started, len(found)
+
+
+def format_report(collisions: list[Collision], limit: int = 20) -> str:
+    between = [c for c in collisions if c.kind == "collision"]
+    within = [c for c in collisions if c.kind == "duplicate"]
+    lines = [f"발화 유사도 검사: intent 간 충돌 {len(between)}건, intent 내 중복 {len(within)}건"]
+    for title, items in (("충돌", between), ("중복", within)):
+        for c in items[:limit]:
+            lines.append(f"   {title} {c.score:.2f}  {c.intent_a}: {c.text_a!r}  ↔  {c.intent_b}: {c.text_b!r}")
+        if len(items) > limit:
+            lines.append(f"   ... {title} {len(items) - limit}건 더 있음")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from lex_utterances import ValueTemplater, build_corpus, read_source
+
+    parser = argparse.ArgumentParser(description="샘플 발화 충돌 분석")
+    parser.add_argument("sources", nargs="*", type=Path, help="utterances-100.md 형식 Markdown 또는 seed-testcases.json 형식 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help=f"보고할 코사인 유사도 하한 (기본 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--limit", type=int, default=20, help="종류별로 출력할 최대 쌍 수")
+    parser.add_argument("--no-numpy", action="store_true", help="NumPy 가 있어도 순수 Python 경로를 사용합니다.")
+    parser.add_argument("--bench", type=int, metavar="N", help="파일 대신 합성 발화 N개로 검사 시간을 잽니다.")
+    parser.add_argument("--max-seconds", type=float, help="--bench 시간이 이보다 길면 종료 코드 1")
+    args = parser.parse_args(argv)
+    use_numpy = False if args.no_numpy else None
+
+    if args.bench:
+        engine = "numpy" if (use_numpy is None and _numpy_available()) else "python"
+        elapsed, pairs = bench(args.bench, args.threshold, use_numpy)
+        print(f"발화 {args.bench}개 ({engine}, threshold={args.threshold}): {elapsed:.2f}s, 보고 쌍 {pairs}건")
+        return 1 if args.max_seconds is not None and elapsed > args.max_seconds else 0
+    if not args.sources:
+        parser.error("발화 파일 또는 --bench N 이 필요합니다.")
+
+    intents = {intent: () for path in args.sources for intent, _ in read_source(path)}
+    corpus = build_corpus(args.sources, intents, ValueTemplater({}))
+    collisions = find_collisions(corpus, args.threshold, use_numpy=use_numpy)
+    print(format_report(collisions, args.limit))
+    return 1 if any(c.kind == "collision" for c in collisions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,486 @@
+"""오프라인 Lex V2 control plane (``AWS_BACKEND=fake``, lex_bench.py).
+
+lex-bootstrap.py 가 쓰는 lexv2-models / iam / sts 작업을 메모리 상태로 흉내 냅니다.
+AWS 계정이나 수 분짜리 build 없이 bootstrap 의 호출 수, 대기, 재시도 동작을 재현하는 용도입니다.
+
+- 비동기 상태 전이: bot Creating→Available, locale Creating→NotBuilt, Building→Built,
+  version 생성 중 bot Versioning→Available, alias Creating/Updating→Available
+- 소요 시간은 ``FakeTimings`` (실제 서비스에 가까운 초 단위) × ``time_scale``
+- 호출 지연: 작업별 고정 지연(±20% jitter)
+- throttling: 확률(``throttle_rate``) 또는 작업별 초당 한도(``tps``)를 넘으면 ThrottlingException
+- build 중인 locale 을 바꾸면 ConflictException, build 되지 않은 locale 로 버전을 만들면 ValidationException
+
+import 엔진(create-upload-url/start-import)은 지원하지 않습니다. 설정 키::
+
+    FAKE_AWS_TIME_SCALE=0.02
+    FAKE_AWS_LATENCY_MS=20,build-bot-locale=150
+    FAKE_AWS_THROTTLE_RATE=0.05
+    FAKE_AWS_TPS=10,create-slot=2
+"""
+
+from __future__ import annotations
+
+import copy
+import datetime as _dt
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from lex_client import WRITE_PREFIXES, AwsCallError, AwsRequest, apply_query
+
+ACCOUNT_ID = "123456789012"
+
+# ko_KR 에는 Date/Time 전용 built-in 이 없습니다 (bot_model 의 AlphaNumeric fallback 경로).
+BUILTIN_SLOT_TYPES = {
+    "ko_KR": ("AMAZON.AlphaNumeric", "AMAZON.Number", "AMAZON.PhoneNumber", "AMAZON.FirstName", "AMAZON.LastName"),
+    "en_US": ("AMAZON.AlphaNumeric", "AMAZON.Date", "AMAZON.Time", "AMAZON.Number", "AMAZON.PhoneNumber", "AMAZON.FirstName"),
+}
+
+
+@dataclass(frozen=True)
+class FakeTimings:
+    """상태 전이 소요 시간 (초, ``time_scale`` 적용 전)."""
+
+    bot: float = 3.0
+    locale: float = 4.0
+    build: float = 90.0
+    version: float = 8.0
+    alias: float = 2.0
+
+
+@dataclass
+class Resource:
+    body: dict[str, Any]
+    status: str = ""
+    next_status: str = ""
+    ready_at: float = 0.0
+
+
+@dataclass
+class LocaleState:
+    resource: Resource
+    slot_types: dict[str, dict[str, Any]] = field(default_factory=dict)
+    intents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # intentId → slotId → slot
+    slots: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+
+
+def per_operation(text: str, scale: float = 1.0) -> tuple[float, dict[str, float]]:
+    """``"20,build-bot-locale=150"`` → (기본값, 작업별 값). 숫자만 있는 항목이 기본값입니다."""
+    default, overrides = 0.0, {}
+    for item in (text or "").split(","):
+        item = item.strip()
+        if "=" in item:
+            op, value = item.split("=", 1)
+            overrides[op.strip()] = float(value) * scale
+        elif item:
+            default = float(item) * scale
+    return default, overrides
+
+
+def _camel(option: str) -> str:
+    return re.sub(r"-(\w)", lambda m: m.group(1).upper(), option)
+
+
+def _params(options: dict[str, str]) -> dict[str, Any]:
+    # CLI 인자는 JSON 객체/배열이면 풀어서 API 요청 본문처럼 저장합니다 (describe 가 그대로 돌려줌).
+    out: dict[str, Any] = {}
+    for key, value in options.items():
+        if key in ("max-results", "next-token", "filters", "sort-by", "query"):
+            continue
+        if value[:1] in ("[", "{"):
+            try:
+                out[_camel(key)] = json.loads(value)
+                continue
+            except ValueError:
+                pass
+        out[_camel(key)] = value
+    return out
+
+
+class FakeLexControlPlane:
+    """메모리 상태를 가진 Lex V2 control plane. 스레드 안전하며 ``calls``/``counts``에 모든 호출을 기록합니다."""
+
+    name = "fake-lex"
+
+    def __init__(
+        self,
+        timings: FakeTimings = FakeTimings(),
+        time_scale: float = 1.0,
+        latency: float = 0.0,
+        latency_by_op: dict[str, float] | None = None,
+        throttle_rate: float = 0.0,
+        tps: float = 0.0,
+        tps_by_op: dict[str, float] | None = None,
+        seed: int = 0,
+        page_size: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.timings = timings
+        self.time_scale = time_scale
+        self.latency = latency
+        self.latency_by_op = dict(latency_by_op or {})
+        self.throttle_rate = throttle_rate
+        self.tps = tps
+        self.tps_by_op = dict(tps_by_op or {})
+        self.page_size = page_size
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._last_stamp = _dt.datetime(2026, 1, 1, tzinfo=_dt.timezone.utc)
+        self._windows: dict[str, deque[float]] = {}
+        self.calls: list[AwsRequest] = []
+        self.counts: Counter[str] = Counter()
+        self.throttled: Counter[str] = Counter()
+        # 성공한 변경 호출 수 (throttle/오류로 실패한 시도는 제외)
+        self.mutations = 0
+        self.roles: set[str] = set()
+        self.bots: dict[str, Resource] = {}
+        self.locales: dict[tuple[str, str], LocaleState] = {}
+        self.versions: dict[str, dict[str, Resource]] = {}
+        self.aliases: dict[str, dict[str, Resource]] = {}
+
+    @classmethod
+    def from_cfg(cls, cfg: dict[str, str]) -> "FakeLexControlPlane":
+        latency, latency_by_op = per_operation(cfg.get("FAKE_AWS_LATENCY_MS", "0"), 0.001)
+        tps, tps_by_op = per_operation(cfg.get("FAKE_AWS_TPS", "0"))
+        return cls(
+            time_scale=float(cfg.get("FAKE_AWS_TIME_SCALE", "0.02")),
+            latency=latency,
+            latency_by_op=latency_by_op,
+            throttle_rate=float(cfg.get("FAKE_AWS_THROTTLE_RATE", "0")),
+            tps=tps,
+            tps_by_op=tps_by_op,
+            seed=int(cfg.get("FAKE_AWS_SEED", "0")),
+        )
+
+    # --- 호출 진입점 ---------------------------------------------------------------
+
+    def call(self, request: AwsRequest) -> Any:
+        with self._lock:
+            self.calls.append(request)
+            self.counts[request.operation] += 1
+            throttled = self._throttled(request.operation)
+            if throttled:
+                self.throttled[request.operation] += 1
+            delay = self.latency_by_op.get(request.operation, self.latency) * self._rng.uniform(0.8, 1.2)
+        if delay > 0:
+            self._sleep(delay)
+        if throttled:
+            raise self._error(request, "ThrottlingException", "Rate exceeded")
+        handler = getattr(self, "_" + request.operation.replace("-", "_"), None)
+        if handler is None:
+            raise self._error(request, "InvalidAction", "fake control plane 이 지원하지 않는 작업입니다")
+        with self._lock:
+            result = copy.deepcopy(handler(request, _params(request.options)))
+            if request.operation.startswith(WRITE_PREFIXES):
+                self.mutations += 1
+        return apply_query(self._page(request, result), request.query)
+
+    def _throttled(self, operation: str) -> bool:
+        if self.throttle_rate and self._rng.random() < self.throttle_rate:
+            return True
+        limit = self.tps_by_op.get(operation, self.tps)
+        if not limit:
+            return False
+        now = self._clock()
+        window = self._windows.setdefault(operation, deque())
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        if len(window) >= limit:
+            return True
+        window.append(now)
+        return False
+
+    @staticmethod
+    def _error(request: AwsRequest, code: str, message: str) -> AwsCallError:
+        return AwsCallError(f"명령 실패: aws {request.label}\nAn error occurred ({code}): {message}", code=code, operation=request.label)
+
+    def _page(self, request: AwsRequest, result: Any) -> Any:
+        if not request.operation.startswith("list-") or not isinstance(result, dict):
+            return result
+        key = next((k for k in result if k.endswith("Summaries")), "")
+        if not key:
+            return result
+        items = result[key]
+        if "filters" in request.options:
+            for f in json.loads(request.options["filters"]):
+                name_key = f["name"][0].lower() + f["name"][1:]
+                items = [item for item in items if item.get(name_key) in f["values"]]
+        size = int(request.options.get("max-results") or 0) or len(items) or 1
+        if self.page_size:
+            size = min(size, self.page_size)
+        start = int(request.options.get("next-token") or 0)
+        page = {key: items[start : start + size]}
+        if start + size < len(items):
+            page["nextToken"] = str(start + size)
+        return page
+
+    # --- 상태 관리 -----------------------------------------------------------------
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}{next(self._ids):09d}"
+
+    def _stamp(self) -> str:
+        # list 응답의 lastUpdatedDateTime 으로 캐시를 무효화하므로 항상 증가하게 만듭니다.
+        now = max(_dt.datetime.now(_dt.timezone.utc), self._last_stamp + _dt.timedelta(microseconds=1))
+        self._last_stamp = now
+        return now.isoformat()
+
+    def _transition(self, resource: Resource, status: str, then: str, seconds: float) -> None:
+        resource.status, resource.next_status = status, then
+        resource.ready_at = self._clock() + seconds * self.time_scale
+
+    def _settle(self, resource: Resource) -> str:
+        if resource.next_status and self._clock() >= resource.ready_at:
+            resource.status, resource.next_status = resource.next_status, ""
+        return resource.status
+
+    def _bot(self, request: AwsRequest, p: dict[str, Any]) -> Resource:
+        bot = self.bots.get(p.get("botId", ""))
+        if bot is None:
+            raise self._error(request, "ResourceNotFoundException", f"bot {p.get('botId')} 없음")
+        return bot
+
+    def _locale(self, request: AwsRequest, p: dict[str, Any]) -> LocaleState:
+        self._bot(request, p)
+        locale = self.locales.get((p["botId"], p.get("localeId", "")))
+        if locale is None:
+            raise self._error(request, "ResourceNotFoundException", f"locale {p.get('localeId')} 없음")
+        return locale
+
+    def _editable(self, request: AwsRequest, p: dict[str, Any]) -> LocaleState:
+        locale = self._locale(request, p)
+        if self._settle(locale.resource) in ("Creating", "Building"):
+            raise self._error(request, "ConflictException", f"locale 이 {locale.resource.status} 상태입니다")
+        # DRAFT 가 바뀌면 다시 build 해야 합니다.
+        locale.resource.status = "NotBuilt"
+        locale.resource.body["lastUpdatedDateTime"] = self._stamp()
+        return locale
+
+    def _find(self, request: AwsRequest, items: dict[str, Any], kind: str, value: str) -> Any:
+        if value not in items:
+            raise self._error(request, "ResourceNotFoundException", f"{kind} {value} 없음")
+        return items[value]
+
+    def _check_unique(self, request: AwsRequest, items: dict[str, dict[str, Any]], name_key: str, name: str, own_id: str = "") -> None:
+        for item_id, item in items.items():
+            if item.get(name_key) == name and item_id != own_id:
+                raise self._error(request, "ConflictException", f"{name} 이름이 이미 있습니다")
+
+    # --- sts / iam ---------------------------------------------------------------
+
+    def _get_caller_identity(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        return {"Account": ACCOUNT_ID, "Arn": f"arn:aws:iam::{ACCOUNT_ID}:user/fake", "UserId": "FAKE"}
+
+    def _get_role(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        if p["roleName"] not in self.roles:
+            raise self._error(request, "NoSuchEntity", f"role {p['roleName']} 없음")
+        return {"Role": {"RoleName": p["roleName"], "Arn": f"arn:aws:iam::{ACCOUNT_ID}:role/{p['roleName']}"}}
+
+    def _create_role(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        if p["roleName"] in self.roles:
+            raise self._error(request, "EntityAlreadyExists", f"role {p['roleName']} 있음")
+        self.roles.add(p["roleName"])
+        return self._get_role(request, p)
+
+    def _put_role_policy(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._get_role(request, p)
+        return {}
+
+    # --- bot / locale ------------------------------------------------------------
+
+    def _list_bots(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        return {"botSummaries": [{**bot.body, "botStatus": self._settle(bot)} for bot in self.bots.values()]}
+
+    def _create_bot(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        if any(bot.body["botName"] == p["botName"] for bot in self.bots.values()):
+            raise self._error(request, "ConflictException", f"bot {p['botName']} 이미 있음")
+        bot_id = self._new_id("B")
+        bot = Resource({**p, "botId": bot_id, "lastUpdatedDateTime": self._stamp()})
+        self._transition(bot, "Creating", "Available", self.timings.bot)
+        self.bots[bot_id] = bot
+        self.versions[bot_id] = {}
+        self.aliases[bot_id] = {}
+        return {"botId": bot_id, "botName": p["botName"], "botStatus": bot.status}
+
+    def _describe_bot(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        bot = self._bot(request, p)
+        return {**bot.body, "botStatus": self._settle(bot)}
+
+    def _create_bot_locale(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        bot = self._bot(request, p)
+        if self._settle(bot) != "Available":
+            raise self._error(request, "PreconditionFailedException", f"bot 이 {bot.status} 상태입니다")
+        key = (p["botId"], p["localeId"])
+        if key in self.locales:
+            raise self._error(request, "ConflictException", f"locale {p['localeId']} 이미 있음")
+        resource = Resource({**p, "lastUpdatedDateTime": self._stamp()})
+        self._transition(resource, "Creating", "NotBuilt", self.timings.locale)
+        self.locales[key] = LocaleState(resource)
+        return {**resource.body, "botLocaleStatus": resource.status}
+
+    def _describe_bot_locale(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._locale(request, p)
+        return {**locale.resource.body, "botLocaleStatus": self._settle(locale.resource)}
+
+    def _build_bot_locale(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._locale(request, p)
+        if self._settle(locale.resource) in ("Creating", "Building"):
+            raise self._error(request, "ConflictException", f"locale 이 {locale.resource.status} 상태입니다")
+        self._transition(locale.resource, "Building", "Built", self.timings.build)
+        return {"botId": p["botId"], "localeId": p["localeId"], "botLocaleStatus": "Building"}
+
+    def _list_built_in_slot_types(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        names = BUILTIN_SLOT_TYPES.get(p.get("localeId", ""), BUILTIN_SLOT_TYPES["en_US"])
+        return {"builtInSlotTypeSummaries": [{"slotTypeSignature": name} for name in names]}
+
+    # --- slot type / intent / slot -------------------------------------------------
+
+    def _list_slot_types(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        items = self._locale(request, p).slot_types.values()
+        keys = ("slotTypeId", "slotTypeName", "description", "lastUpdatedDateTime")
+        return {"slotTypeSummaries": [{k: item[k] for k in keys if k in item} for item in items]}
+
+    def _create_slot_type(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._editable(request, p)
+        self._check_unique(request, locale.slot_types, "slotTypeName", p["slotTypeName"])
+        item = {**p, "slotTypeId": self._new_id("T"), "lastUpdatedDateTime": self._stamp()}
+        locale.slot_types[item["slotTypeId"]] = item
+        return item
+
+    def _update_slot_type(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._editable(request, p)
+        self._find(request, locale.slot_types, "slot type", p["slotTypeId"])
+        self._check_unique(request, locale.slot_types, "slotTypeName", p["slotTypeName"], p["slotTypeId"])
+        locale.slot_types[p["slotTypeId"]] = item = {**p, "lastUpdatedDateTime": self._stamp()}
+        return item
+
+    def _describe_slot_type(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        return self._find(request, self._locale(request, p).slot_types, "slot type", p["slotTypeId"])
+
+    def _list_intents(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        items = self._locale(request, p).intents.values()
+        keys = ("intentId", "intentName", "description", "lastUpdatedDateTime")
+        return {"intentSummaries": [{k: item[k] for k in keys if k in item} for item in items]}
+
+    def _create_intent(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._editable(request, p)
+        self._check_unique(request, locale.intents, "intentName", p["intentName"])
+        item = {**p, "intentId": self._new_id("I"), "lastUpdatedDateTime": self._stamp()}
+        locale.intents[item["intentId"]] = item
+        locale.slots[item["intentId"]] = {}
+        return item
+
+    def _update_intent(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._editable(request, p)
+        self._find(request, locale.intents, "intent", p["intentId"])
+        self._check_unique(request, locale.intents, "intentName", p["intentName"], p["intentId"])
+        for priority in p.get("slotPriorities", []):
+            self._find(request, locale.slots[p["intentId"]], "slot", priority["slotId"])
+        locale.intents[p["intentId"]] = item = {**p, "lastUpdatedDateTime": self._stamp()}
+        return item
+
+    def _describe_intent(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        return self._find(request, self._locale(request, p).intents, "intent", p["intentId"])
+
+    def _list_slots(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        locale = self._locale(request, p)
+        items = self._find(request, locale.slots, "intent", p["intentId"]).values()
+        keys = ("slotId", "slotName", "slotTypeId", "description", "lastUpdatedDateTime")
+        return {"slotSummaries": [{k: item[k] for k in keys if k in item} for item in items]}
+
+    def _slot_scope(self, request: AwsRequest, p: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        locale = self._editable(request, p)
+        slots = self._find(request, locale.slots, "intent", p["intentId"])
+        type_id = p.get("slotTypeId", "")
+        if type_id and not type_id.startswith("AMAZON.") and type_id not in locale.slot_types:
+            raise self._error(request, "ValidationException", f"slot type {type_id} 없음")
+        return slots
+
+    def _create_slot(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        slots = self._slot_scope(request, p)
+        self._check_unique(request, slots, "slotName", p["slotName"])
+        item = {**p, "slotId": self._new_id("S"), "lastUpdatedDateTime": self._stamp()}
+        slots[item["slotId"]] = item
+        return item
+
+    def _update_slot(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        slots = self._slot_scope(request, p)
+        self._find(request, slots, "slot", p["slotId"])
+        self._check_unique(request, slots, "slotName", p["slotName"], p["slotId"])
+        slots[p["slotId"]] = item = {**p, "lastUpdatedDateTime": self._stamp()}
+        return item
+
+    def _describe_slot(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        slots = self._find(request, self._locale(request, p).slots, "intent", p["intentId"])
+        return self._find(request, slots, "slot", p["slotId"])
+
+    # --- version / alias ---------------------------------------------------------
+
+    def _create_bot_version(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        bot = self._bot(request, p)
+        if self._settle(bot) != "Available":
+            raise self._error(request, "PreconditionFailedException", f"bot 이 {bot.status} 상태입니다")
+        for locale_id in p.get("botVersionLocaleSpecification", {}):
+            status = self._settle(self._locale(request, {**p, "localeId": locale_id}).resource)
+            if status != "Built":
+                raise self._error(request, "ValidationException", f"locale {locale_id} 이 {status} 상태라 버전을 만들 수 없습니다")
+        versions = self.versions[p["botId"]]
+        number = str(len(versions) + 1)
+        version = Resource({"botVersion": number, "description": p.get("description", ""), "creationDateTime": self._stamp()})
+        self._transition(version, "Creating", "Available", self.timings.version)
+        versions[number] = version
+        self._transition(bot, "Versioning", "Available", self.timings.version)
+        return {"botId": p["botId"], "botVersion": number, "botStatus": version.status}
+
+    def _list_bot_versions(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        items = [{**v.body, "botStatus": self._settle(v)} for v in self.versions[p["botId"]].values()]
+        order = json.loads(request.options.get("sort-by") or "{}")
+        items.sort(key=lambda v: int(v["botVersion"]), reverse=order.get("order", "Descending") == "Descending")
+        return {"botVersionSummaries": items}
+
+    def _describe_bot_version(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        version = self._find(request, self.versions[p["botId"]], "version", p["botVersion"])
+        return {**version.body, "botId": p["botId"], "botStatus": self._settle(version)}
+
+    def _alias_body(self, request: AwsRequest, p: dict[str, Any]) -> dict[str, Any]:
+        self._find(request, self.versions[p["botId"]], "version", p["botVersion"])
+        return {**p, "lastUpdatedDateTime": self._stamp()}
+
+    def _list_bot_aliases(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        keys = ("botAliasId", "botAliasName", "botVersion", "lastUpdatedDateTime")
+        return {"botAliasSummaries": [{**{k: a.body[k] for k in keys}, "botAliasStatus": self._settle(a)} for a in self.aliases[p["botId"]].values()]}
+
+    def _create_bot_alias(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        if any(a.body["botAliasName"] == p["botAliasName"] for a in self.aliases[p["botId"]].values()):
+            raise self._error(request, "ConflictException", f"alias {p['botAliasName']} 이미 있음")
+        alias = Resource({**self._alias_body(request, p), "botAliasId": self._new_id("A")})
+        self._transition(alias, "Creating", "Available", self.timings.alias)
+        self.aliases[p["botId"]][alias.body["botAliasId"]] = alias
+        return {**alias.body, "botAliasStatus": alias.status}
+
+    def _update_bot_alias(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        alias = self._find(request, self.aliases[p["botId"]], "alias", p["botAliasId"])
+        alias.body = self._alias_body(request, p)
+        self._transition(alias, "Updating", "Available", self.timings.alias)
+        return {**alias.body, "botAliasStatus": alias.status}
+
+    def _describe_bot_alias(self, request: AwsRequest, p: dict[str, Any]) -> Any:
+        self._bot(request, p)
+        alias = self._find(request, self.aliases[p["botId"]], "alias", p["botAliasId"])
+        return {**alias.body, "botAliasStatus": self._settle(alias)}
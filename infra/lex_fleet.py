@@ -0,0 +1,194 @@
+"""Fleet 모드: manifest 하나로 여러 봇/locale을 동시에 배포합니다.
+
+``python3 infra/lex-bootstrap.py --fleet infra/fleet.example.json``
+
+- 봇 단위로 전역 동시 실행 수(``--max-parallel`` / ``FLEET_CONCURRENCY``)를 제한합니다.
+- 같은 봇의 locale 들은 ``bootstrap()`` 안에서 병렬로 build 됩니다.
+- 봇별 상세 로그는 ``$TMP_DIR/lex-fleet/<이름>.log`` 로 보내고, 터미널에는 진행 상황만 한 줄로 모아 보여 줍니다.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from lex_client import ScriptError
+
+_STEP_RE = re.compile(r"^\[(\d+)/9\]")
+
+
+@dataclass
+class FleetJob:
+    name: str
+    cfg: dict[str, str]
+    locale_cfgs: list[dict[str, str]]
+
+
+@dataclass
+class FleetResult:
+    name: str
+    ok: bool
+    elapsed: float
+    value: dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    log_path: Path | None = None
+
+
+def _str_values(data: dict[str, Any]) -> dict[str, str]:
+    return {k: str(v) for k, v in data.items() if k != "locales"}
+
+
+def load_manifest(path: Path, base_cfg: dict[str, str]) -> list[FleetJob]:
+    """manifest(JSON)를 읽어 봇별 작업 목록을 만듭니다.
+
+    설정 우선순위: config.env/환경변수 < ``defaults`` < 봇 항목 < locale 항목
+    """
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ScriptError(f"fleet manifest를 읽을 수 없습니다: {path} ({exc})") from exc
+
+    defaults = _str_values(manifest.get("defaults", {}))
+    jobs: list[FleetJob] = []
+    for entry in manifest.get("bots", []):
+        cfg = {**base_cfg, **defaults, **_str_values(entry)}
+        if not cfg.get("BOT_NAME"):
+            raise ScriptError(f"fleet manifest 항목에 BOT_NAME이 없습니다: {entry}")
+        # 다른 봇의 BOT_ID가 config.env에서 새어 들어오지 않도록 봇 항목에 명시한 경우만 사용합니다.
+        if "BOT_ID" not in entry:
+            cfg.pop("BOT_ID", None)
+        locale_cfgs = [{**cfg, **_str_values(loc)} for loc in entry.get("locales", [{}])]
+        locale_ids = [lc.get("LOCALE_ID", "") for lc in locale_cfgs]
+        if not all(locale_ids) or len(set(locale_ids)) != len(locale_ids):
+            raise ScriptError(f"{cfg['BOT_NAME']}: LOCALE_ID가 비었거나 중복되었습니다: {locale_ids}")
+        jobs.append(FleetJob(cfg["BOT_NAME"], cfg, locale_cfgs))
+
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ScriptError(f"fleet manifest에 같은 BOT_NAME이 두 번 이상 있습니다: {names}")
+    if not jobs:
+        raise ScriptError(f"fleet manifest에 bots 항목이 없습니다: {path}")
+    return jobs
+
+
+class Progress:
+    """봇별 현재 단계를 한 줄로 모아 보여 줍니다."""
+
+    def __init__(self, names: list[str], out: TextIO) -> None:
+        self._state = {name: "대기" for name in names}
+        self._out = out
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def update(self, name: str, state: str) -> None:
+        with self._lock:
+            if self._state.get(name) == state:
+                return
+            self._state[name] = state
+            done = sum(1 for s in self._state.values() if s.startswith(("✅", "❌")))
+            parts = " | ".join(f"{n}: {s}" for n, s in self._state.items())
+            elapsed = time.monotonic() - self._started
+            self._out.write(f"[fleet {done}/{len(self._state)} {elapsed:6.1f}s] {parts}\n")
+            self._out.flush()
+
+
+class _JobStream(io.TextIOBase):
+    """작업 하나의 출력을 로그 파일로 보내면서 ``[n/9]`` 줄로 진행 상황을 갱신합니다."""
+
+    def __init__(self, name: str, log: TextIO, progress: Progress) -> None:
+        self._name = name
+        self._log = log
+        self._progress = progress
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._log.write(text)
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            match = _STEP_RE.match(line)
+            if match:
+                self._progress.update(self._name, f"[{match.group(1)}/9]")
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._log.flush()
+
+
+_route: contextvars.ContextVar[_JobStream | None] = contextvars.ContextVar("lex_fleet_route", default=None)
+
+
+class _RoutedStream(io.TextIOBase):
+    """현재 context 의 작업 스트림으로 쓰고, 작업 밖이면 원래 스트림으로 씁니다."""
+
+    def __init__(self, default: TextIO) -> None:
+        self._default = default
+
+    def write(self, text: str) -> int:
+        target = _route.get()
+        return (target or self._default).write(text)
+
+    def flush(self) -> None:
+        target = _route.get()
+        (target or self._default).flush()
+
+
+def run_fleet(
+    jobs: list[FleetJob],
+    fn: Callable[[FleetJob], dict[str, Any]],
+    max_parallel: int,
+    tmp_dir: Path,
+) -> list[FleetResult]:
+    """``fn(job)``을 최대 ``max_parallel``개씩 동시에 실행합니다. 결과는 manifest 순서입니다."""
+    log_dir = tmp_dir / "lex-fleet"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    real_out, real_err = sys.stdout, sys.stderr
+    progress = Progress([job.name for job in jobs], real_out)
+
+    def run_one(job: FleetJob) -> FleetResult:
+        log_path = log_dir / f"{re.sub(r'[^0-9A-Za-z._-]', '_', job.name)}.log"
+        started = time.monotonic()
+        with log_path.open("w", encoding="utf-8") as log:
+            _route.set(_JobStream(job.name, log, progress))
+            try:
+                value = fn(job)
+            except Exception as exc:  # 한 봇의 실패가 다른 봇을 멈추지 않도록 모두 잡습니다.
+                print(f"{type(exc).__name__}: {exc}", file=sys.stderr)
+                progress.update(job.name, "❌ 실패")
+                return FleetResult(job.name, False, time.monotonic() - started, error=str(exc), log_path=log_path)
+            finally:
+                sys.stdout.flush()
+        progress.update(job.name, "✅ 완료")
+        return FleetResult(job.name, True, time.monotonic() - started, value=value, log_path=log_path)
+
+    print(f"[fleet] 봇 {len(jobs)}개, 동시 실행 {max_parallel}개, 로그: {log_dir}")
+    sys.stdout, sys.stderr = _RoutedStream(real_out), _RoutedStream(real_err)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, run_one, job) for job in jobs]
+            results = [future.result() for future in futures]
+    finally:
+        sys.stdout, sys.stderr = real_out, real_err
+
+    print("[fleet] 결과 요약")
+    for r in results:
+        if r.ok and r.value.get("planned"):
+            print(f" ✅ {r.name}: plan 완료 (변경 {r.value.get('changes', '-')}건) {r.elapsed:.1f}s")
+        elif r.ok:
+            v = r.value
+            print(f" ✅ {r.name}: botId={v['botId']} version={v['version']} aliasId={v['aliasId']} locales={','.join(v['locales'])} {r.elapsed:.1f}s")
+        else:
+            print(f" ❌ {r.name}: {r.error.splitlines()[0] if r.error else ''} (로그: {r.log_path})")
+    return results
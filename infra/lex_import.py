@@ -0,0 +1,164 @@
+"""Lex V2 import archive 엔진 (``BOOTSTRAP_ENGINE=import``).
+
+slot type / intent / slot 을 하나씩 create/update 하는 대신, 봇 전체 정의를 Lex V2
+import 형식(LexJson)의 zip 으로 메모리에서 만들어 한 번 업로드하고 import 작업 하나만 기다립니다.
+호출 수가 정의 크기와 무관하게 일정하므로(upload URL, 업로드, start-import, 상태 조회)
+intent/slot 이 많은 봇일수록 효과가 큽니다.
+
+archive 구조::
+
+    Manifest.json
+    <BotName>/Bot.json
+    <BotName>/BotLocales/<locale>/BotLocale.json
+    <BotName>/BotLocales/<locale>/SlotTypes/<SlotType>/SlotType.json
+    <BotName>/BotLocales/<locale>/Intents/<Intent>/Intent.json
+    <BotName>/BotLocales/<locale>/Intents/<Intent>/Slots/<Slot>/Slot.json
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+import urllib.request
+import zipfile
+from typing import Any, Callable
+
+from lex_client import ScriptError
+from lex_plan import BotModel, IntentSpec, SlotSpec, SlotTypeSpec, make_slot_type_values
+from lex_waiters import Watch, wait_all
+
+RunAws = Callable[..., Any]
+
+METADATA = {"schemaVersion": "1", "fileFormat": "LexJson", "resourceType": "Bot"}
+# zip 항목 시각을 고정해 같은 정의면 같은 bytes 가 나오도록 합니다.
+_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def slot_type_document(spec: SlotTypeSpec) -> dict[str, Any]:
+    return {
+        "name": spec.name,
+        "description": spec.description,
+        "parentSlotTypeSignature": None,
+        "slotTypeValues": make_slot_type_values(spec.values),
+        "valueSelectionSetting": {"resolutionStrategy": spec.resolution_strategy},
+    }
+
+
+def slot_document(slot: SlotSpec) -> dict[str, Any]:
+    # archive 안에서는 id 대신 이름으로 slot type 을 참조합니다 (built-in 은 AMAZON.* 시그니처).
+    return {
+        "name": slot.name,
+        "description": None,
+        "slotTypeName": slot.slot_type,
+        "valueElicitationSetting": {
+            "slotConstraint": slot.constraint,
+            "promptSpecification": {
+                "maxRetries": slot.max_retries,
+                "allowInterrupt": True,
+                "messageGroupsList": [{"message": {"plainTextMessage": {"value": slot.prompt}}}],
+            },
+        },
+    }
+
+
+def intent_document(intent: IntentSpec) -> dict[str, Any]:
+    out: dict[str, Any] = {
+        "name": intent.name,
+        "description": intent.description,
+        "parentIntentSignature": None,
+        "sampleUtterances": [{"utterance": u} for u in intent.utterances],
+    }
+    if intent.slots:
+        out["slotPriorities"] = [{"priority": idx, "slotName": slot.name} for idx, slot in enumerate(intent.slots, 1)]
+    if intent.fulfillment_code_hook:
+        out["fulfillmentCodeHook"] = {"enabled": True}
+    return out
+
+
+FALLBACK_INTENT = {
+    "name": "FallbackIntent",
+    "description": "Default intent when no other intent matches",
+    "parentIntentSignature": "AMAZON.FallbackIntent",
+}
+
+
+def render_archive(bot_name: str, description: str, idle_ttl: int, locales: dict[str, tuple[float, BotModel]]) -> bytes:
+    """봇 정의 전체를 import 형식 zip 으로 만듭니다. ``locales``는 locale → (NLU 신뢰도, 모델)."""
+    files: dict[str, dict[str, Any]] = {
+        "Manifest.json": {"metadata": METADATA},
+        f"{bot_name}/Bot.json": {
+            "name": bot_name,
+            "version": "DRAFT",
+            "description": description,
+            "dataPrivacy": {"childDirected": False},
+            "idleSessionTTLInSeconds": idle_ttl,
+        },
+    }
+    for locale_id, (nlu_confidence, model) in locales.items():
+        base = f"{bot_name}/BotLocales/{locale_id}"
+        files[f"{base}/BotLocale.json"] = {"name": locale_id, "identifier": locale_id, "nluConfidenceThreshold": nlu_confidence, "voiceSettings": None}
+        for spec in model.slot_types:
+            files[f"{base}/SlotTypes/{spec.name}/SlotType.json"] = slot_type_document(spec)
+        files[f"{base}/Intents/FallbackIntent/Intent.json"] = FALLBACK_INTENT
+        for intent in model.intents:
+            files[f"{base}/Intents/{intent.name}/Intent.json"] = intent_document(intent)
+            for slot in intent.slots:
+                files[f"{base}/Intents/{intent.name}/Slots/{slot.name}/Slot.json"] = slot_document(slot)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(files):
+            info = zipfile.ZipInfo(name, _ZIP_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, json.dumps(files[name], ensure_ascii=False, indent=2))
+    return buf.getvalue()
+
+
+def http_put(url: str, body: bytes) -> None:
+    request = urllib.request.Request(url, data=body, method="PUT", headers={"Content-Type": "application/zip"})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        if response.status >= 300:
+            raise ScriptError(f"archive 업로드 실패: HTTP {response.status}")
+
+
+def import_archive(
+    run_aws: RunAws,
+    archive: bytes,
+    bot_spec: dict[str, Any],
+    timeout: float = 600,
+    put: Callable[[str, bytes], None] | None = None,
+) -> str:
+    """archive 를 업로드하고 import 가 끝날 때까지 기다린 뒤 botId 를 돌려줍니다.
+
+    ``bot_spec``은 ``botImportSpecification`` (botName, roleArn, dataPrivacy, idleSessionTTLInSeconds) 입니다.
+    같은 이름의 봇이 있으면 Overwrite 로 DRAFT 를 덮어씁니다.
+    """
+    upload = run_aws("lexv2-models", "create-upload-url")
+    import_id = upload["importId"]
+    (put or http_put)(upload["uploadUrl"], archive)
+    print(f" - archive 업로드 완료: importId={import_id} ({len(archive)} bytes)", file=sys.stderr)
+    run_aws(
+        "lexv2-models",
+        "start-import",
+        "--import-id",
+        import_id,
+        "--resource-specification",
+        json.dumps({"botImportSpecification": bot_spec}),
+        "--merge-strategy",
+        "Overwrite",
+    )
+
+    # 마지막 describe-import 응답을 남겨 두어 botId/실패 사유를 다시 조회하지 않습니다.
+    last: dict[str, Any] = {}
+
+    def status() -> str:
+        last.update(run_aws("lexv2-models", "describe-import", "--import-id", import_id))
+        return last.get("importStatus", "")
+
+    try:
+        wait_all([Watch(f"Import 완료: {import_id}", status, {"Completed"}, {"Failed", "Deleting"})], timeout)
+    except ScriptError as exc:
+        reasons = last.get("failureReasons") or []
+        raise ScriptError("\n".join([str(exc), *(f" - {r}" for r in reasons)])) from exc
+    return last["importedResourceId"]
@@ -0,0 +1,84 @@
+"""단계별 checkpoint journal (lex-bootstrap.py ``--resume``).
+
+각 단계([1/9]~[9/9])가 끝나면 그 결과(role ARN, botId, slot type/intent/slot id,
+버전, alias id 등)를 ``$TMP_DIR/lex-journal/<region>_<BOT_NAME>.json`` 에 기록합니다.
+``--resume`` 으로 실행하면 기록된 결과를 싸게 확인한 뒤, 끝나지 않은 첫 단계부터 이어서 진행합니다.
+
+journal은 같은 봇/리전/locale 구성에서만 재사용하며, 구성이 다르면 무시하고 새로 씁니다.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+from lex_cache import write_atomic
+
+JOURNAL_VERSION = 1
+
+
+class Journal:
+    def __init__(self, path: Path, identity: dict[str, Any], resume: bool = False, readonly: bool = False) -> None:
+        self.path = path
+        self.identity = identity
+        self.readonly = readonly
+        self._steps: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if resume:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            print(f" - (resume) journal 없음: 처음부터 진행합니다 ({self.path})", file=sys.stderr)
+            return
+        except (OSError, ValueError) as exc:
+            print(f" - (resume) journal을 읽을 수 없어 처음부터 진행합니다: {exc}", file=sys.stderr)
+            return
+        if data.get("version") != JOURNAL_VERSION or data.get("identity") != self.identity:
+            print(" - (resume) 다른 구성의 journal이라 무시합니다", file=sys.stderr)
+            return
+        self._steps = data.get("steps", {})
+        done = ", ".join(f"{n}/9" for n in sorted(self._steps, key=int))
+        print(f" - (resume) 완료된 단계: {done or '없음'}", file=sys.stderr)
+
+    def get(self, step: int) -> dict[str, Any] | None:
+        with self._lock:
+            return self._steps.get(str(step))
+
+    def record(self, step: int, **outputs: Any) -> None:
+        if self.readonly:
+            return
+        with self._lock:
+            self._steps[str(step)] = outputs
+            self._write()
+
+    def invalidate_from(self, step: int) -> None:
+        """``step`` 이후 단계의 기록을 지웁니다 (앞 단계 결과가 더 이상 유효하지 않을 때)."""
+        with self._lock:
+            self._steps = {k: v for k, v in self._steps.items() if int(k) < step}
+            if not self.readonly:
+                self._write()
+
+    def _write(self) -> None:
+        data = {"version": JOURNAL_VERSION, "identity": self.identity, "steps": self._steps}
+        write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def open_journal(cfg: dict[str, str], locale_ids: list[str], resume: bool, readonly: bool = False) -> Journal:
+    identity = {
+        "region": cfg["AWS_REGION"],
+        "botName": cfg["BOT_NAME"],
+        "botId": cfg.get("BOT_ID", ""),
+        "roleName": cfg["LEX_ROLE_NAME"],
+        "aliasName": cfg["BOT_ALIAS_NAME"],
+        "locales": locale_ids,
+    }
+    name = re.sub(r"[^0-9A-Za-z._-]", "_", f"{cfg['AWS_REGION']}_{cfg['BOT_NAME']}")
+    path = Path(cfg.get("TMP_DIR", "/tmp")) / "lex-journal" / f"{name}.json"
+    return Journal(path, identity, resume=resume, readonly=readonly)
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""예약 대화 부하 테스트 (``lex-chat-ux/server`` ``POST /api/chat``).
+
+수강 신청 기간처럼 많은 사용자가 동시에 MakeReservation 6-slot 대화를 진행하는 상황을 재현합니다.
+
+- 가상 사용자 하나 = sessionId 하나 = keep-alive 연결 하나. 응답의 ``ui.slotToElicit``에 맞춰
+  지점 → 과정 → 날짜 → 시간 → 이름 → 연락처를 차례로 답하는 다중 턴 세션을 재생합니다.
+- 첫 발화는 ``docs/utterances-100.md`` 코퍼스에서 뽑습니다 (일부는 조회/취소/과정/도움말 단일 턴 세션).
+- 세션은 open-loop 로 도착합니다: 응답 속도와 무관하게 ``--rate`` (세션/초) 의 포아송 도착을 유지하므로
+  서버가 느려지면 대기열이 쌓이는 모습이 그대로 지연 시간에 드러납니다.
+- 도착률은 ``--processes`` 개의 프로세스로 나눠 각자 asyncio 루프에서 생성합니다 (GIL 에 묶이지 않도록).
+
+출력: 처리량(요청/초, 완료 세션/초), 오류율, 턴별 지연 시간 히스토그램과 p50/p95/p99.
+
+``--target standin``(또는 ``--serve-standin PORT``)은 같은 응답 형식으로 예약 대화를 흉내 내는
+로컬 stand-in 서버를 별도 프로세스로 띄워 AWS 없이 실행합니다.
+
+예::
+
+    python3 infra/lex_loadtest.py --target standin --rate 50 --duration 20 --processes 4
+    python3 infra/lex_loadtest.py --target http://localhost:3000 --rate 10 --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import time
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lex_client import ScriptError
+from lex_regression import DEFAULT_CORPUS, StubClassifier, percentile
+from lex_utterances import ValueTemplater, build_corpus, read_source
+
+# stand-in 과 답변 생성에 쓰는 값 (config.example.env 의 BRANCH_VALUES/COURSE_VALUES 와 같음)
+BRANCHES = ("강남점", "홍대점", "잠실점", "분당점", "인천점")
+COURSES = ("토익", "오픽", "영어회화", "일본어", "자격증")
+SLOT_ORDER = ("Branch", "CourseName", "Date", "Time", "StudentName", "PhoneNumber")
+SLOT_ANSWERS: dict[str, tuple[str, ...]] = {
+    "Branch": BRANCHES,
+    "CourseName": COURSES,
+    "Date": ("2026-04-10", "2026-04-11", "2026-04-14"),
+    "Time": ("19:30", "10:00", "오후 7시"),
+    "StudentName": ("홍길동", "김도영", "이서연"),
+    "PhoneNumber": ("010-1234-5678", "01098765432"),
+}
+MAX_TURNS = 10
+# 턴 지연 히스토그램 경계 (ms)
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    host: str
+    port: int
+    path: str
+    rate: float
+    duration: float
+    think_ms: float
+    timeout: float
+    max_sessions: int
+    reservation_ratio: float
+    engine: str = ""
+    seed: int = 0
+
+
+# --- 최소 HTTP/1.1 (keep-alive) ----------------------------------------------
+
+
+async def _read_message(reader: asyncio.StreamReader) -> tuple[str, dict[str, str], bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body += chunk[:-2]
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return lines[0], headers, body
+
+
+class HttpConnection:
+    """가상 사용자 하나가 쓰는 keep-alive 연결. 끊어지면 다음 요청에서 다시 연결합니다."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host, self.port = host, port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def post_json(self, path: str, payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._writer.write(
+            (
+                f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        try:
+            await self._writer.drain()
+            status_line, headers, data = await _read_message(self._reader)
+        except (OSError, asyncio.IncompleteReadError):
+            await self.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return int(status_line.split()[1]), json.loads(data or b"{}")
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# --- 세션 재생 ------------------------------------------------------------------
+
+
+@dataclass
+class WorkerStats:
+    requests: int = 0
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    latencies: dict[int, list[float]] = field(default_factory=dict)
+    errors: Counter[str] = field(default_factory=Counter)
+    start_lag_ms: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "latencies": self.latencies,
+            "errors": dict(self.errors),
+            "startLagMs": self.start_lag_ms,
+        }
+
+
+def openers() -> dict[str, tuple[str, ...]]:
+    intents = {intent: () for path in DEFAULT_CORPUS for intent, _ in read_source(path)}
+    return build_corpus(list(DEFAULT_CORPUS), intents, ValueTemplater({}))
+
+
+async def virtual_user(cfg: LoadConfig, session_id: str, opener: str, rng: random.Random, stats: WorkerStats) -> None:
+    conn = HttpConnection(cfg.host, cfg.port)
+    text = opener
+    try:
+        for turn in range(1, MAX_TURNS + 1):
+            payload = {"text": text, "sessionId": session_id}
+            if cfg.engine:
+                payload["engine"] = cfg.engine
+            start = time.perf_counter()
+            stats.requests += 1
+            try:
+                status, body = await asyncio.wait_for(conn.post_json(cfg.path, payload), cfg.timeout)
+            except asyncio.TimeoutError:
+                stats.errors["timeout"] += 1
+                stats.failed += 1
+                return
+            except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                stats.errors[type(exc).__name__] += 1
+                stats.failed += 1
+                return
+            stats.latencies.setdefault(turn, []).append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                stats.errors[f"HTTP {status}"] += 1
+                stats.failed += 1
+                return
+            ui = body.get("ui") or {}
+            slot = ui.get("slotToElicit")
+            if ui.get("mode") != "elicit_slot" or slot not in SLOT_ANSWERS:
+                stats.completed += 1
+                return
+            text = rng.choice(SLOT_ANSWERS[slot])
+            if cfg.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / cfg.think_ms))
+        stats.errors["max turns"] += 1
+        stats.failed += 1
+    finally:
+        await conn.close()
+
+
+async def _generate(cfg: LoadConfig, worker: int) -> WorkerStats:
+    rng = random.Random(cfg.seed * 1000 + worker)
+    corpus = openers()
+    reservation = corpus.get("MakeReservation", ()) or ("예약하고 싶어요",)
+    others = [text for intent, texts in corpus.items() if intent != "MakeReservation" for text in texts]
+    stats = WorkerStats()
+    active: set[asyncio.Task[None]] = set()
+    loop = asyncio.get_running_loop()
+    begin = loop.time()
+    scheduled = begin
+    n = 0
+    while True:
+        # open-loop: 다음 도착 시각은 응답과 무관하게 포아송 과정으로 정합니다.
+        scheduled += rng.expovariate(cfg.rate)
+        if scheduled - begin >= cfg.duration:
+            break
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        stats.start_lag_ms.append(max(0.0, loop.time() - scheduled) * 1000)
+        if len(active) >= cfg.max_sessions:
+            stats.dropped += 1
+            continue
+        n += 1
+        stats.started += 1
+        opener = rng.choice(reservation) if not others or rng.random() < cfg.reservation_ratio else rng.choice(others)
+        task = asyncio.create_task(virtual_user(cfg, f"load-{cfg.seed}-{worker}-{n:06d}", opener, rng, stats))
+        active.add(task)
+        task.add_done_callback(active.discard)
+    if active:
+        # 도착이 끝난 뒤 진행 중인 세션은 끝날 때까지 기다리되, 제한 시간을 넘기면 실패로 집계합니다.
+        _, pending = await asyncio.wait(set(active), timeout=cfg.timeout * MAX_TURNS)
+        stats.failed += len(pending)
+        if pending:
+            stats.errors["unfinished"] += len(pending)
+    return stats
+
+
+def run_worker(cfg: LoadConfig, worker: int) -> dict[str, Any]:
+    return asyncio.run(_generate(cfg, worker)).to_dict()
+
+
+def merge(results: list[dict[str, Any]]) -> dict[str, Any]:
+    out: dict[str, Any] = {"requests": 0, "started": 0, "completed": 0, "failed": 0, "dropped": 0, "latencies": {}, "errors": Counter(), "startLagMs": []}
+    for r in results:
+        for key in ("requests", "started", "completed", "failed", "dropped"):
+            out[key] += r[key]
+        for turn, values in r["latencies"].items():
+            out["latencies"].setdefault(int(turn), []).extend(values)
+        out["errors"].update(r["errors"])
+        out["startLagMs"].extend(r["startLagMs"])
+    return out
+
+
+def histogram(values: list[float]) -> list[int]:
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for v in values:
+        counts[next((i for i, edge in enumerate(BUCKETS_MS) if v <= edge), len(BUCKETS_MS))] += 1
+    return counts
+
+
+def summarize(merged: dict[str, Any], elapsed: float) -> dict[str, Any]:
+    all_latencies = [v for values in merged["latencies"].values() for v in values]
+    errors = sum(merged["errors"].values())
+    turns = {}
+    for turn in sorted(merged["latencies"]):
+        values = merged["latencies"][turn]
+        turns[turn] = {
+            "count": len(values),
+            **{f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)},
+            "histogram": histogram(values),
+        }
+    return {
+        "elapsedSec": round(elapsed, 2),
+        "requests": merged["requests"],
+        "requestsPerSec": round(merged["requests"] / elapsed, 1) if elapsed else 0.0,
+        "sessions": {k: merged[k] for k in ("started", "completed", "failed", "dropped")},
+        "sessionsPerSec": round(merged["completed"] / elapsed, 1) if elapsed else 0.0,
+        "errorRate": round(errors / merged["requests"], 4) if merged["requests"] else 0.0,
+        "errors": dict(merged["errors"]),
+        "latencyMs": {f"p{p}": round(percentile(all_latencies, p), 1) for p in (50, 95, 99)},
+        "startLagP99Ms": round(percentile(merged["startLagMs"], 99), 1),
+        "turns": turns,
+    }
+
+
+def format_report(summary: dict[str, Any]) -> str:
+    s = summary["sessions"]
+    lat = summary["latencyMs"]
+    lines = [
+        f"처리량: {summary['requestsPerSec']} 요청/s, {summary['sessionsPerSec']} 완료 세션/s ({summary['requests']}건 / {summary['elapsedSec']}s)",
+        f"세션: 시작 {s['started']} 완료 {s['completed']} 실패 {s['failed']} 포기(동시 세션 한도) {s['dropped']}",
+        f"오류율: {summary['errorRate']:.2%} {summary['errors'] or ''}".rstrip(),
+        f"지연 시간(ms): p50={lat['p50']} p95={lat['p95']} p99={lat['p99']}  (도착 지연 p99={summary['startLagP99Ms']}ms)",
+        "",
+        "턴별 지연 시간 히스토그램 (ms 이하)",
+        f"   {'turn':>4} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8}  " + " ".join(f"{edge:>6}" for edge in BUCKETS_MS) + f" {'>':>6}",
+    ]
+    for turn, t in summary["turns"].items():
+        lines.append(
+            f"   {turn:>4} {t['count']:>7} {t['p50']:>8} {t['p95']:>8} {t['p99']:>8}  " + " ".join(f"{c or '.':>6}" for c in t["histogram"])
+        )
+    if summary["startLagP99Ms"] > 100:
+        lines.append("\n(주의) 도착 지연이 커서 부하 생성기가 목표 도착률을 따라가지 못했습니다. --processes 를 늘리세요.")
+    return "\n".join(lines)
+
+
+def run_load(cfg: LoadConfig, processes: int) -> dict[str, Any]:
+    per_worker = LoadConfig(**{**cfg.__dict__, "rate": cfg.rate / processes, "max_sessions": max(1, cfg.max_sessions // processes)})
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(run_worker, [per_worker] * processes, range(processes)))
+    return summarize(merge(results), time.perf_counter() - started)
+
+
+# --- stand-in backend ----------------------------------------------------------
+
+
+class StandinDialog:
+    """``lex-chat-ux/server`` 의 예약 흐름과 같은 응답 형식으로 답하는 단순 대화 상태 머신."""
+
+    def __init__(self) -> None:
+        self.sessions: dict[str, dict[str, str]] = {}
+        self.classifier = StubClassifier(openers())
+
+    def reply(self, session_id: str, text: str) -> dict[str, Any]:
+        slots = self.sessions.get(session_id)
+        if slots is None:
+            intent, _ = self.classifier.classify(text)
+            if intent != "MakeReservation":
+                return {"sessionId": session_id, "intent": intent, "state": "Fulfilled", "ui": {"mode": "close", "prompt": "안내해 드렸어요."}, "messages": ["안내해 드렸어요."]}
+            slots = {}
+            for slot, values in (("Branch", BRANCHES), ("CourseName", COURSES)):
+                found = next((v for v in values if v in text), None)
+                if found:
+                    slots[slot] = found
+        else:
+            expected = next(slot for slot in SLOT_ORDER if slot not in slots)
+            slots[expected] = text
+        missing = next((slot for slot in SLOT_ORDER if slot not in slots), None)
+        if missing is None:
+            self.sessions.pop(session_id, None)
+            reservation_id = f"R-{random.randrange(36**6):06X}"
+            prompt = f"예약이 완료됐어요. 예약번호는 {reservation_id} 입니다."
+            return {"sessionId": session_id, "intent": "MakeReservation", "state": "Fulfilled", "ui": {"mode": "close", "prompt": prompt}, "messages": [prompt], "slots": slots}
+        self.sessions[session_id] = slots
+        prompt = f"{missing} 값을 알려주세요."
+        return {
+            "sessionId": session_id,
+            "intent": "MakeReservation",
+            "state": "InProgress",
+            "ui": {"mode": "elicit_slot", "slotToElicit": missing, "prompt": prompt},
+            "messages": [prompt],
+            "slots": slots,
+        }
+
+
+async def _serve_standin(port: int, latency_ms: float, ready: Any = None) -> None:
+    dialog = StandinDialog()
+    rng = random.Random(0)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line, _, body = await _read_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                method, path = request_line.split()[:2]
+                if method == "POST" and urllib.parse.urlsplit(path).path == "/api/chat":
+                    payload = json.loads(body or b"{}")
+                    if latency_ms:
+                        await asyncio.sleep(rng.expovariate(1000 / latency_ms))
+                    status, out = 200, dialog.reply(str(payload.get("sessionId") or "anonymous"), str(payload.get("text", "")).strip())
+                elif method == "GET" and path == "/api/health":
+                    status, out = 200, {"ok": True}
+                else:
+                    status, out = 404, {"error": f"not found: {path}"}
+                data = json.dumps(out, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port, backlog=1024)
+    if ready is not None:
+        ready.put(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def serve_standin(port: int, latency_ms: float = 0.0, ready: Any = None) -> None:
+    asyncio.run(_serve_standin(port, latency_ms, ready))
+
+
+def start_standin(latency_ms: float) -> tuple[multiprocessing.Process, int]:
+    """stand-in 서버를 별도 프로세스로 띄우고 (프로세스, 포트)를 돌려줍니다."""
+    ready: Any = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_standin, args=(0, latency_ms, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=30)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="예약 대화 부하 테스트 (POST /api/chat)")
+    parser.add_argument("--target", default="http://localhost:3000", help="서버 주소 또는 standin (기본 http://localhost:3000)")
+    parser.add_argument("--rate", type=float, default=10.0, help="초당 새 세션 수 (open-loop 도착률)")
+    parser.add_argument("--duration", type=float, default=30.0, help="세션을 도착시키는 시간 (초)")
+    parser.add_argument("--processes", type=int, default=max(1, min(4, multiprocessing.cpu_count())), help="부하 생성 프로세스 수")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="턴 사이 사용자 입력 시간 평균 (지수 분포)")
+    parser.add_argument("--timeout", type=float, default=15.0, help="요청 하나의 제한 시간 (초)")
+    parser.add_argument("--max-sessions", type=int, default=5000, help="동시에 진행 중인 세션 한도 (넘으면 도착을 포기로 집계)")
+    parser.add_argument("--reservation-ratio", type=float, default=0.8, help="MakeReservation 다중 턴 세션 비율")
+    parser.add_argument("--engine", default="", help="요청 body 의 engine 값 (기본: 서버 DEFAULT_AI_ENGINE)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", type=Path, help="요약을 JSON 파일로도 저장")
+    parser.add_argument("--serve-standin", type=int, metavar="PORT", help="stand-in 서버만 띄우고 종료하지 않습니다.")
+    parser.add_argument("--standin-latency-ms", type=float, default=80.0, help="stand-in 응답 지연 평균 (지수 분포)")
+    args = parser.parse_args(argv)
+
+    if args.serve_standin is not None:
+        print(f"stand-in: http://127.0.0.1:{args.serve_standin}/api/chat", flush=True)
+        try:
+            serve_standin(args.serve_standin, args.standin_latency_ms)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    standin = None
+    if args.target == "standin":
+        standin, port = start_standin(args.standin_latency_ms)
+        host, path = "127.0.0.1", "/api/chat"
+    else:
+        url = urllib.parse.urlsplit(args.target)
+        if url.scheme != "http" or not url.hostname:
+            raise ScriptError(f"http://host:port 형식의 주소가 필요합니다: {args.target}")
+        host, port = url.hostname, url.port or 80
+        path = url.path.rstrip("/") + "/api/chat" if not url.path.endswith("/api/chat") else url.path
+
+    cfg = LoadConfig(
+        host=host,
+        port=port,
+        path=path,
+        rate=args.rate,
+        duration=args.duration,
+        think_ms=args.think_ms,
+        timeout=args.timeout,
+        max_sessions=args.max_sessions,
+        reservation_ratio=args.reservation_ratio,
+        engine=args.engine,
+        seed=args.seed,
+    )
+    print(f"부하: {args.rate} 세션/s × {args.duration}s, 프로세스 {args.processes}개 → http://{host}:{port}{path}", flush=True)
+    try:
+        summary = run_load(cfg, max(1, args.processes))
+    finally:
+        if standin is not None:
+            standin.terminate()
+    print(format_report(summary))
+    if args.json_out:
+        args.json_out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0 if summary["errorRate"] == 0 else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except ScriptError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,549 @@
+"""선언적 봇 모델과 DRAFT 스냅샷 비교(plan/diff) 엔진.
+
+원하는 봇 정의(``BotModel``)를 현재 DRAFT를 한 번 describe 한 스냅샷(``DraftSnapshot``)과
+비교해, 실제로 달라진 slot type / intent / slot 에 대해서만 create/update 호출을 만듭니다.
+update 호출은 locale을 NotBuilt로 되돌리므로 변경이 없으면 아무 호출도 하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterable
+
+from lex_cache import DAY, MetadataCache
+from lex_catalog import SlotValue, value_diff
+from lex_client import name_filter, paginate
+from lex_scheduler import TaskGraph, TaskResult, raise_for_errors
+
+RunAws = Callable[..., Any]
+
+# bot version description에 기록하는 locale 정의 해시 표식
+DEFINITION_HASH_TAG = "defhash="
+
+
+def make_slot_type_values(items: Iterable[str | SlotValue]) -> list[dict[str, Any]]:
+    """값 목록(문자열 또는 ``(값, 동의어)``)을 ``slotTypeValues`` API 형식으로 바꿉니다."""
+    out: list[dict[str, Any]] = []
+    for item in items:
+        value, synonyms = (item, ()) if isinstance(item, str) else item
+        entry: dict[str, Any] = {"sampleValue": {"value": value}}
+        if synonyms:
+            entry["synonyms"] = [{"value": s} for s in synonyms]
+        out.append(entry)
+    return out
+
+
+@dataclass(frozen=True)
+class SlotTypeSpec:
+    name: str
+    description: str
+    values: tuple[str | SlotValue, ...]
+    resolution_strategy: str = "TopResolution"
+
+    def payload(self) -> dict[str, Any]:
+        return {
+            "slotTypeName": self.name,
+            "description": self.description,
+            "slotTypeValues": make_slot_type_values(self.values),
+            "valueSelectionSetting": {"resolutionStrategy": self.resolution_strategy},
+        }
+
+
+@dataclass(frozen=True)
+class SlotSpec:
+    name: str
+    slot_type: str
+    prompt: str
+    custom: bool = False
+    max_retries: int = 2
+    required: bool = True
+
+    @property
+    def constraint(self) -> str:
+        return "Required" if self.required else "Optional"
+
+    def payload(self, slot_type_id: str) -> dict[str, Any]:
+        return {
+            "slotName": self.name,
+            "slotTypeId": slot_type_id,
+            "valueElicitationSetting": {
+                "slotConstraint": self.constraint,
+                "promptSpecification": {
+                    "maxRetries": self.max_retries,
+                    "messageGroups": [{"message": {"plainTextMessage": {"value": self.prompt}}}],
+                },
+            },
+        }
+
+
+@dataclass(frozen=True)
+class IntentSpec:
+    name: str
+    description: str
+    utterances: tuple[str, ...]
+    slots: tuple[SlotSpec, ...] = ()
+    fulfillment_code_hook: bool = False
+    # slot 이 아직 없을 때 생성용 발화 ({Slot} 참조가 있으면 create-intent가 실패)
+    initial_utterances: tuple[str, ...] = ()
+
+    def create_payload(self) -> dict[str, Any]:
+        utterances = self.initial_utterances or tuple(u for u in self.utterances if "{" not in u)
+        return {
+            "intentName": self.name,
+            "description": self.description,
+            "sampleUtterances": [{"utterance": u} for u in utterances],
+        }
+
+    def payload(self, slot_ids: list[str]) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "intentName": self.name,
+            "description": self.description,
+            "sampleUtterances": [{"utterance": u} for u in self.utterances],
+        }
+        if slot_ids:
+            out["slotPriorities"] = [{"priority": idx, "slotId": sid} for idx, sid in enumerate(slot_ids, 1)]
+        if self.fulfillment_code_hook:
+            out["fulfillmentCodeHook"] = {"enabled": True}
+        return out
+
+
+@dataclass(frozen=True)
+class BotModel:
+    slot_types: tuple[SlotTypeSpec, ...]
+    intents: tuple[IntentSpec, ...]
+
+
+@dataclass
+class DraftSnapshot:
+    """DRAFT locale의 describe 결과 (이름 기준)."""
+
+    slot_types: dict[str, dict[str, Any]] = field(default_factory=dict)
+    intents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    slots: dict[tuple[str, str], dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class Change:
+    action: str  # create | update | import
+    kind: str  # slot-type | intent | slot
+    name: str
+    fields: tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+    def render(self) -> str:
+        mark = "+" if self.action == "create" else "~"
+        detail = f" ({', '.join(self.fields)})" if self.fields else ""
+        return f"  {mark} {self.action} {self.kind} {self.name}{detail}"
+
+
+@dataclass
+class Plan:
+    changes: list[Change] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def get(self, key: str) -> Change | None:
+        return next((c for c in self.changes if c.key == key), None)
+
+    def render(self) -> str:
+        lines = [f"변경 사항 {len(self.changes)}건 (변경 없음 {len(self.unchanged)}건)"]
+        lines.extend(change.render() for change in self.changes)
+        return "\n".join(lines)
+
+
+def definition_hash(model: BotModel, locale_id: str, nlu_confidence: str) -> str:
+    """locale 정의의 정규화된(canonical) 내용 해시.
+
+    slot type 은 id가 아니라 이름으로 참조하므로 같은 정의면 봇/계정이 달라도 같은 값이 나옵니다.
+    """
+    body = asdict(model)
+    for slot_type in body["slot_types"]:
+        # 값 순서는 의미가 없으므로(카탈로그 파일 정렬만 바뀐 경우) 정렬해서 해시합니다.
+        slot_type["values"] = sorted(slot_type["values"], key=lambda v: json.dumps(v, ensure_ascii=False))
+    canonical = {"localeId": locale_id, "nluIntentConfidenceThreshold": float(nlu_confidence), "model": body}
+    blob = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def find_version_by_hash(summaries: Iterable[dict[str, Any]], def_hash: str) -> str:
+    """description에 같은 정의 해시가 기록된 Available 버전.
+
+    ``summaries``는 최신 버전부터 오는 것으로 보고, 처음 일치하는 버전에서 멈춥니다.
+    """
+    tag = f"{DEFINITION_HASH_TAG}{def_hash}"
+    for v in summaries:
+        if v.get("botVersion") != "DRAFT" and v.get("botStatus", "Available") == "Available" and tag in (v.get("description") or ""):
+            return v["botVersion"]
+    return ""
+
+
+def cli_args(payload: dict[str, Any]) -> list[str]:
+    """API 파라미터(camelCase) → ``--kebab-case`` CLI 인자. 문자열이 아니면 JSON으로 넘깁니다."""
+    out: list[str] = []
+    for key, value in payload.items():
+        out.append("--" + re.sub(r"(?<!^)(?=[A-Z])", "-", key).lower())
+        out.append(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False))
+    return out
+
+
+def differs(desired: Any, current: Any) -> bool:
+    """``desired``에 지정한 필드만 비교합니다 (서버가 채운 기본값은 무시)."""
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return True
+        return any(differs(v, current.get(k)) for k, v in desired.items())
+    if isinstance(desired, list):
+        if not isinstance(current, list) or len(desired) != len(current):
+            return True
+        return any(differs(d, c) for d, c in zip(desired, current))
+    return desired != current
+
+
+def changed_fields(desired: dict[str, Any], current: dict[str, Any] | None) -> tuple[str, ...]:
+    if current is None:
+        return tuple(desired)
+    return tuple(k for k, v in desired.items() if differs(v, current.get(k)))
+
+
+def collect_summaries(items: Iterable[dict[str, Any]], name_key: str, wanted: set[str]) -> dict[str, dict[str, Any]]:
+    """``wanted`` 이름의 summary만 모읍니다. 모두 찾으면 나머지 page는 읽지 않습니다."""
+    found: dict[str, dict[str, Any]] = {}
+    if not wanted:
+        return found
+    for item in items:
+        name = item.get(name_key)
+        if name in wanted and name not in found:
+            found[name] = item
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def describe_draft(
+    run_aws: RunAws,
+    locale_args: list[str],
+    model: BotModel,
+    workers: int = 4,
+    cache: MetadataCache | None = None,
+    cache_ttl: float = DAY,
+) -> DraftSnapshot:
+    """모델에 등장하는 객체만 describe 해서 스냅샷을 만듭니다 (목록 → 상세 순서로 병렬 실행).
+
+    ``cache``가 있으면 describe 응답을 list 결과의 ``lastUpdatedDateTime``이 같을 때만 재사용합니다.
+    """
+    snapshot = DraftSnapshot()
+    scope = "/".join(locale_args[1::2])
+
+    def describe(kind: str, summary: dict[str, Any], id_key: str, *args: str) -> Any:
+        def fetch() -> Any:
+            return run_aws("lexv2-models", f"describe-{kind}", *locale_args, *args)
+
+        stamp = summary.get("lastUpdatedDateTime")
+        if cache is None or not stamp:
+            return fetch()
+        return cache.cached(f"{scope}/{kind}/{summary[id_key]}", fetch, cache_ttl, stamp)
+
+    wanted_types = {spec.name for spec in model.slot_types}
+    wanted_intents = {spec.name for spec in model.intents}
+    # 찾을 이름이 하나뿐이면 서버 측 EQ 필터로 목록 자체를 줄입니다.
+    type_filter = name_filter("SlotTypeName", next(iter(wanted_types))) if len(wanted_types) == 1 else []
+    intent_filter = name_filter("IntentName", next(iter(wanted_intents))) if len(wanted_intents) == 1 else []
+    lists = TaskGraph()
+    lists.add(
+        "list-slot-types",
+        lambda: collect_summaries(
+            paginate(run_aws, "lexv2-models", "list-slot-types", *locale_args, *type_filter, items_key="slotTypeSummaries"),
+            "slotTypeName",
+            wanted_types,
+        ),
+    )
+    lists.add(
+        "list-intents",
+        lambda: collect_summaries(
+            paginate(run_aws, "lexv2-models", "list-intents", *locale_args, *intent_filter, items_key="intentSummaries"),
+            "intentName",
+            wanted_intents,
+        ),
+    )
+    raise_for_errors(lists.run(workers))
+    intent_ids = {name: item["intentId"] for name, item in lists.value("list-intents").items()}
+
+    details = TaskGraph()
+    for name, item in lists.value("list-slot-types").items():
+        details.add(
+            f"slot-type:{name}",
+            lambda item=item: describe("slot-type", item, "slotTypeId", "--slot-type-id", item["slotTypeId"]),
+        )
+    for name, item in lists.value("list-intents").items():
+        details.add(
+            f"intent:{name}",
+            lambda item=item: describe("intent", item, "intentId", "--intent-id", item["intentId"]),
+        )
+        wanted_slots = {slot.name for intent in model.intents if intent.name == name for slot in intent.slots}
+        details.add(
+            f"list-slots:{name}",
+            lambda intent_id=item["intentId"], wanted_slots=wanted_slots: collect_summaries(
+                paginate(run_aws, "lexv2-models", "list-slots", *locale_args, "--intent-id", intent_id, items_key="slotSummaries"),
+                "slotName",
+                wanted_slots,
+            ),
+        )
+    results = details.run(workers)
+    raise_for_errors(results)
+
+    slot_graph = TaskGraph()
+    for result in results:
+        kind, name = result.name.split(":", 1)
+        if kind == "slot-type":
+            snapshot.slot_types[name] = result.value
+        elif kind == "intent":
+            snapshot.intents[name] = result.value
+        else:
+            for slot_name, item in result.value.items():
+                slot_graph.add(
+                    f"{name}:{slot_name}",
+                    lambda intent_id=intent_ids[name], item=item: describe(
+                        "slot", item, "slotId", "--intent-id", intent_id, "--slot-id", item["slotId"]
+                    ),
+                )
+    slot_results = slot_graph.run(workers)
+    raise_for_errors(slot_results)
+    for result in slot_results:
+        intent_name, slot_name = result.name.split(":", 1)
+        snapshot.slots[(intent_name, slot_name)] = result.value
+    return snapshot
+
+
+def diff(model: BotModel, snapshot: DraftSnapshot) -> Plan:
+    plan = Plan()
+
+    type_ids: dict[str, str] = {}
+    for spec in model.slot_types:
+        current = snapshot.slot_types.get(spec.name)
+        if current is None:
+            plan.changes.append(Change("create", "slot-type", spec.name))
+            continue
+        type_ids[spec.name] = current["slotTypeId"]
+        payload = spec.payload()
+        fields = changed_fields(payload, current)
+        if "slotTypeValues" in fields:
+            # 값 목록은 순서와 무관하게 값/동의어 집합으로 비교합니다 (대용량 카탈로그의 불필요한 update 방지).
+            values = value_diff(payload["slotTypeValues"], current.get("slotTypeValues"))
+            fields = tuple(f for f in fields if f != "slotTypeValues") + ((values.render(),) if values else ())
+        if fields:
+            plan.changes.append(Change("update", "slot-type", spec.name, fields))
+        else:
+            plan.unchanged.append(f"slot-type:{spec.name}")
+
+    for intent in model.intents:
+        current_intent = snapshot.intents.get(intent.name)
+        if current_intent is None:
+            plan.changes.append(Change("create", "intent", intent.name))
+
+        slot_ids: list[str] = []
+        for slot in intent.slots:
+            name = f"{intent.name}.{slot.name}"
+            current = snapshot.slots.get((intent.name, slot.name))
+            if current is None:
+                plan.changes.append(Change("create", "slot", name))
+                continue
+            slot_ids.append(current["slotId"])
+            if slot.custom and slot.slot_type not in type_ids:
+                # 참조하는 slot type이 새로 만들어지면 slotTypeId도 바뀝니다.
+                plan.changes.append(Change("update", "slot", name, ("slotTypeId",)))
+                continue
+            type_id = type_ids[slot.slot_type] if slot.custom else slot.slot_type
+            fields = changed_fields(slot.payload(type_id), current)
+            if fields:
+                plan.changes.append(Change("update", "slot", name, fields))
+            else:
+                plan.unchanged.append(f"slot:{name}")
+
+        if current_intent is None:
+            continue
+        if len(slot_ids) != len(intent.slots):
+            plan.changes.append(Change("update", "intent", intent.name, ("slotPriorities",)))
+            continue
+        fields = changed_fields(intent.payload(slot_ids), current_intent)
+        if fields:
+            plan.changes.append(Change("update", "intent", intent.name, fields))
+        else:
+            plan.unchanged.append(f"intent:{intent.name}")
+    return plan
+
+
+def apply_plan(
+    run_aws: RunAws,
+    locale_args: list[str],
+    model: BotModel,
+    snapshot: DraftSnapshot,
+    plan: Plan,
+    workers: int = 4,
+) -> list[TaskResult]:
+    """plan의 변경만 작업 그래프로 실행합니다.
+
+    순서 제약: slot type → 이를 참조하는 slot, intent 생성 → slot → intent 최종 갱신(slot-priorities).
+    """
+    graph = TaskGraph()
+
+    def slot_type_id(name: str) -> str:
+        if f"slot-type:{name}" in tasks:
+            return graph.value(f"slot-type:{name}")
+        return snapshot.slot_types[name]["slotTypeId"]
+
+    def intent_id(name: str) -> str:
+        if f"intent-create:{name}" in tasks:
+            return graph.value(f"intent-create:{name}")
+        return snapshot.intents[name]["intentId"]
+
+    def slot_id(intent: IntentSpec, slot: SlotSpec) -> str:
+        key = f"slot:{intent.name}.{slot.name}"
+        if key in tasks:
+            return graph.value(key)
+        return snapshot.slots[(intent.name, slot.name)]["slotId"]
+
+    def upsert_slot_type(spec: SlotTypeSpec, change: Change) -> str:
+        args = ["lexv2-models", f"{change.action}-slot-type", *locale_args, *cli_args(spec.payload())]
+        if change.action == "update":
+            type_id = snapshot.slot_types[spec.name]["slotTypeId"]
+            run_aws(*args, "--slot-type-id", type_id)
+            return type_id
+        return run_aws(*args)["slotTypeId"]
+
+    def create_intent(intent: IntentSpec) -> str:
+        return run_aws("lexv2-models", "create-intent", *locale_args, *cli_args(intent.create_payload()))["intentId"]
+
+    def upsert_slot(intent: IntentSpec, slot: SlotSpec, change: Change) -> str:
+        type_id = slot_type_id(slot.slot_type) if slot.custom else slot.slot_type
+        args = [
+            "lexv2-models",
+            f"{change.action}-slot",
+            *locale_args,
+            "--intent-id",
+            intent_id(intent.name),
+            *cli_args(slot.payload(type_id)),
+        ]
+        if change.action == "update":
+            sid = snapshot.slots[(intent.name, slot.name)]["slotId"]
+            run_aws(*args, "--slot-id", sid)
+            return sid
+        return run_aws(*args)["slotId"]
+
+    def update_intent(intent: IntentSpec) -> str:
+        iid = intent_id(intent.name)
+        payload = intent.payload([slot_id(intent, slot) for slot in intent.slots])
+        run_aws("lexv2-models", "update-intent", *locale_args, "--intent-id", iid, *cli_args(payload))
+        return iid
+
+    tasks: set[str] = set()
+    for spec in model.slot_types:
+        change = plan.get(f"slot-type:{spec.name}")
+        if change:
+            tasks.add(graph.add(f"slot-type:{spec.name}", lambda spec=spec, change=change: upsert_slot_type(spec, change)))
+
+    for intent in model.intents:
+        intent_deps: list[str] = []
+        create = plan.get(f"intent:{intent.name}")
+        if create and create.action == "create":
+            tasks.add(graph.add(f"intent-create:{intent.name}", lambda intent=intent: create_intent(intent)))
+            intent_deps.append(f"intent-create:{intent.name}")
+
+        slot_tasks: list[str] = []
+        for slot in intent.slots:
+            change = plan.get(f"slot:{intent.name}.{slot.name}")
+            if not change:
+                continue
+            deps = list(intent_deps)
+            if slot.custom and f"slot-type:{slot.slot_type}" in tasks:
+                deps.append(f"slot-type:{slot.slot_type}")
+            key = graph.add(
+                f"slot:{intent.name}.{slot.name}",
+                lambda intent=intent, slot=slot, change=change: upsert_slot(intent, slot, change),
+                deps,
+            )
+            tasks.add(key)
+            slot_tasks.append(key)
+
+        # slot 만 바뀐 경우(slotId 유지)에는 intent를 다시 보낼 필요가 없습니다.
+        if create:
+            tasks.add(graph.add(f"intent:{intent.name}", lambda intent=intent: update_intent(intent), intent_deps + slot_tasks))
+
+    results = graph.run(workers)
+    raise_for_errors(results)
+    return results
+
+
+def resource_ids(snapshot: DraftSnapshot, results: list[TaskResult]) -> dict[str, dict[str, str]]:
+    """스냅샷과 ``apply_plan`` 결과를 합친 현재 id 목록 (journal 기록용)."""
+    ids: dict[str, dict[str, str]] = {
+        "slotTypes": {name: d["slotTypeId"] for name, d in snapshot.slot_types.items()},
+        "intents": {name: d["intentId"] for name, d in snapshot.intents.items()},
+        "slots": {f"{intent}.{slot}": d["slotId"] for (intent, slot), d in snapshot.slots.items()},
+    }
+    for result in results:
+        kind, name = result.name.split(":", 1)
+        if kind == "slot-type":
+            ids["slotTypes"][name] = result.value
+        elif kind in ("intent-create", "intent"):
+            ids["intents"][name] = result.value
+        elif kind == "slot":
+            ids["slots"][name] = result.value
+    return ids
+
+
+def missing_ids(run_aws: RunAws, locale_args: list[str], recorded: dict[str, Any], workers: int = 4) -> list[str]:
+    """``resource_ids`` 로 기록한 id 중 DRAFT에서 사라진(또는 이름이 바뀐) 항목을 돌려줍니다.
+
+    list-slot-types/list-intents 한 번과 기록된 intent별 list-slots 한 번만 호출합니다 (describe 없음).
+    """
+    lists = TaskGraph()
+    lists.add(
+        "slot-types",
+        lambda: {
+            item["slotTypeId"]: item.get("slotTypeName")
+            for item in paginate(run_aws, "lexv2-models", "list-slot-types", *locale_args, items_key="slotTypeSummaries")
+        },
+    )
+    lists.add(
+        "intents",
+        lambda: {
+            item["intentId"]: item.get("intentName")
+            for item in paginate(run_aws, "lexv2-models", "list-intents", *locale_args, items_key="intentSummaries")
+        },
+    )
+    raise_for_errors(lists.run(workers))
+    slot_types, intents = lists.value("slot-types"), lists.value("intents")
+    missing = [f"slot type {name}" for name, type_id in recorded.get("slotTypes", {}).items() if slot_types.get(type_id) != name]
+    missing += [f"intent {name}" for name, intent_id in recorded.get("intents", {}).items() if intents.get(intent_id) != name]
+
+    slot_lists = TaskGraph()
+    for name, intent_id in recorded.get("intents", {}).items():
+        if intents.get(intent_id) != name:
+            continue
+        slot_lists.add(
+            name,
+            lambda intent_id=intent_id: {
+                item["slotId"]: item.get("slotName")
+                for item in paginate(
+                    run_aws, "lexv2-models", "list-slots", *locale_args, "--intent-id", intent_id, items_key="slotSummaries"
+                )
+            },
+        )
+    results = slot_lists.run(workers)
+    raise_for_errors(results)
+    slots = {r.name: r.value for r in results}
+    for key, slot_id in recorded.get("slots", {}).items():
+        intent_name, slot_name = key.split(".", 1)
+        if intent_name in slots and slots[intent_name].get(slot_id) != slot_name:
+            missing.append(f"slot {key}")
+        elif intent_name not in slots and f"intent {intent_name}" not in missing:
+            missing.append(f"slot {key}")
+    return missing
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""로컬 intent 사전 라우터 (RecognizeText 앞단 fast path).
+
+``R-ABC123 예약 있나?``, ``예약 취소`` 처럼 뜻이 분명한 메시지는 Lex 를 부르지 않고 로컬에서 intent/slot 을
+정하고, 나머지는 그대로 Lex 로 넘깁니다.
+
+- 학습(오프라인): 봇과 같은 발화 소스(``UTTERANCE_SOURCES``, 기본 ``docs/utterances-100.md``)와 slot 값
+  (``BRANCH_VALUES``/``COURSE_VALUES`` 또는 ``*_VALUES_FILE``)으로 만든 작은 naive Bayes 모델 (JSON 저장 가능)
+- 특징: 예약번호/전화번호는 정규식, 지점/과정 값은 값 인덱스로 ``{Slot}`` 자리표시로 바꾼 뒤
+  단어 안 문자 bigram/trigram (``취소해줘`` → ``취소``, ``소해``, ``취소해`` ...). 조사/어미가 붙어도 맞습니다.
+- 로컬 응답 조건: 최고 intent 확률 ≥ ``PREROUTER_THRESHOLD``, 아는 특징 비율 ≥ ``min_known``,
+  intent 의 필수 slot 을 모두 로컬에서 채움 (MakeReservation 처럼 대화가 필요한 intent 는 항상 Lex)
+- slot 을 묻는 중인 세션(ElicitSlot/ConfirmIntent)의 다음 메시지는 항상 Lex 로 보냅니다.
+
+로컬 응답은 RecognizeText 와 같은 형식이며 intent state 는 ``ReadyForFulfillment`` 입니다
+(fulfillment code hook 은 호출하는 쪽이 실행). 응답의 ``preRouter`` 필드로 구분합니다.
+
+예::
+
+    python3 infra/lex_prerouter.py --eval --sweep 0.7,0.8,0.9          # leave-one-out 적중률/정확도
+    python3 infra/lex_prerouter.py --out /tmp/prerouter.json           # 학습 결과 저장
+    python3 infra/lex_prerouter.py "R-ABC123 예약 있나?" "예약 취소"
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import math
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from lex_catalog import SlotValue
+from lex_utterances import normalize, read_source, utterance_sources
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BOOTSTRAP_PATH = Path(__file__).resolve().parent / "lex-bootstrap.py"
+DEFAULT_SOURCES = (ROOT_DIR / "docs" / "utterances-100.md",)
+DEFAULT_THRESHOLD = 0.8
+MODEL_VERSION = 1
+
+# intent 이름 → slot 이름
+IntentSlots = dict[str, tuple[str, ...]]
+# (sessionId, text) → RecognizeText 응답 (lex_regression.Recognize 와 같은 모양)
+Recognize = Callable[[str, str], dict[str, Any]]
+
+RESERVATION_ID = re.compile(r"(?<![0-9A-Za-z])R-[0-9A-Z]{4,20}(?![0-9A-Za-z])", re.IGNORECASE)
+PHONE_NUMBER = re.compile(r"(?<!\d)01[016789]-?\d{3,4}-?\d{4}(?!\d)")
+# 정규식으로 뽑는 slot (값 인덱스보다 먼저 적용)
+PATTERN_SLOTS = (("ReservationId", RESERVATION_ID, str.upper), ("PhoneNumber", PHONE_NUMBER, lambda v: v.replace("-", "")))
+# Lex 가 slot 을 묻는 중인 dialogAction (다음 메시지는 그 slot 의 답)
+DIALOG_ACTIVE = frozenset({"ElicitSlot", "ConfirmIntent"})
+
+
+@dataclass(frozen=True)
+class Decision:
+    """``reason`` 이 비어 있으면 로컬 응답, 아니면 Lex 로 넘긴 이유."""
+
+    intent: str
+    confidence: float
+    slots: dict[str, str]
+    reason: str = ""
+
+    @property
+    def hit(self) -> bool:
+        return not self.reason
+
+
+class PreRouter:
+    def __init__(
+        self,
+        intents: list[str],
+        priors: list[float],
+        weights: dict[str, list[float]],
+        exact: dict[str, str],
+        slot_values: dict[str, dict[str, str]],
+        intent_slots: dict[str, list[str]],
+        required: dict[str, list[str]],
+        threshold: float = DEFAULT_THRESHOLD,
+        min_known: float = 0.6,
+    ) -> None:
+        self.intents = intents
+        self.priors = priors
+        self.weights = weights
+        self.exact = exact
+        self.slot_values = slot_values
+        self.intent_slots = intent_slots
+        self.required = required
+        self.threshold = threshold
+        self.min_known = min_known
+        index = {word: slot for slot, values in slot_values.items() for word in values}
+        # 긴 값부터 (``영어회화``가 ``회화``보다 먼저). 조사가 붙는 말이라 앞쪽 경계만 봅니다 (``강남점에서``).
+        words = sorted(index, key=len, reverse=True)
+        self._index = index
+        self._values = re.compile(r"(?<!\S)(" + "|".join(map(re.escape, words)) + ")") if words else None
+
+    # --- 학습 ----------------------------------------------------------------
+
+    @classmethod
+    def train(
+        cls,
+        examples: Iterable[tuple[str, str]],
+        slot_values: dict[str, Iterable[str | SlotValue]],
+        intent_slots: dict[str, tuple[str, ...]],
+        required: dict[str, tuple[str, ...]],
+        threshold: float = DEFAULT_THRESHOLD,
+        alpha: float = 0.5,
+    ) -> PreRouter:
+        """(intent, 발화) 목록으로 학습합니다. ``intent_slots`` 에 없는 intent 의 발화는 건너뜁니다."""
+        values: dict[str, dict[str, str]] = {}
+        for slot, items in slot_values.items():
+            for item in items:
+                value, synonyms = (item, ()) if isinstance(item, str) else item
+                for word in (value, *synonyms):
+                    values.setdefault(slot, {}).setdefault(normalize(word).casefold(), value)
+        router = cls(
+            sorted(intent_slots),
+            [],
+            {},
+            {},
+            values,
+            {k: list(v) for k, v in intent_slots.items()},
+            {k: list(required.get(k, ())) for k in intent_slots},
+            threshold,
+        )
+
+        docs: Counter[str] = Counter()
+        counts: dict[str, Counter[str]] = {intent: Counter() for intent in router.intents}
+        seen: set[str] = set()
+        for intent, text in examples:
+            if intent not in counts:
+                continue
+            templated, _ = router.extract(text)
+            if templated in seen:
+                continue
+            seen.add(templated)
+            router.exact[templated] = intent
+            docs[intent] += 1
+            counts[intent].update(router.features(templated))
+
+        vocab = sorted(set().union(*counts.values()))
+        total = sum(docs.values()) or 1
+        router.priors = [math.log((docs[intent] + 1) / (total + len(router.intents))) for intent in router.intents]
+        denominators = [sum(counts[intent].values()) + alpha * len(vocab) for intent in router.intents]
+        router.weights = {
+            feature: [round(math.log((counts[intent][feature] + alpha) / denom), 4) for intent, denom in zip(router.intents, denominators)]
+            for feature in vocab
+        }
+        return router
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": MODEL_VERSION,
+            "intents": self.intents,
+            "priors": self.priors,
+            "weights": self.weights,
+            "exact": self.exact,
+            "slotValues": self.slot_values,
+            "intentSlots": self.intent_slots,
+            "required": self.required,
+            "threshold": self.threshold,
+            "minKnown": self.min_known,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PreRouter:
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"prerouter 모델 버전이 다릅니다: {data.get('version')} (기대 {MODEL_VERSION}). 다시 학습하세요.")
+        return cls(
+            data["intents"],
+            data["priors"],
+            data["weights"],
+            data["exact"],
+            data["slotValues"],
+            data["intentSlots"],
+            data["required"],
+            data["threshold"],
+            data["minKnown"],
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> PreRouter:
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    # --- 판정 ----------------------------------------------------------------
+
+    def extract(self, text: str) -> tuple[str, dict[str, str]]:
+        """slot 값을 뽑고 ``{Slot}`` 자리표시로 바꾼 정규화 문장을 돌려줍니다 (slot 마다 처음 나온 값)."""
+        slots: dict[str, str] = {}
+
+        def take(slot: str, value: str) -> str:
+            slots.setdefault(slot, value)
+            return f" {{{slot}}} "
+
+        def value(match: re.Match[str]) -> str:
+            slot = self._index[match.group(1)]
+            return take(slot, self.slot_values[slot][match.group(1)])
+
+        text = normalize(text).casefold()
+        for slot, pattern, canonical in PATTERN_SLOTS:
+            text = pattern.sub(lambda m: take(slot, canonical(m.group(0))), text)
+        if self._values is not None:
+            text = self._values.sub(value, text)
+        return " ".join(text.split()), slots
+
+    @staticmethod
+    def features(templated: str) -> list[str]:
+        """단어 안 문자 bigram/trigram. ``{Slot}`` 자리표시와 한 글자 단어는 그대로 씁니다."""
+        out = []
+        for word in templated.split():
+            if word.startswith("{") or len(word) == 1:
+                out.append(word)
+                continue
+            out.extend(word[i : i + 2] for i in range(len(word) - 1))
+            out.extend(word[i : i + 3] for i in range(len(word) - 2))
+        return out
+
+    def route(self, text: str) -> Decision:
+        templated, slots = self.extract(text)
+        if templated in self.exact:
+            # 학습 발화와 (slot 값만 빼고) 같은 문장
+            intent, confidence = self.exact[templated], 1.0
+        else:
+            features = self.features(templated)
+            known = [self.weights[f] for f in features if f in self.weights]
+            if not known:
+                return Decision("", 0.0, slots, "unknown")
+            scores = list(self.priors)
+            for weights in known:
+                for i, w in enumerate(weights):
+                    scores[i] += w
+            top = max(scores)
+            exp = [math.exp(s - top) for s in scores]
+            best = scores.index(top)
+            intent, confidence = self.intents[best], exp[best] / sum(exp)
+            if len(known) < self.min_known * len(features):
+                return Decision(intent, confidence, slots, "unknown")
+        if confidence < self.threshold:
+            return Decision(intent, confidence, slots, "low-confidence")
+        if any(slot not in slots for slot in self.required.get(intent, ())):
+            return Decision(intent, confidence, slots, "missing-slots")
+        # intent 에 없는 slot (예: CheckReservation 의 Branch) 은 Lex 도 채우지 않으므로 뺍니다.
+        allowed = self.intent_slots.get(intent, ())
+        return Decision(intent, confidence, {name: v for name, v in slots.items() if name in allowed})
+
+
+# --- 지표 -------------------------------------------------------------------------
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+@dataclass
+class PreRouterStats:
+    requests: int = 0
+    hits: int = 0
+    misses: Counter = field(default_factory=Counter)
+    per_intent: Counter = field(default_factory=Counter)
+    route_us: deque = field(default_factory=lambda: deque(maxlen=10000))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, decision: Decision | None, elapsed_us: float, reason: str = "") -> None:
+        with self._lock:
+            self.requests += 1
+            self.route_us.append(elapsed_us)
+            if decision is not None and decision.hit:
+                self.hits += 1
+                self.per_intent[decision.intent] += 1
+            else:
+                self.misses[reason or decision.reason] += 1
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            timings = list(self.route_us)
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "hitRate": round(self.hits / self.requests, 4) if self.requests else 0.0,
+                "misses": dict(self.misses),
+                "hitsByIntent": dict(self.per_intent),
+                "routeUsP50": round(_pct(timings, 50), 1),
+                "routeUsP95": round(_pct(timings, 95), 1),
+            }
+
+
+def format_stats(summary: dict[str, Any]) -> str:
+    misses = ", ".join(f"{k}={v}" for k, v in sorted(summary["misses"].items())) or "-"
+    intents = ", ".join(f"{k}={v}" for k, v in sorted(summary["hitsByIntent"].items())) or "-"
+    return (
+        f"   prerouter: 로컬 {summary['hits']}/{summary['requests']} ({summary['hitRate']:.1%}),"
+        f" 판정 p50 {summary['routeUsP50']:.0f}us p95 {summary['routeUsP95']:.0f}us\n"
+        f"   로컬 intent: {intents}\n   Lex 로 넘김: {misses}"
+    )
+
+
+# --- RecognizeText 앞단 -----------------------------------------------------------
+
+
+def local_response(session_id: str, decision: Decision) -> dict[str, Any]:
+    slots = {
+        name: {"value": {"originalValue": value, "interpretedValue": value, "resolvedValues": [value]}} for name, value in decision.slots.items()
+    }
+    intent = {"name": decision.intent, "slots": slots, "state": "ReadyForFulfillment", "confirmationState": "None"}
+    return {
+        "sessionId": session_id,
+        "sessionState": {"dialogAction": {"type": "Close"}, "intent": intent},
+        "interpretations": [{"intent": intent, "nluConfidence": {"score": round(decision.confidence, 2)}}],
+        "messages": [],
+        "preRouter": {"confidence": round(decision.confidence, 4)},
+    }
+
+
+class PreRoutedRecognizer:
+    """``recognize`` 앞에서 로컬 판정을 먼저 해 봅니다. slot 을 묻는 중인 세션은 건너뜁니다."""
+
+    def __init__(self, router: PreRouter | HeldOutRouter, recognize: Recognize, stats: PreRouterStats | None = None) -> None:
+        self.router = router
+        self.recognize = recognize
+        self.stats = stats or PreRouterStats()
+        self._in_dialog: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, session_id: str, text: str) -> dict[str, Any]:
+        started = time.perf_counter()
+        with self._lock:
+            in_dialog = session_id in self._in_dialog
+        if in_dialog:
+            self.stats.record(None, (time.perf_counter() - started) * 1e6, "dialog")
+        else:
+            decision = self.router.route(text)
+            self.stats.record(decision, (time.perf_counter() - started) * 1e6)
+            if decision.hit:
+                return local_response(session_id, decision)
+        response = self.recognize(session_id, text)
+        action = ((response.get("sessionState") or {}).get("dialogAction") or {}).get("type", "")
+        with self._lock:
+            if action in DIALOG_ACTIVE:
+                self._in_dialog.add(session_id)
+            else:
+                self._in_dialog.discard(session_id)
+        return response
+
+
+# --- 학습 데이터/평가 -------------------------------------------------------------
+
+
+def load_bootstrap() -> Any:
+    spec = importlib.util.spec_from_file_location("lex_bootstrap", BOOTSTRAP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def training_data(cfg: dict[str, str], bootstrap: Any) -> tuple[list[tuple[str, str]], dict[str, Any], IntentSlots, IntentSlots]:
+    """(발화 목록, slot → 값, intent → slot, intent → 필수 slot). intent/slot 정의는 배포할 봇(``bot_model``)과 같습니다."""
+    sources = utterance_sources(cfg, ROOT_DIR) or list(DEFAULT_SOURCES)
+    cfg = {**cfg, "UTTERANCE_SOURCES": ",".join(map(str, sources))}
+    # slot type 이름만 쓰이므로 built-in 조회 없이 고정 이름을 넘깁니다.
+    model = bootstrap.bot_model(cfg, dict.fromkeys(("name", "date", "time", "phone", "reservation_id"), "AMAZON.AlphaNumeric"))
+    type_values = {slot_type.name: slot_type.values for slot_type in model.slot_types}
+    slot_values = {slot.name: type_values[slot.slot_type] for intent in model.intents for slot in intent.slots if slot.slot_type in type_values}
+    intent_slots = {intent.name: tuple(slot.name for slot in intent.slots) for intent in model.intents}
+    required = {intent.name: tuple(slot.name for slot in intent.slots if slot.required) for intent in model.intents}
+    examples = [example for path in sources for example in read_source(path)]
+    return examples, slot_values, intent_slots, required
+
+
+def router_from_cfg(cfg: dict[str, str], bootstrap: Any | None = None) -> PreRouter:
+    """``PREROUTER_MODEL`` 이 있으면 읽고, 없으면 설정의 발화/slot 값으로 바로 학습합니다."""
+    threshold = float(cfg.get("PREROUTER_THRESHOLD") or DEFAULT_THRESHOLD)
+    if cfg.get("PREROUTER_MODEL"):
+        router = PreRouter.load(Path(cfg["PREROUTER_MODEL"]))
+        router.threshold = threshold
+        return router
+    return PreRouter.train(*training_data(cfg, bootstrap or load_bootstrap()), threshold=threshold)
+
+
+class HeldOutRouter:
+    """평가용: 문장마다 그 문장(정규화 기준)을 뺀 발화로 미리 학습한 모델로 판정합니다 (leave-one-out).
+
+    회귀 케이스가 학습 발화와 겹치므로 (``scripts/seed-testcases.json`` ⊂ ``docs/utterances-100.md``)
+    케이스를 그대로 학습한 모델로 재면 적중률/정확도가 부풀려집니다. 학습은 생성 시 끝내 두어 판정 시간만 잽니다.
+    """
+
+    def __init__(
+        self,
+        texts: Iterable[str],
+        examples: list[tuple[str, str]],
+        slot_values: dict[str, Any],
+        intent_slots: IntentSlots,
+        required: IntentSlots,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        self.routers: dict[str, PreRouter] = {}
+        for text in texts:
+            key = normalize(text).casefold()
+            if key not in self.routers:
+                kept = [(intent, t) for intent, t in examples if normalize(t).casefold() != key]
+                self.routers[key] = PreRouter.train(kept, slot_values, intent_slots, required, threshold)
+
+    def route(self, text: str) -> Decision:
+        return self.routers[normalize(text).casefold()].route(text)
+
+
+def cross_validate(
+    examples: list[tuple[str, str]],
+    slot_values: dict[str, Any],
+    intent_slots: dict[str, tuple[str, ...]],
+    required: dict[str, tuple[str, ...]],
+    thresholds: list[float],
+) -> list[dict[str, Any]]:
+    """leave-one-out: 발화 하나씩 빼고 학습한 모델로 그 발화를 판정합니다 (threshold 별 적중률/정확도)."""
+    unique = list({normalize(text).casefold(): (intent, text) for intent, text in examples if intent in intent_slots}.values())
+    decisions = []
+    for i, (intent, text) in enumerate(unique):
+        router = PreRouter.train(unique[:i] + unique[i + 1 :], slot_values, intent_slots, required, threshold=0.0)
+        started = time.perf_counter()
+        decision = router.route(text)
+        decisions.append((intent, text, decision, (time.perf_counter() - started) * 1e6))
+    reports = []
+    for threshold in thresholds:
+        stats = PreRouterStats()
+        wrong = []
+        for expected, text, decision, elapsed in decisions:
+            if decision.hit and decision.confidence < threshold:
+                decision = Decision(decision.intent, decision.confidence, decision.slots, "low-confidence")
+            stats.record(decision, elapsed)
+            if decision.hit and decision.intent != expected:
+                wrong.append(f"{text} → {decision.intent} ({decision.confidence:.2f}, 기대 {expected})")
+        summary = stats.summary()
+        correct = summary["hits"] - len(wrong)
+        reports.append({"threshold": threshold, **summary, "precision": round(correct / summary["hits"], 4) if summary["hits"] else 1.0, "wrong": wrong})
+    return reports
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 intent 사전 라우터 학습/평가")
+    parser.add_argument("texts", nargs="*", help="판정해 볼 문장")
+    parser.add_argument("--model", type=Path, help="학습된 모델 JSON (없으면 설정으로 바로 학습)")
+    parser.add_argument("--out", type=Path, help="학습한 모델을 JSON 으로 저장")
+    parser.add_argument("--threshold", type=float, help=f"로컬 응답 최소 확률 (기본 PREROUTER_THRESHOLD 또는 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--eval", action="store_true", help="발화 소스로 leave-one-out 평가")
+    parser.add_argument("--sweep", default="", help="평가할 threshold 목록, 예: 0.7,0.8,0.9,0.95")
+    args = parser.parse_args(argv)
+
+    bootstrap = load_bootstrap()
+    cfg = bootstrap.get_config()
+    if args.model:
+        cfg["PREROUTER_MODEL"] = str(args.model)
+    if args.threshold is not None:
+        cfg["PREROUTER_THRESHOLD"] = str(args.threshold)
+
+    if args.eval:
+        thresholds = [float(t) for t in args.sweep.split(",") if t.strip()] or [float(cfg.get("PREROUTER_THRESHOLD") or DEFAULT_THRESHOLD)]
+        examples, slot_values, intent_slots, required = training_data(cfg, bootstrap)
+        reports = cross_validate(examples, slot_values, intent_slots, required, thresholds)
+        print(f"leave-one-out ({reports[0]['requests']}개 발화)")
+        print(f"   {'threshold':>9} {'로컬':>7} {'정확도':>7} {'p50':>7} {'p95':>7}  Lex 로 넘김")
+        for r in reports:
+            misses = ", ".join(f"{k}={v}" for k, v in sorted(r["misses"].items()))
+            print(f"   {r['threshold']:>9.2f} {r['hitRate']:>7.1%} {r['precision']:>7.1%} {r['routeUsP50']:>5.0f}us {r['routeUsP95']:>5.0f}us  {misses}")
+        for line in reports[-1]["wrong"]:
+            print(f"   ❌ {line}")
+        return 0
+
+    router = router_from_cfg(cfg, bootstrap)
+    if args.out:
+        args.out.write_text(json.dumps(router.to_dict(), ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"저장: {args.out} ({len(router.intents)}개 intent, 특징 {len(router.weights)}개, threshold {router.threshold:g})")
+    for text in args.texts:
+        started = time.perf_counter()
+        decision = router.route(text)
+        elapsed = (time.perf_counter() - started) * 1e6
+        verdict = "로컬" if decision.hit else f"Lex ({decision.reason})"
+        print(f"{text} → {verdict}: {decision.intent or '-'} {decision.confidence:.2f} {json.dumps(decision.slots, ensure_ascii=False)} ({elapsed:.0f}us)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""intent 정확도 회귀 테스트 (``scripts/seed-testcases.json``).
+
+케이스(``text``/``expectedIntent``)를 RecognizeText 호환 endpoint 로 동시에 보내고
+정확도, 혼동 행렬, 지연 시간 p50/p95/p99 를 보고합니다.
+
+- 케이스마다 별도 sessionId 를 써서 앞 케이스의 대화 상태(slot 수집 중 등)가 다음 케이스에 섞이지 않습니다.
+- 동시 요청 수는 ``--concurrency`` 로 제한합니다 (asyncio semaphore + 같은 크기의 worker 풀).
+
+endpoint::
+
+    lex            Lex Runtime V2 RecognizeText (AWS_BACKEND 설정을 따름, LEX_BOT_ID/LEX_BOT_ALIAS_ID/LEX_LOCALE_ID)
+    http://...     같은 REST 경로(/bots/{id}/botAliases/{id}/botLocales/{id}/sessions/{id}/text)를 쓰는 서명 없는 endpoint
+    stub           발화 코퍼스로 답하는 로컬 stub 서버를 띄워 오프라인(CI)으로 실행
+                   (케이스 문장은 코퍼스에서 빼고 판정하므로 실행 경로만 확인하고 봇 정확도와는 무관)
+
+``--prerouter`` 를 주면 로컬 사전 라우터(``lex_prerouter.py``)를 endpoint 앞에 두고 로컬 적중률도 보고합니다.
+케이스가 학습 발화와 겹치므로 케이스마다 그 문장을 뺀 발화로 학습한 모델로 판정합니다 (leave-one-out).
+
+예::
+
+    python3 infra/lex_regression.py --endpoint stub               # 실행 경로 확인용 (정확도는 stub 의 leave-one-out 값)
+    python3 infra/lex_regression.py --serve-stub 8790 --stub-latency-ms 40
+    LEX_BOT_ID=... LEX_BOT_ALIAS_ID=... python3 infra/lex_regression.py --endpoint lex --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+from lex_client import AwsRequest, RetryingBackend, ScriptError, get_backend
+from lex_prerouter import DEFAULT_THRESHOLD, HeldOutRouter, PreRoutedRecognizer, format_stats, load_bootstrap, training_data
+from lex_utterances import ValueTemplater, build_corpus, normalize, read_source
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CASES = ROOT_DIR / "scripts" / "seed-testcases.json"
+DEFAULT_CORPUS = (ROOT_DIR / "docs" / "utterances-100.md",)
+NO_INTENT = "(none)"
+
+# (sessionId, text) → RecognizeText 응답
+Recognize = Callable[[str, str], dict[str, Any]]
+
+
+@dataclass
+class CaseResult:
+    index: int
+    text: str
+    expected: str
+    predicted: str
+    latency_ms: float
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.predicted == self.expected
+
+
+def load_cases(path: Path) -> list[tuple[str, str]]:
+    """``(text, expectedIntent)`` 목록 (파일 순서 유지)."""
+    return [(text, intent) for intent, text in read_source(path)]
+
+
+def predicted_intent(response: dict[str, Any]) -> str:
+    intent = ((response.get("sessionState") or {}).get("intent") or {}).get("name")
+    if not intent:
+        interpretations = response.get("interpretations") or [{}]
+        intent = (interpretations[0].get("intent") or {}).get("name")
+    return intent or NO_INTENT
+
+
+async def run_cases(cases: list[tuple[str, str]], recognize: Recognize, concurrency: int = 8) -> list[CaseResult]:
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="regress") as pool:
+
+        async def one(index: int, text: str, expected: str) -> CaseResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(pool, recognize, f"regress-{run_id}-{index:04d}", text)
+                except Exception as exc:  # noqa: BLE001 - 케이스 하나의 실패로 전체를 멈추지 않습니다.
+                    elapsed = (time.perf_counter() - start) * 1000
+                    return CaseResult(index, text, expected, NO_INTENT, elapsed, f"{type(exc).__name__}: {exc}")
+                elapsed = (time.perf_counter() - start) * 1000
+                return CaseResult(index, text, expected, predicted_intent(response), elapsed)
+
+        return list(await asyncio.gather(*(one(i, text, expected) for i, (text, expected) in enumerate(cases, 1))))
+
+
+def percentile(values: list[float], p: float) -> float:
+    """nearest-rank 백분위수."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(results: list[CaseResult]) -> dict[str, Any]:
+    latencies = [r.latency_ms for r in results if not r.error]
+    confusion: dict[str, Counter[str]] = {}
+    for r in results:
+        confusion.setdefault(r.expected, Counter())[r.predicted] += 1
+    return {
+        "cases": len(results),
+        "correct": sum(r.ok for r in results),
+        "errors": sum(bool(r.error) for r in results),
+        "accuracy": sum(r.ok for r in results) / len(results) if results else 0.0,
+        "latencyMs": {f"p{p}": round(percentile(latencies, p), 1) for p in (50, 95, 99)},
+        "confusion": {expected: dict(row) for expected, row in confusion.items()},
+        "failures": [asdict(r) for r in results if not r.ok],
+    }
+
+
+def format_report(summary: dict[str, Any]) -> str:
+    confusion = summary["confusion"]
+    labels = list(confusion)
+    labels += sorted({p for row in confusion.values() for p in row} - set(labels))
+    width = max(len(label) for label in labels) if labels else 8
+    lat = summary["latencyMs"]
+    lines = [
+        f"정확도: {summary['accuracy']:.1%} ({summary['correct']}/{summary['cases']}, 오류 {summary['errors']}건)",
+        f"지연 시간(ms): p50={lat['p50']} p95={lat['p95']} p99={lat['p99']}",
+        "",
+        "혼동 행렬 (행: 기대 intent, 열: 인식 intent)",
+        " " * (width + 3) + " ".join(f"{i + 1:>4}" for i in range(len(labels))),
+    ]
+    for i, expected in enumerate(labels):
+        row = confusion.get(expected, {})
+        lines.append(f"{i + 1:>2} {expected:<{width}}" + " ".join(f"{row.get(p, 0) or '.':>4}" for p in labels))
+    if summary["failures"]:
+        lines.append("")
+        lines.append("오분류/오류:")
+        for f in summary["failures"]:
+            detail = f["error"] or f"→ {f['predicted']}"
+            lines.append(f"   #{f['index']} [{f['expected']}] {f['text']!r} {detail}")
+    return "\n".join(lines)
+
+
+# --- endpoints ---------------------------------------------------------------
+
+
+def lex_recognizer(cfg: dict[str, str], bot_id: str, alias_id: str, locale_id: str) -> Recognize:
+    """Lex Runtime V2 RecognizeText. 모델 API 보다 한도가 높으므로 호출 속도는 ``REGRESSION_RATE``로 따로 제한합니다."""
+    backend = RetryingBackend.from_cfg(get_backend(cfg).inner, {**cfg, "AWS_API_READ_RATE": cfg.get("REGRESSION_RATE", "50")})
+
+    def recognize(session_id: str, text: str) -> dict[str, Any]:
+        options = {"bot-id": bot_id, "bot-alias-id": alias_id, "locale-id": locale_id, "session-id": session_id, "text": text}
+        return backend.call(AwsRequest("lexv2-runtime", "recognize-text", options))
+
+    return recognize
+
+
+def http_recognizer(base_url: str, bot_id: str, alias_id: str, locale_id: str, timeout: float = 30) -> Recognize:
+    def recognize(session_id: str, text: str) -> dict[str, Any]:
+        path = "/".join(
+            urllib.parse.quote(part, safe="")
+            for part in ("bots", bot_id, "botAliases", alias_id, "botLocales", locale_id, "sessions", session_id)
+        )
+        request = urllib.request.Request(
+            f"{base_url.rstrip('/')}/{path}/text",
+            data=json.dumps({"text": text}).encode("utf-8"),
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    return recognize
+
+
+class StubClassifier:
+    """발화 코퍼스에서 정규화한 문장이 같으면 그 intent, 아니면 문자 bigram Jaccard 가 가장 높은 intent.
+
+    ``holdout=True`` 면 요청 문장과 같은 코퍼스 발화는 빼고 판정합니다 (leave-one-out). 회귀 케이스가
+    코퍼스와 겹치므로(``scripts/seed-testcases.json`` ⊂ ``docs/utterances-100.md``) 그대로 두면 정확도가 늘 100% 가 됩니다.
+    """
+
+    def __init__(self, corpus: dict[str, tuple[str, ...]], min_score: float = 0.3, holdout: bool = False) -> None:
+        self.exact = {} if holdout else {normalize(text).casefold(): intent for intent, texts in corpus.items() for text in texts}
+        self.grams = [(intent, normalize(text).casefold(), self._bigrams(text)) for intent, texts in corpus.items() for text in texts]
+        self.min_score = min_score
+        self.holdout = holdout
+
+    @staticmethod
+    def _bigrams(text: str) -> frozenset[str]:
+        padded = f" {normalize(text).casefold()} "
+        return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
+
+    def classify(self, text: str) -> tuple[str, float]:
+        intent = self.exact.get(normalize(text).casefold())
+        if intent:
+            return intent, 1.0
+        key = normalize(text).casefold()
+        query = self._bigrams(text)
+        best, score = "FallbackIntent", 0.0
+        for candidate, source, grams in self.grams:
+            if self.holdout and source == key:
+                continue
+            s = len(query & grams) / (len(query | grams) or 1)
+            if s > score:
+                best, score = candidate, s
+        return (best, score) if score >= self.min_score else ("FallbackIntent", score)
+
+
+def serve_stub(port: int, classifier: StubClassifier, latency_ms: float = 0.0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """RecognizeText 응답 형식으로 답하는 stub 서버를 백그라운드 스레드에서 시작합니다 (``port=0``이면 임의 포트)."""
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler 규약
+            parts = [urllib.parse.unquote(p) for p in self.path.strip("/").split("/")]
+            if len(parts) != 9 or parts[0] != "bots" or parts[-1] != "text":
+                self._send(404, {"message": f"not found: {self.path}"})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))) or b"{}")
+            if latency_ms:
+                with rng_lock:
+                    delay = rng.expovariate(1 / latency_ms)
+                time.sleep(delay / 1000)
+            intent, score = classifier.classify(body.get("text", ""))
+            self._send(
+                200,
+                {
+                    "sessionId": parts[7],
+                    "sessionState": {"intent": {"name": intent, "state": "InProgress"}},
+                    "interpretations": [{"intent": {"name": intent}, "nluConfidence": {"score": round(score, 2)}}],
+                    "messages": [],
+                },
+            )
+
+        def _send(self, status: int, payload: dict[str, Any]) -> None:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - 기본 접근 로그는 끕니다.
+            return None
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="lex-stub", daemon=True).start()
+    return server
+
+
+def stub_classifier(sources: list[Path] | None = None, holdout: bool = False) -> StubClassifier:
+    paths = sources or list(DEFAULT_CORPUS)
+    intents = {intent: () for path in paths for intent, _ in read_source(path)}
+    return StubClassifier(build_corpus(paths, intents, ValueTemplater({})), holdout=holdout)
+
+
+# --- entry points ------------------------------------------------------------
+
+
+def run_regression(
+    recognize: Recognize,
+    cases_path: Path = DEFAULT_CASES,
+    concurrency: int = 8,
+    json_out: Path | None = None,
+) -> dict[str, Any]:
+    cases = load_cases(cases_path)
+    if not cases:
+        raise ScriptError(f"테스트 케이스가 없습니다: {cases_path}")
+    started = time.perf_counter()
+    results = asyncio.run(run_cases(cases, recognize, concurrency))
+    summary = summarize(results)
+    summary["elapsedSec"] = round(time.perf_counter() - started, 2)
+    print(format_report(summary))
+    print(f"\n{len(cases)}건 / {summary['elapsedSec']}s (동시 {concurrency})")
+    if json_out:
+        json_out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return summary
+
+
+def regression_after_bootstrap(cfg: dict[str, str], bot_id: str, alias_id: str) -> bool:
+    """bootstrap 이 끝난 alias 로 회귀 테스트를 돌리고 ``REGRESSION_MIN_ACCURACY`` 통과 여부를 돌려줍니다."""
+    summary = run_regression(
+        lex_recognizer(cfg, bot_id, alias_id, cfg["LOCALE_ID"]),
+        Path(cfg.get("REGRESSION_CASES") or DEFAULT_CASES),
+        int(cfg.get("REGRESSION_CONCURRENCY", "8")),
+    )
+    return summary["accuracy"] >= float(cfg.get("REGRESSION_MIN_ACCURACY", "0"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="intent 정확도 회귀 테스트")
+    parser.add_argument("--endpoint", default="lex", help="lex | stub | http(s)://host:port (기본 lex)")
+    parser.add_argument("--cases", type=Path, default=DEFAULT_CASES, help="테스트 케이스 JSON (기본 scripts/seed-testcases.json)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--min-accuracy", type=float, default=0.0, help="정확도가 이보다 낮으면 종료 코드 1")
+    parser.add_argument("--json-out", type=Path, help="요약을 JSON 파일로도 저장")
+    parser.add_argument("--serve-stub", type=int, metavar="PORT", help="stub 서버만 띄우고 종료하지 않습니다.")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="stub 응답 지연 평균 (지수 분포)")
+    parser.add_argument("--stub-corpus", type=Path, nargs="*", help="stub 이 학습할 발화 파일 (기본 docs/utterances-100.md)")
+    parser.add_argument("--prerouter", action="store_true", help="로컬 사전 라우터를 앞에 둡니다 (PREROUTER_THRESHOLD, 케이스별 leave-one-out 학습)")
+    args = parser.parse_args(argv)
+
+    bot_id = os.environ.get("LEX_BOT_ID", "")
+    alias_id = os.environ.get("LEX_BOT_ALIAS_ID", "TSTALIASID")
+    locale_id = os.environ.get("LEX_LOCALE_ID", "ko_KR")
+
+    if args.serve_stub is not None:
+        server = serve_stub(args.serve_stub, stub_classifier(args.stub_corpus), args.stub_latency_ms, host="0.0.0.0")
+        print(f"stub endpoint: http://{server.server_address[0]}:{server.server_address[1]}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    server = None
+    if args.endpoint == "stub":
+        # 회귀 케이스가 stub 코퍼스와 겹치므로 케이스 문장은 빼고 판정합니다 (정확도는 leave-one-out 추정치).
+        server = serve_stub(0, stub_classifier(args.stub_corpus, holdout=True), args.stub_latency_ms)
+        recognize = http_recognizer(f"http://127.0.0.1:{server.server_address[1]}", bot_id or "STUBBOT", alias_id, locale_id)
+    elif args.endpoint.startswith(("http://", "https://")):
+        recognize = http_recognizer(args.endpoint, bot_id or "STUBBOT", alias_id, locale_id)
+    elif args.endpoint == "lex":
+        if not bot_id:
+            raise ScriptError("LEX_BOT_ID 환경변수가 필요합니다 (lex-bootstrap.py 결과의 export 참고).")
+        cfg = {k: v for k, v in os.environ.items() if k.startswith(("AWS_", "REGRESSION_"))}
+        cfg.setdefault("AWS_REGION", "ap-northeast-2")
+        recognize = lex_recognizer(cfg, bot_id, alias_id, locale_id)
+    else:
+        raise ScriptError(f"알 수 없는 endpoint: {args.endpoint}")
+
+    prerouted = None
+    if args.prerouter:
+        bootstrap = load_bootstrap()
+        cfg = bootstrap.get_config()
+        # PREROUTER_MODEL 은 케이스까지 학습했을 수 있어 쓰지 않습니다.
+        router = HeldOutRouter(
+            [text for text, _ in load_cases(args.cases)],
+            *training_data(cfg, bootstrap),
+            threshold=float(cfg.get("PREROUTER_THRESHOLD") or DEFAULT_THRESHOLD),
+        )
+        recognize = prerouted = PreRoutedRecognizer(router, recognize)
+
+    try:
+        summary = run_regression(recognize, args.cases, args.concurrency, args.json_out)
+    finally:
+        if server is not None:
+            server.shutdown()
+    if prerouted is not None:
+        print(format_stats(prerouted.stats.summary()))
+    return 0 if summary["accuracy"] >= args.min_accuracy else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except ScriptError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(1)
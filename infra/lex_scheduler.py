@@ -0,0 +1,115 @@
+"""의존성 기반 작업 스케줄러 (lex-bootstrap.py 공용).
+
+서로 의존하지 않는 upsert/조회 호출을 제한된 스레드 풀에서 동시에 실행합니다.
+작업은 선행 작업이 모두 성공한 뒤에만 시작되며, 결과와 오류는 실행 순서와 관계없이
+``add`` 한 순서대로 반환됩니다.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from lex_client import ScriptError
+
+
+@dataclass
+class TaskResult:
+    name: str
+    value: Any = None
+    error: BaseException | None = None
+    skipped: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+@dataclass
+class _Task:
+    name: str
+    fn: Callable[[], Any]
+    deps: tuple[str, ...]
+    dependents: list[str] = field(default_factory=list)
+
+
+class TaskGraph:
+    def __init__(self) -> None:
+        self._tasks: dict[str, _Task] = {}
+        self._results: dict[str, TaskResult] = {}
+
+    def add(self, name: str, fn: Callable[[], Any], deps: tuple[str, ...] | list[str] = ()) -> str:
+        if name in self._tasks:
+            raise ScriptError(f"중복된 작업 이름: {name}")
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ScriptError(f"작업 {name}의 선행 작업이 없습니다: {dep}")
+            self._tasks[dep].dependents.append(name)
+        self._tasks[name] = _Task(name, fn, tuple(deps))
+        return name
+
+    def value(self, name: str) -> Any:
+        """완료된 작업의 반환값. 작업 함수 안에서 선행 작업 결과를 읽을 때 사용합니다."""
+        result = self._results.get(name)
+        if result is None or not result.ok:
+            raise ScriptError(f"작업 결과가 없습니다: {name}")
+        return result.value
+
+    def run(self, max_workers: int = 4) -> list[TaskResult]:
+        remaining = {name: len(task.deps) for name, task in self._tasks.items()}
+        running: dict[Future, tuple[str, float]] = {}
+
+        def skip(name: str) -> None:
+            if name in self._results:
+                return
+            self._results[name] = TaskResult(name, skipped=True)
+            for child in self._tasks[name].dependents:
+                skip(child)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+
+            def submit_ready() -> None:
+                for name, count in list(remaining.items()):
+                    if count == 0:
+                        del remaining[name]
+                        if name not in self._results:
+                            # contextvars(출력 라우팅 등)를 worker 스레드로 그대로 넘깁니다.
+                            ctx = contextvars.copy_context()
+                            running[pool.submit(ctx.run, self._tasks[name].fn)] = (name, time.monotonic())
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    elapsed = time.monotonic() - started
+                    error = future.exception()
+                    if error is None:
+                        self._results[name] = TaskResult(name, future.result(), elapsed=elapsed)
+                    else:
+                        self._results[name] = TaskResult(name, error=error, elapsed=elapsed)
+                    for child in self._tasks[name].dependents:
+                        if error is not None:
+                            skip(child)
+                            remaining.pop(child, None)
+                        elif child in remaining:
+                            remaining[child] -= 1
+                submit_ready()
+
+        return [self._results[name] for name in self._tasks]
+
+
+def raise_for_errors(results: list[TaskResult]) -> None:
+    """실패한 작업이 있으면 ``add`` 순서대로 모아 하나의 ScriptError로 올립니다."""
+    failed = [r for r in results if r.error is not None]
+    if not failed:
+        return
+    skipped = [r.name for r in results if r.skipped]
+    lines = [f" - {r.name}: {r.error}" for r in failed]
+    if skipped:
+        lines.append(f" - 건너뜀: {', '.join(skipped)}")
+    raise ScriptError("작업 실패:\n" + "\n".join(lines))
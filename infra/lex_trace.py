@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""실행 시간 trace (lex-bootstrap.py ``--trace``).
+
+단계([n/9])마다, AWS 호출(``RetryingBackend.call``)마다, 상태 대기(``wait_all``)마다 wall time 을 기록해
+Chrome trace-event JSON(``chrome://tracing``, Perfetto 에서 열기)과 요약 표로 남깁니다.
+
+- 단계: 같은 스레드에서 다음 단계가 시작되거나 ``end_step()``이 불릴 때까지 (fleet 모드는 봇별 스레드)
+- 호출: 작업 이름, 지연 시간, 재시도 수, 요청/응답 bytes, 실패 코드
+- 대기: label, 최종 상태, polling 횟수, 상태 전이
+
+trace 가 꺼져 있으면(기본) 기록 함수는 아무것도 하지 않습니다.
+
+두 실행 비교::
+
+    python3 infra/lex_trace.py /tmp/lex-trace/old.json /tmp/lex-trace/new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from lex_cache import write_atomic
+
+_STEP_KEY = re.compile(r"^\[(\d+)/9\]")
+
+
+class Tracer:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.origin = clock()
+        self.events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._open_steps: dict[int, tuple[str, float]] = {}
+
+    def now(self) -> float:
+        return self._clock()
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        with self._lock:
+            self._threads.setdefault(tid, thread.name)
+        return tid
+
+    def complete(self, name: str, cat: str, start: float, end: float, tid: int | None = None, **args: Any) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6),
+            "dur": round((end - start) * 1e6),
+            "pid": 1,
+            "tid": self._tid() if tid is None else tid,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def step(self, name: str) -> None:
+        """이 스레드의 이전 단계를 닫고 ``name`` 단계를 시작합니다."""
+        self.end_step()
+        tid = self._tid()
+        with self._lock:
+            self._open_steps[tid] = (name, self.now())
+
+    def end_step(self) -> None:
+        tid = self._tid()
+        with self._lock:
+            current = self._open_steps.pop(tid, None)
+        if current:
+            self.complete(current[0], "step", current[1], self.now(), tid)
+
+    def chrome_trace(self, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        names = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}} for tid, name in threads.items()]
+        return {
+            "traceEvents": names + sorted(events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {**(metadata or {}), "summary": summarize(events)},
+        }
+
+
+_active: Tracer | None = None
+
+
+def start_trace(clock: Callable[[], float] = time.perf_counter) -> Tracer:
+    global _active
+    _active = Tracer(clock)
+    return _active
+
+
+def stop_trace() -> Tracer | None:
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def active() -> Tracer | None:
+    return _active
+
+
+def step(name: str) -> None:
+    if _active is not None:
+        _active.step(name)
+
+
+def end_step() -> None:
+    if _active is not None:
+        _active.end_step()
+
+
+def record_call(label: str, start: float, retries: int, limited: float, bytes_out: int, bytes_in: int, error: str = "") -> None:
+    """``limited``는 호출 속도 제한(token bucket)에서 기다린 초 (지연 시간에 포함)."""
+    tracer = _active
+    if tracer is not None:
+        tracer.complete(
+            label, "aws", start, tracer.now(), retries=retries, limitedMs=round(limited * 1000, 1), bytesOut=bytes_out, bytesIn=bytes_in, error=error
+        )
+
+
+def payload_size(value: Any) -> int:
+    """trace 용 크기 추정 (JSON 직렬화 bytes)."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+# --- 요약 ------------------------------------------------------------------------
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def summarize(events: list[dict[str, Any]]) -> dict[str, Any]:
+    steps = [{"name": e["name"], "tid": e["tid"], "ms": e["dur"] / 1000} for e in events if e["cat"] == "step"]
+    calls: dict[str, list[dict[str, Any]]] = {}
+    for e in events:
+        if e["cat"] == "aws":
+            calls.setdefault(e["name"], []).append(e)
+    ops = {}
+    for label, items in sorted(calls.items(), key=lambda kv: -sum(e["dur"] for e in kv[1])):
+        durations = [e["dur"] / 1000 for e in items]
+        ops[label] = {
+            "count": len(items),
+            "totalMs": round(sum(durations), 1),
+            "p50Ms": round(_pct(durations, 50), 1),
+            "p95Ms": round(_pct(durations, 95), 1),
+            "maxMs": round(max(durations), 1),
+            "limitedMs": round(sum(e["args"].get("limitedMs", 0.0) for e in items), 1),
+            "retries": sum(e["args"].get("retries", 0) for e in items),
+            "errors": sum(bool(e["args"].get("error")) for e in items),
+            "bytesOut": sum(e["args"].get("bytesOut", 0) for e in items),
+            "bytesIn": sum(e["args"].get("bytesIn", 0) for e in items),
+        }
+    waits = [
+        {"name": e["name"], "ms": e["dur"] / 1000, "status": e["args"].get("status", ""), "polls": e["args"].get("polls", 0)}
+        for e in events
+        if e["cat"] == "wait"
+    ]
+    span = (max((e["ts"] + e["dur"] for e in events), default=0) - min((e["ts"] for e in events), default=0)) / 1000
+    return {"wallMs": round(span, 1), "steps": steps, "calls": ops, "waits": waits}
+
+
+def format_summary(summary: dict[str, Any], limit: int = 15) -> str:
+    lines = [f"   전체 {summary['wallMs'] / 1000:.1f}s (limit: 호출 속도 제한 대기, out/in: 요청/응답 bytes)", "", "   단계"]
+    for s in summary["steps"]:
+        lines.append(f"   {s['ms'] / 1000:>8.1f}s  {s['name']}")
+    if summary["calls"]:
+        width = max(len(label) for label in summary["calls"])
+        lines += ["", f"   {'호출':<{width}}  {'count':>5} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8} {'limit':>8} {'retry':>5} {'out':>9} {'in':>9}"]
+        for label, op in list(summary["calls"].items())[:limit]:
+            lines.append(
+                f"   {label:<{width}}  {op['count']:>5} {op['totalMs']:>8.0f}ms {op['p50Ms']:>6.0f}ms {op['p95Ms']:>6.0f}ms {op['maxMs']:>6.0f}ms"
+                f" {op['limitedMs']:>6.0f}ms {op['retries']:>5} {op['bytesOut']:>9} {op['bytesIn']:>9}"
+            )
+        if len(summary["calls"]) > limit:
+            lines.append(f"   ... {len(summary['calls']) - limit}개 작업 더 있음")
+    if summary["waits"]:
+        lines += ["", "   대기"]
+        for w in summary["waits"]:
+            lines.append(f"   {w['ms'] / 1000:>8.1f}s  {w['name']} (status={w['status']}, polls={w['polls']})")
+    return "\n".join(lines)
+
+
+def write_trace(tracer: Tracer, path: Path, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+    data = tracer.chrome_trace(metadata)
+    write_atomic(path, json.dumps(data, ensure_ascii=False))
+    return data["otherData"]["summary"]
+
+
+def trace_path(cfg: dict[str, str], explicit: str = "") -> Path:
+    if explicit:
+        return Path(explicit)
+    name = re.sub(r"[^0-9A-Za-z._-]", "_", f"{cfg['AWS_REGION']}_{cfg['BOT_NAME']}")
+    root = Path(cfg.get("TRACE_DIR") or Path(cfg.get("TMP_DIR", "/tmp")) / "lex-trace")
+    now = time.time()
+    return root / f"{name}_{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}.json"
+
+
+# --- 비교 ------------------------------------------------------------------------
+
+
+def _step_totals(summary: dict[str, Any]) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for s in summary["steps"]:
+        match = _STEP_KEY.match(s["name"])
+        key = f"[{match.group(1)}/9]" if match else s["name"]
+        out[key] = out.get(key, 0.0) + s["ms"]
+    return out
+
+
+def compare(old: dict[str, Any], new: dict[str, Any], limit: int = 10) -> str:
+    labels = sorted(set(old["calls"]) | set(new["calls"]), key=lambda k: -new["calls"].get(k, {}).get("totalMs", 0.0))[:limit]
+    width = max([12, *(len(label) for label in labels)])
+
+    def row(name: str, a: float, b: float) -> str:
+        return f"   {name:<{width}} {a / 1000:>8.1f}s {b / 1000:>8.1f}s {(b - a) / 1000:>+8.1f}s"
+
+    lines = [f"   {'':<{width}} {'before':>9} {'after':>9} {'delta':>9}", row("total", old["wallMs"], new["wallMs"])]
+    a_steps, b_steps = _step_totals(old), _step_totals(new)
+    for key in sorted(set(a_steps) | set(b_steps), key=lambda k: int(_STEP_KEY.match(k).group(1)) if _STEP_KEY.match(k) else 99):
+        lines.append(row(key, a_steps.get(key, 0.0), b_steps.get(key, 0.0)))
+    lines.append("")
+    for label in labels:
+        a, b = old["calls"].get(label, {}), new["calls"].get(label, {})
+        lines.append(row(label, a.get("totalMs", 0.0), b.get("totalMs", 0.0)) + f"  ({a.get('count', 0)} → {b.get('count', 0)}회)")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="lex-bootstrap trace 요약/비교")
+    parser.add_argument("traces", nargs="+", type=Path, help="trace JSON (하나면 요약, 둘이면 비교)")
+    args = parser.parse_args(argv)
+    summaries = [json.loads(p.read_text(encoding="utf-8"))["otherData"]["summary"] for p in args.traces]
+    if len(summaries) == 1:
+        print(format_summary(summaries[0]))
+    else:
+        print(compare(summaries[0], summaries[-1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""샘플 발화 코퍼스 수집 (``docs/utterances-100.md``, ``scripts/seed-testcases.json``).
+
+``UTTERANCE_SOURCES``에 지정한 파일들에서 intent 별 발화를 읽어 정규화/중복 제거한 뒤,
+slot type 값 인덱스로 알려진 값(지점/과정)을 ``{Branch}``/``{CourseName}`` 참조로 바꿉니다.
+
+- Markdown: ``## <IntentName>`` 제목 아래의 목록 항목 (``1. 발화`` 또는 ``- 발화``)
+- JSON    : ``[{"text": "...", "expectedIntent": "..."}]`` (회귀 테스트 케이스 형식)
+
+같은 발화가 여러 intent 에 붙어 있으면 먼저 나온 쪽만 남기고 경고합니다 (Lex 가 혼동하지 않도록).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from lex_catalog import SlotValue, split_csv
+from lex_client import ScriptError
+
+# Lex V2 intent 당 샘플 발화 한도
+MAX_UTTERANCES = 1500
+
+_HEADING = re.compile(r"^##\s+(\w+)\s*$")
+_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*])\s+(.+?)\s*$")
+# 발화에 남길 문자: 단어/공백/slot 참조 중괄호/시각·번호에 쓰이는 ':' '-' '''
+_PUNCT = re.compile(r"[^\w\s{}:'-]")
+
+
+@dataclass
+class CorpusStats:
+    read: int = 0
+    duplicates: int = 0
+    conflicts: int = 0
+    templated: int = 0
+    per_intent: dict[str, int] = field(default_factory=dict)
+
+
+def normalize(text: str) -> str:
+    """문장 부호를 빼고 공백을 하나로 합칩니다 (``"예약 가능해요?"`` → ``"예약 가능해요"``)."""
+    return " ".join(_PUNCT.sub(" ", text).split())
+
+
+def _key(text: str) -> str:
+    return text.casefold()
+
+
+def read_markdown(path: Path) -> Iterator[tuple[str, str]]:
+    intent = ""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            heading = _HEADING.match(line)
+            if heading:
+                intent = heading.group(1)
+                continue
+            item = _ITEM.match(line)
+            if intent and item:
+                yield intent, item.group(1)
+
+
+def read_testcases(path: Path) -> Iterator[tuple[str, str]]:
+    try:
+        cases = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise ScriptError(f"{path}: JSON 형식 오류 ({exc})") from exc
+    for case in cases:
+        if case.get("text") and case.get("expectedIntent"):
+            yield case["expectedIntent"], case["text"]
+
+
+def read_source(path: Path) -> Iterator[tuple[str, str]]:
+    if not path.is_file():
+        raise ScriptError(f"발화 파일을 찾을 수 없습니다: {path}")
+    if path.suffix.lower() == ".json":
+        return read_testcases(path)
+    return read_markdown(path)
+
+
+class ValueTemplater:
+    """slot 값/동의어 → slot 이름 인덱스를 한 번 만들어 두고 발화의 값을 ``{Slot}``로 바꿉니다.
+
+    긴 값부터 맞추고(``영어회화``가 ``회화``보다 먼저), 공백으로 구분된 단어 전체만 바꿉니다
+    (``토익반``처럼 붙어 있는 말은 그대로 둡니다). slot 하나는 발화당 한 번만 참조합니다.
+    """
+
+    def __init__(self, slot_values: dict[str, Iterable[str | SlotValue]]) -> None:
+        self.index: dict[str, str] = {}
+        for slot, values in slot_values.items():
+            for item in values:
+                value, synonyms = (item, ()) if isinstance(item, str) else item
+                for word in (value, *synonyms):
+                    self.index.setdefault(_key(normalize(word)), slot)
+        words = sorted((w for w in self.index if w), key=len, reverse=True)
+        self._pattern = (
+            re.compile(r"(?<!\S)(" + "|".join(re.escape(w) for w in words) + r")(?!\S)", re.IGNORECASE) if words else None
+        )
+
+    def apply(self, text: str, slots: Iterable[str]) -> str:
+        allowed = set(slots)
+        if self._pattern is None or not allowed:
+            return text
+        used: set[str] = set()
+
+        def replace(match: re.Match[str]) -> str:
+            slot = self.index[_key(match.group(1))]
+            if slot not in allowed or slot in used:
+                return match.group(1)
+            used.add(slot)
+            return "{" + slot + "}"
+
+        return self._pattern.sub(replace, text)
+
+
+def build_corpus(
+    sources: Iterable[Path],
+    intent_slots: dict[str, tuple[str, ...]],
+    templater: ValueTemplater,
+    stats: CorpusStats | None = None,
+) -> dict[str, tuple[str, ...]]:
+    """intent 이름 → 정규화/템플릿 적용/중복 제거된 발화. ``intent_slots``에 없는 intent 는 건너뜁니다."""
+    stats = stats if stats is not None else CorpusStats()
+    out: dict[str, list[str]] = {name: [] for name in intent_slots}
+    owner: dict[str, str] = {}
+    for path in sources:
+        for intent, raw in read_source(path):
+            if intent not in intent_slots:
+                continue
+            stats.read += 1
+            text = normalize(raw)
+            if not text:
+                continue
+            templated = templater.apply(text, intent_slots[intent])
+            if templated != text:
+                stats.templated += 1
+            key = _key(templated)
+            if key in owner:
+                if owner[key] == intent:
+                    stats.duplicates += 1
+                else:
+                    stats.conflicts += 1
+                    print(f" - (경고) '{templated}'가 {owner[key]}/{intent}에 모두 있어 {owner[key]}만 남깁니다 ({path})", file=sys.stderr)
+                continue
+            owner[key] = intent
+            out[intent].append(templated)
+    for intent, utterances in out.items():
+        if len(utterances) > MAX_UTTERANCES:
+            raise ScriptError(f"{intent}: 샘플 발화가 {len(utterances)}개로 한도({MAX_UTTERANCES})를 넘습니다.")
+        stats.per_intent[intent] = len(utterances)
+    return {intent: tuple(utterances) for intent, utterances in out.items()}
+
+
+def utterance_sources(cfg: dict[str, str], root: Path) -> list[Path]:
+    """``UTTERANCE_SOURCES`` (쉼표 구분). 상대 경로는 저장소 루트 기준입니다."""
+    return [p if p.is_absolute() else root / p for p in map(Path, split_csv(cfg.get("UTTERANCE_SOURCES", "")))]
+
+
+def load_corpus(
+    cfg: dict[str, str],
+    root: Path,
+    intent_slots: dict[str, tuple[str, ...]],
+    slot_values: dict[str, Iterable[str | SlotValue]],
+) -> dict[str, tuple[str, ...]] | None:
+    """설정된 발화 소스가 없으면 ``None``."""
+    sources = utterance_sources(cfg, root)
+    if not sources:
+        return None
+    stats = CorpusStats()
+    corpus = build_corpus(sources, intent_slots, ValueTemplater(slot_values), stats)
+    counts = " ".join(f"{name}={count}" for name, count in stats.per_intent.items())
+    print(
+        f" - 발화 코퍼스: 읽음={stats.read} 중복={stats.duplicates} 충돌={stats.conflicts} 템플릿={stats.templated} ({counts})",
+        file=sys.stderr,
+    )
+    return corpus
@@ -0,0 +1,165 @@
+"""상태 대기(waiter) 유틸리티.
+
+고정 간격 polling 대신 지수 backoff + jitter로 describe 호출 간격을 늘려 가며,
+여러 리소스(bot, locale, alias 등)를 하나의 루프에서 같은 시간/호출 예산으로 기다립니다.
+대기마다 polling 횟수와 소요 시간을 기록해 기본값 조정에 쓸 수 있게 합니다.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+import lex_trace
+from lex_client import ScriptError
+
+
+@dataclass(frozen=True)
+class WaitPolicy:
+    # 첫 polling 은 즉시 하고, 그다음은 first_delay 후 (빠른 전이를 놓치지 않도록)
+    first_delay: float = 0.5
+    initial: float = 1.0
+    max_interval: float = 8.0
+    multiplier: float = 1.7
+    jitter: float = 0.2
+    # 그룹 전체 describe 호출 한도 (0 이면 timeout 만 적용)
+    max_polls: int = 0
+
+    def delays(self, rng: random.Random) -> Iterator[float]:
+        if self.first_delay > 0:
+            yield self.first_delay
+        delay = self.initial
+        while True:
+            yield min(self.max_interval, delay) * rng.uniform(1 - self.jitter, 1 + self.jitter)
+            delay *= self.multiplier
+
+
+# bot/alias/locale 생성처럼 수 초 안에 끝나는 전이
+QUICK = WaitPolicy()
+# locale build 처럼 수 분 걸리는 전이
+BUILD = WaitPolicy(first_delay=2.0, initial=5.0, max_interval=30.0)
+
+
+@dataclass(frozen=True)
+class Watch:
+    label: str
+    poll: Callable[[], str]
+    ok: frozenset[str] | set[str]
+    fail: frozenset[str] | set[str] = frozenset({"Failed"})
+
+
+@dataclass
+class WaitStats:
+    label: str
+    status: str = "Unknown"
+    polls: int = 0
+    elapsed: float = 0.0
+    # (경과 초, 새 상태) — 상태가 바뀐 시점만 기록
+    transitions: list[tuple[float, str]] = field(default_factory=list)
+
+
+_stats: list[WaitStats] = []
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+
+def recorded_stats() -> list[WaitStats]:
+    with _stats_lock:
+        return list(_stats)
+
+
+@contextmanager
+def collect_stats() -> Iterator[list[WaitStats]]:
+    """이 스레드에서 끝난 대기의 통계만 따로 모읍니다 (fleet 모드에서 봇별 집계용)."""
+    sink: list[WaitStats] = []
+    previous = getattr(_local, "sink", None)
+    _local.sink = sink
+    try:
+        yield sink
+    finally:
+        _local.sink = previous
+
+
+def format_stats(stats: list[WaitStats]) -> str:
+    if not stats:
+        return "   (대기 없음)"
+    width = max(len(s.label) for s in stats)
+    lines = [f"   {'label':<{width}}  {'status':<12} {'polls':>5} {'elapsed':>9}"]
+    for s in stats:
+        lines.append(f"   {s.label:<{width}}  {s.status:<12} {s.polls:>5} {s.elapsed:>8.1f}s")
+    return "\n".join(lines)
+
+
+def wait_all(
+    watches: list[Watch],
+    timeout: float,
+    policy: WaitPolicy = QUICK,
+    *,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+    rng: random.Random | None = None,
+) -> dict[str, str]:
+    """모든 ``watches``가 ok 상태가 될 때까지 한 루프에서 기다립니다.
+
+    하나라도 fail 상태가 되면 즉시 ScriptError를 올립니다. 반환값은 label → 최종 상태.
+    """
+    rng = rng or random.Random()
+    started = clock()
+    tracer = lex_trace.active()
+    traced_start = tracer.now() if tracer else 0.0
+    stats = {w.label: WaitStats(w.label) for w in watches}
+    pending = {w.label: w for w in watches}
+    polls = 0
+    delays = policy.delays(rng)
+    for w in watches:
+        print(f" - {w.label} 대기", file=sys.stderr)
+
+    def finish() -> None:
+        now = clock() - started
+        for s in stats.values():
+            if s.elapsed == 0.0:
+                s.elapsed = now
+        done = [stats[w.label] for w in watches]
+        if tracer:
+            for s in done:
+                tracer.complete(s.label, "wait", traced_start, traced_start + s.elapsed, status=s.status, polls=s.polls, transitions=s.transitions)
+        with _stats_lock:
+            _stats.extend(done)
+        sink = getattr(_local, "sink", None)
+        if sink is not None:
+            sink.extend(done)
+
+    try:
+        while True:
+            for label, watch in list(pending.items()):
+                status = watch.poll() or "Unknown"
+                polls += 1
+                s = stats[label]
+                s.polls += 1
+                elapsed = clock() - started
+                if status != s.status:
+                    s.transitions.append((elapsed, status))
+                s.status = status
+                prefix = f"{label}: " if len(watches) > 1 else ""
+                print(f"   * {prefix}status={status} ({elapsed:.1f}s)", file=sys.stderr)
+                if status in watch.fail:
+                    raise ScriptError(f"{label} 실패(status={status})")
+                if status in watch.ok:
+                    s.elapsed = elapsed
+                    del pending[label]
+            if not pending:
+                return {label: s.status for label, s in stats.items()}
+
+            if policy.max_polls and polls >= policy.max_polls:
+                raise ScriptError(f"Polling 한도 초과({polls}회): {', '.join(pending)} 대기 실패")
+            remaining = timeout - (clock() - started)
+            if remaining <= 0:
+                raise ScriptError(f"Timed out: {', '.join(pending)} 대기 실패")
+            sleep(min(next(delays), remaining))
+    finally:
+        finish()
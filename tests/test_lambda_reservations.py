@@ -0,0 +1,125 @@
+"""API Lambda(``.hello_api_build/lambda_function.py``) 의 SQS 예약 적재를 로컬 SQLite 로 확인합니다.
+
+    python3 -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+HANDLER_PATH = Path(__file__).resolve().parent.parent / ".hello_api_build" / "lambda_function.py"
+
+
+def load_handler():
+    spec = importlib.util.spec_from_file_location("hello_api_lambda_function", HANDLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def record(message_id, **body):
+    reservation = {
+        "reservationId": "R-ABC123",
+        "branch": "강남점",
+        "course": "토익",
+        "date": "2026-04-10",
+        "time": "19:30",
+        "name": "홍길동",
+        "phone": "010-1234-5678",
+        **body,
+    }
+    return {"messageId": message_id, "eventSource": "aws:sqs", "body": json.dumps(reservation, ensure_ascii=False)}
+
+
+class ReservationIngestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "reservations.sqlite3"
+        self.handler = load_handler()
+        self.handler.RESERVATION_DB = f"sqlite:///{self.db_path}"
+        self.handler.reset_db()
+
+    def tearDown(self):
+        self.handler.reset_db()
+        self.tmp.cleanup()
+
+    def invoke(self, records):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            response = self.handler.lambda_handler({"Records": records}, None)
+        logs = [json.loads(line) for line in out.getvalue().splitlines() if line.strip()]
+        return response, logs
+
+    def failed_ids(self, response):
+        return sorted(item["itemIdentifier"] for item in response["batchItemFailures"])
+
+    def rows(self):
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
+            return conn.execute("SELECT reservation_id, message_id FROM reservations ORDER BY reservation_id").fetchall()
+
+    def summary(self, logs):
+        return next(entry for entry in logs if entry["message"] == "예약 적재")
+
+    def test_mixed_batch_reports_only_bad_records(self):
+        records = [
+            record("m1", reservationId="R-AAAA01"),
+            record("m2", reservationId="bad-id"),
+            record("m3", reservationId="R-AAAA03", phone=""),
+            {"messageId": "m4", "body": "{not json"},
+            record("m5", reservationId="r-aaaa05"),
+        ]
+        response, logs = self.invoke(records)
+        self.assertEqual(self.failed_ids(response), ["m2", "m3", "m4"])
+        self.assertEqual(self.rows(), [("R-AAAA01", "m1"), ("R-AAAA05", "m5")])
+        self.assertEqual(self.summary(logs)["inserted"], 2)
+
+    def test_redelivered_batch_does_not_duplicate(self):
+        records = [record("m1", reservationId="R-BBBB01"), record("m2", reservationId="R-BBBB02")]
+        first, first_logs = self.invoke(records)
+        again, again_logs = self.invoke(records)
+        self.assertEqual(first["batchItemFailures"], [])
+        self.assertEqual(again["batchItemFailures"], [])
+        self.assertEqual(self.rows(), [("R-BBBB01", "m1"), ("R-BBBB02", "m2")])
+        self.assertEqual(self.summary(first_logs)["inserted"], 2)
+        self.assertEqual(self.summary(again_logs)["inserted"], 0)
+
+    def test_data_error_falls_back_to_row_by_row(self):
+        # executemany 가 IntegrityError 로 실패하도록 특정 지점 INSERT 를 막습니다.
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
+            conn.executescript(
+                self.handler.SQLITE_SCHEMA.rstrip() + ";"
+                + """
+                CREATE TRIGGER reject_closed_branch BEFORE INSERT ON reservations
+                WHEN NEW.branch = '폐점'
+                BEGIN SELECT RAISE(ABORT, 'closed branch'); END;
+                """
+            )
+        records = [
+            record("m1", reservationId="R-CCCC01"),
+            record("m2", reservationId="R-CCCC02", branch="폐점"),
+            record("m3", reservationId="R-CCCC03"),
+        ]
+        response, logs = self.invoke(records)
+        self.assertEqual(self.failed_ids(response), ["m2"])
+        self.assertEqual(self.rows(), [("R-CCCC01", "m1"), ("R-CCCC03", "m3")])
+        self.assertTrue(any(entry["message"].startswith("배치 INSERT 실패") for entry in logs))
+        self.assertEqual(self.summary(logs)["inserted"], 2)
+
+    def test_record_without_message_id_is_skipped(self):
+        missing = record("", reservationId="R-DDDD01")
+        del missing["messageId"]
+        response, logs = self.invoke([missing, record("m2", reservationId="R-DDDD02")])
+        self.assertEqual(response["batchItemFailures"], [])
+        self.assertEqual(self.rows(), [("R-DDDD02", "m2")])
+        self.assertEqual(self.summary(logs)["skipped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""API Lambda(``.hello_api_build/lambda_function.py``) 의 HTTP 라우트와 캐시/압축 헤더를 확인합니다.
+
+    python3 -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+HANDLER_PATH = Path(__file__).resolve().parent.parent / ".hello_api_build" / "lambda_function.py"
+
+# gzip 본이 만들어지도록(GZIP_MIN_BYTES 이상) 캠퍼스를 넉넉히 둡니다.
+CAMPUSES = [
+    {"id": f"campus-{n}", "name": f"{name}점", "address": f"서울시 {name}구 {n}번길"}
+    for n, name in enumerate(["강남", "홍대", "잠실", "분당", "인천", "신촌", "역삼", "선릉"])
+]
+
+
+def load_handler():
+    spec = importlib.util.spec_from_file_location("hello_api_lambda_function", HANDLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rest_event(method, path, headers=None, query=None):
+    """REST API(v1) proxy 이벤트."""
+    return {"httpMethod": method, "path": path, "headers": headers or {}, "queryStringParameters": query}
+
+
+def http_event(method, path, headers=None, query=None):
+    """HTTP API / function URL(v2) 이벤트."""
+    return {"rawPath": path, "requestContext": {"http": {"method": method}}, "headers": headers or {}, "queryStringParameters": query}
+
+
+class RouteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        catalog = Path(cls.tmp.name) / "campusLocations.json"
+        catalog.write_text(json.dumps(CAMPUSES, ensure_ascii=False), encoding="utf-8")
+        env = {"CATALOG_PATH": str(catalog), "COURSE_VALUES": "토익,오픽,영어회화"}
+        with mock.patch.dict(os.environ, env):
+            cls.handler = load_handler()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def call(self, event):
+        return self.handler.lambda_handler(event, None)
+
+    def body(self, response):
+        raw = response["body"]
+        if response.get("isBase64Encoded"):
+            raw = gzip.decompress(base64.b64decode(raw)).decode("utf-8")
+        return json.loads(raw)
+
+    def test_route_table(self):
+        cases = [
+            (rest_event("GET", "/hello"), 200),
+            (http_event("GET", "/api/hello"), 200),
+            (rest_event("GET", "/catalog/branches"), 200),
+            (http_event("GET", "/api/catalog/courses/"), 200),
+            (rest_event("GET", "/suggestions", query={"slot": "Branch"}), 200),
+            (rest_event("GET", "/catalog/teachers"), 404),
+            (rest_event("GET", "/nothing"), 404),
+            (rest_event("POST", "/catalog/branches"), 405),
+        ]
+        for event, status in cases:
+            with self.subTest(path=event.get("path") or event.get("rawPath"), method=event.get("httpMethod")):
+                self.assertEqual(self.call(event)["statusCode"], status)
+        self.assertEqual(self.call(rest_event("DELETE", "/hello"))["headers"]["Allow"], "GET, HEAD")
+
+    def test_route_bodies(self):
+        hello = self.body(self.call(http_event("GET", "/hello")))
+        self.assertEqual((hello["method"], hello["path"]), ("GET", "/hello"))
+        self.assertEqual(self.body(self.call(rest_event("GET", "/catalog/branches")))["items"], CAMPUSES)
+        self.assertEqual([c["name"] for c in self.body(self.call(rest_event("GET", "/catalog/courses")))["items"]], ["토익", "오픽", "영어회화"])
+        branch = self.body(self.call(rest_event("GET", "/suggestions", query={"slot": "Branch"})))
+        self.assertEqual(branch["suggestions"], [c["name"] for c in CAMPUSES])
+        unknown = self.body(self.call(rest_event("GET", "/suggestions", query={"slot": "Teacher"})))
+        self.assertEqual(unknown, {"slot": "Teacher", "suggestions": []})
+
+    def test_etag_revalidation_returns_304(self):
+        first = self.call(rest_event("GET", "/catalog/courses"))
+        etag = first["headers"]["ETag"]
+        for tag in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(if_none_match=tag):
+                again = self.call(rest_event("GET", "/catalog/courses", {"If-None-Match": tag}))
+                self.assertEqual(again["statusCode"], 304)
+                self.assertEqual(again["body"], "")
+                self.assertEqual(again["headers"]["ETag"], etag)
+                self.assertNotIn("Content-Type", again["headers"])
+        stale = self.call(rest_event("GET", "/catalog/courses", {"If-None-Match": '"stale"'}))
+        self.assertEqual(stale["statusCode"], 200)
+
+    def test_404_is_never_revalidated(self):
+        response = self.call(rest_event("GET", "/nothing", {"If-None-Match": "*"}))
+        self.assertEqual(response["statusCode"], 404)
+        self.assertEqual(response["headers"]["Cache-Control"], "no-store")
+
+    def test_head_has_headers_but_no_body(self):
+        get = self.call(rest_event("GET", "/catalog/branches", {"Accept-Encoding": "gzip"}))
+        head = self.call(rest_event("HEAD", "/catalog/branches", {"Accept-Encoding": "gzip"}))
+        self.assertEqual(head["statusCode"], 200)
+        self.assertEqual(head["body"], "")
+        self.assertFalse(head["isBase64Encoded"])
+        self.assertEqual(head["headers"], get["headers"])
+
+    def test_gzip_response_is_base64_encoded(self):
+        response = self.call(http_event("GET", "/catalog/branches", {"accept-encoding": "gzip, deflate, br"}))
+        self.assertEqual(response["headers"]["Content-Encoding"], "gzip")
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual(self.body(response)["items"], CAMPUSES)
+        plain = self.call(http_event("GET", "/catalog/branches"))
+        self.assertNotIn("Content-Encoding", plain["headers"])
+        self.assertFalse(plain["isBase64Encoded"])
+        self.assertEqual(plain["headers"]["ETag"], response["headers"]["ETag"])
+        self.assertEqual(plain["headers"]["Vary"], "Accept-Encoding")
+
+    def test_small_bodies_are_not_compressed(self):
+        response = self.call(rest_event("GET", "/catalog/courses", {"Accept-Encoding": "gzip"}))
+        self.assertNotIn("Content-Encoding", response["headers"])
+        self.assertFalse(response["isBase64Encoded"])
+
+    def test_accept_encoding_negotiation(self):
+        cases = [
+            ("gzip", True),
+            ("GZIP", True),
+            ("gzip;q=0.5, br", True),
+            ("*", True),
+            ("*;q=0, gzip", True),
+            ("gzip, *;q=0", True),
+            ("gzip;q=0, *", False),
+            ("gzip;q=0.0", False),
+            ("br;q=1, *;q=0", False),
+            ("identity", False),
+            ("", False),
+            (None, False),
+        ]
+        for header, expected in cases:
+            with self.subTest(accept_encoding=header):
+                self.assertIs(self.handler.accepts_gzip(header), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""AWS 호출 재시도 정책(``infra/lex_client.py``)을 fake 백엔드로 확인합니다.
+
+    python3 -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "infra"))
+
+from lex_client import AwsCallError, AwsRequest, FakeBackend, RetryingBackend, is_retryable  # noqa: E402
+
+# (오류 코드, 작업, 재시도 여부)
+RETRY_TABLE = [
+    ("ThrottlingException", "describe-bot", True),
+    ("TooManyRequestsException", "update-slot-type", True),
+    ("Throttling", "get-role", True),
+    ("ConflictException", "build-bot-locale", True),
+    ("PreconditionFailedException", "update-intent", True),
+    ("InternalServerException", "list-intents", True),
+    ("ServiceUnavailableException", "describe-bot-locale", True),
+    ("RequestTimeout", "update-bot-alias", True),
+    # create-* 는 요청이 처리되기 전에 거절된 throttle 만 다시 보냅니다.
+    ("ThrottlingException", "create-bot-version", True),
+    ("TooManyRequestsException", "create-slot", True),
+    ("ConflictException", "create-intent", False),
+    ("InternalServerException", "create-bot", False),
+    ("RequestTimeoutException", "create-slot-type", False),
+    # quota 초과/입력 오류/권한 오류는 기다려도 풀리지 않습니다.
+    ("LimitExceededException", "update-intent", False),
+    ("ServiceQuotaExceededException", "create-bot-version", False),
+    ("ValidationException", "update-slot", False),
+    ("ResourceNotFoundException", "describe-bot", False),
+    ("AccessDeniedException", "list-bots", False),
+    ("", "describe-bot", False),
+]
+
+
+def call_error(code: str, operation: str) -> AwsCallError:
+    return AwsCallError(f"{operation} 실패", code=code, operation=f"lexv2-models {operation}")
+
+
+class IsRetryableTest(unittest.TestCase):
+    def test_table(self):
+        for code, operation, expected in RETRY_TABLE:
+            with self.subTest(code=code, operation=operation):
+                self.assertIs(is_retryable(call_error(code, operation), operation), expected)
+
+    def test_operation_defaults_to_non_create(self):
+        self.assertTrue(is_retryable(call_error("ConflictException", "create-intent")))
+
+
+class FlakyHandler:
+    """처음 ``failures``번은 ``code`` 오류로 실패하고 그 다음부터 성공합니다."""
+
+    def __init__(self, code: str, failures: int) -> None:
+        self.code = code
+        self.failures = failures
+
+    def __call__(self, request: AwsRequest):
+        if self.failures > 0:
+            self.failures -= 1
+            raise call_error(self.code, request.operation)
+        return {"ok": True}
+
+
+class RetryingBackendTest(unittest.TestCase):
+    def make_backend(self, code: str, failures: int, max_attempts: int = 5):
+        self.now = 0.0
+        self.sleeps = []
+
+        def sleep(seconds: float) -> None:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        fake = FakeBackend(handler=FlakyHandler(code, failures))
+        # 지연(jitter)은 0, 버킷은 초당 10개/burst 10 으로 두어 throttle 후 drain 때문에 생기는 대기만 보이게 합니다.
+        backend = RetryingBackend(
+            fake, max_attempts=max_attempts, base_delay=0.0, read_rate=10.0, write_rate=10.0, sleep=sleep, clock=lambda: self.now
+        )
+        return fake, backend
+
+    def call(self, backend, operation="describe-bot"):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return backend.call(AwsRequest("lexv2-models", operation, {"bot-id": "B1"}))
+
+    def bucket_waits(self):
+        return [round(s, 6) for s in self.sleeps if s > 0]
+
+    def test_throttles_are_retried_counted_and_drain_the_bucket(self):
+        fake, backend = self.make_backend("ThrottlingException", failures=2)
+        self.assertEqual(self.call(backend), {"ok": True})
+        self.assertEqual(len(fake.calls), 3)
+        counter = backend.counters()["lexv2-models describe-bot"]
+        self.assertEqual((counter.calls, counter.retries, counter.throttles, counter.errors), (3, 2, 2, 0))
+        # burst 가 10 이라 drain 이 없으면 기다리지 않습니다. throttle 마다 토큰을 비웠으므로 토큰 하나(0.1초)씩 기다립니다.
+        self.assertEqual(self.bucket_waits(), [0.1, 0.1])
+
+    def test_other_retryable_errors_do_not_drain(self):
+        fake, backend = self.make_backend("ConflictException", failures=2)
+        self.assertEqual(self.call(backend, "update-intent"), {"ok": True})
+        counter = backend.counters()["lexv2-models update-intent"]
+        self.assertEqual((counter.calls, counter.retries, counter.throttles, counter.errors), (3, 2, 0, 0))
+        self.assertEqual(self.bucket_waits(), [])
+
+    def test_create_is_not_retried_on_conflict(self):
+        fake, backend = self.make_backend("ConflictException", failures=1)
+        with self.assertRaises(AwsCallError):
+            self.call(backend, "create-intent")
+        counter = backend.counters()["lexv2-models create-intent"]
+        self.assertEqual((counter.calls, counter.retries, counter.errors), (1, 0, 1))
+
+    def test_gives_up_after_max_attempts(self):
+        fake, backend = self.make_backend("ThrottlingException", failures=10, max_attempts=3)
+        with self.assertRaises(AwsCallError) as ctx:
+            self.call(backend)
+        self.assertEqual(ctx.exception.code, "ThrottlingException")
+        counter = backend.counters()["lexv2-models describe-bot"]
+        self.assertEqual((counter.calls, counter.retries, counter.throttles, counter.errors), (3, 2, 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
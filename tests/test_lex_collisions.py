@@ -0,0 +1,62 @@
+"""발화 충돌 검사(``infra/lex_collisions.py``)의 결과와 처리 시간을 확인합니다.
+
+    python3 -m pytest -q tests
+    LEX_SLOW_TESTS=1 python3 -m pytest -q tests/test_lex_collisions.py   # 발화 3만 개 시간 검사 포함
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "infra"))
+
+from lex_collisions import _numpy_available, bench, find_collisions, synthetic_corpus  # noqa: E402
+
+# 발화 수만 개를 build 전에 검사할 수 있어야 합니다. 1코어 Xeon 에서 약 9초라 여유를 크게 둡니다.
+LARGE_CORPUS = 30_000
+LARGE_CORPUS_MAX_SECONDS = 60.0
+
+
+def pair_keys(collisions):
+    return {(c.intent_a, c.text_a, c.intent_b, c.text_b, round(c.score, 4)) for c in collisions}
+
+
+class FindCollisionsTest(unittest.TestCase):
+    def test_reports_cross_intent_collision_and_duplicate(self):
+        corpus = {
+            "CheckReservation": ["예약 조회해줘", "내 예약 확인"],
+            "CancelReservation": ["예약 조회해줘요", "예약 취소"],
+            "Help": ["도움말", "도움말 보여줘"],
+        }
+        found = find_collisions(corpus, threshold=0.7)
+        kinds = {(c.kind, c.intent_a, c.intent_b) for c in found}
+        self.assertIn(("collision", "CheckReservation", "CancelReservation"), kinds)
+        self.assertFalse(any(c.intent_a == "Help" and c.intent_b != "Help" for c in found))
+
+    def test_synthetic_corpus_is_reproducible(self):
+        self.assertEqual(synthetic_corpus(500, seed=3), synthetic_corpus(500, seed=3))
+        self.assertNotEqual(synthetic_corpus(500, seed=3), synthetic_corpus(500, seed=4))
+        self.assertEqual(sum(len(texts) for texts in synthetic_corpus(1234).values()), 1234)
+
+    @unittest.skipUnless(_numpy_available(), "NumPy 없음")
+    def test_numpy_and_python_paths_agree(self):
+        corpus = synthetic_corpus(1500, seed=1)
+        for threshold in (0.4, 0.6):
+            with self.subTest(threshold=threshold):
+                numpy_pairs = find_collisions(corpus, threshold, block=128, use_numpy=True)
+                python_pairs = find_collisions(corpus, threshold, use_numpy=False)
+                self.assertTrue(python_pairs)
+                self.assertEqual(pair_keys(numpy_pairs), pair_keys(python_pairs))
+
+    @unittest.skipUnless(os.environ.get("LEX_SLOW_TESTS") == "1", "LEX_SLOW_TESTS=1 일 때만 실행")
+    @unittest.skipUnless(_numpy_available(), "NumPy 없음")
+    def test_tens_of_thousands_of_utterances(self):
+        elapsed, _ = bench(LARGE_CORPUS)
+        self.assertLess(elapsed, LARGE_CORPUS_MAX_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""선언적 봇 모델과 DRAFT 스냅샷 비교(``infra/lex_plan.py``)를 AWS 없이 확인합니다.
+
+    python3 -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "infra"))
+
+from lex_catalog import value_diff  # noqa: E402
+from lex_plan import (  # noqa: E402
+    BotModel,
+    DraftSnapshot,
+    IntentSpec,
+    SlotSpec,
+    SlotTypeSpec,
+    apply_plan,
+    definition_hash,
+    diff,
+    differs,
+    make_slot_type_values,
+)
+
+LOCALE_ARGS = ["--bot-id", "B1", "--bot-version", "DRAFT", "--locale-id", "ko_KR"]
+
+
+def make_model(branches=("강남점", "홍대점"), branch_prompt="어느 지점으로 예약할까요?") -> BotModel:
+    slots = (
+        SlotSpec("Branch", "BranchType", branch_prompt, custom=True),
+        SlotSpec("Date", "AMAZON.Date", "희망 날짜를 알려주세요."),
+    )
+    return BotModel(
+        slot_types=(SlotTypeSpec("BranchType", "학원 지점", tuple(branches)),),
+        intents=(
+            IntentSpec("MakeReservation", "상담 예약", ("{Branch} 예약할래요", "예약하고 싶어요"), slots=slots, fulfillment_code_hook=True),
+        ),
+    )
+
+
+def make_snapshot(model: BotModel, skip_slots=()) -> DraftSnapshot:
+    """``model`` 그대로 배포된 DRAFT 를 흉내 냅니다 (서버가 채우는 필드 포함)."""
+    snapshot = DraftSnapshot()
+    type_ids = {}
+    for n, spec in enumerate(model.slot_types, 1):
+        type_ids[spec.name] = f"T{n}"
+        snapshot.slot_types[spec.name] = {**spec.payload(), "slotTypeId": f"T{n}", "lastUpdatedDateTime": "2026-01-01"}
+    for n, intent in enumerate(model.intents, 1):
+        slot_ids = []
+        for m, slot in enumerate(intent.slots, 1):
+            if slot.name in skip_slots:
+                continue
+            slot_id = f"S{n}{m}"
+            slot_ids.append(slot_id)
+            type_id = type_ids[slot.slot_type] if slot.custom else slot.slot_type
+            snapshot.slots[(intent.name, slot.name)] = {**slot.payload(type_id), "slotId": slot_id}
+        snapshot.intents[intent.name] = {**intent.payload(slot_ids), "intentId": f"I{n}", "parentIntentSignature": None}
+    return snapshot
+
+
+class RecordingAws:
+    """``run_aws`` 대신 호출(작업 이름과 인자)을 기록하고 새 id 를 돌려줍니다."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, service, operation, *args):
+        with self._lock:
+            self.calls.append((operation, args))
+            n = len(self.calls)
+        return {"slotTypeId": f"T-new{n}", "intentId": f"I-new{n}", "slotId": f"S-new{n}"}
+
+    def operations(self):
+        return sorted(operation for operation, _ in self.calls)
+
+    def args_of(self, operation):
+        return next(args for op, args in self.calls if op == operation)
+
+
+class DiffTest(unittest.TestCase):
+    def test_unchanged_snapshot_has_empty_plan(self):
+        model = make_model()
+        plan = diff(model, make_snapshot(model))
+        self.assertFalse(plan)
+        self.assertEqual(plan.changes, [])
+        self.assertEqual(
+            sorted(plan.unchanged),
+            ["intent:MakeReservation", "slot-type:BranchType", "slot:MakeReservation.Branch", "slot:MakeReservation.Date"],
+        )
+
+    def test_added_value_updates_only_the_slot_type(self):
+        snapshot = make_snapshot(make_model())
+        plan = diff(make_model(branches=("강남점", "홍대점", "잠실점")), snapshot)
+        self.assertEqual([(c.action, c.key) for c in plan.changes], [("update", "slot-type:BranchType")])
+        self.assertIn("+1", plan.changes[0].fields[0])
+
+    def test_reordered_values_are_not_a_change(self):
+        snapshot = make_snapshot(make_model())
+        self.assertFalse(diff(make_model(branches=("홍대점", "강남점")), snapshot))
+
+    def test_missing_slot_is_created_and_changed_slot_updated(self):
+        model = make_model(branch_prompt="지점을 알려주세요.")
+        plan = diff(model, make_snapshot(make_model(), skip_slots=("Date",)))
+        self.assertEqual(
+            sorted((c.action, c.key) for c in plan.changes),
+            [
+                ("create", "slot:MakeReservation.Date"),
+                ("update", "intent:MakeReservation"),
+                ("update", "slot:MakeReservation.Branch"),
+            ],
+        )
+        self.assertEqual(plan.get("slot:MakeReservation.Branch").fields, ("valueElicitationSetting",))
+
+    def test_new_slot_type_forces_slot_update(self):
+        model = make_model()
+        snapshot = make_snapshot(model)
+        del snapshot.slot_types["BranchType"]
+        plan = diff(model, snapshot)
+        self.assertEqual(plan.get("slot-type:BranchType").action, "create")
+        self.assertEqual(plan.get("slot:MakeReservation.Branch").fields, ("slotTypeId",))
+
+
+class CompareTest(unittest.TestCase):
+    def test_differs_ignores_server_filled_fields(self):
+        self.assertFalse(differs({"a": 1}, {"a": 1, "createdDateTime": "x"}))
+        self.assertTrue(differs({"a": [1, 2]}, {"a": [1]}))
+        self.assertTrue(differs({"a": {"b": 1}}, {"a": None}))
+
+    def test_value_diff_is_order_insensitive(self):
+        current = make_slot_type_values(["강남점", ("홍대점", ("홍대",))])
+        self.assertFalse(value_diff(make_slot_type_values([("홍대점", ("홍대",)), "강남점"]), current))
+        changed = value_diff(make_slot_type_values(["강남점", ("홍대점", ("홍익대",)), "잠실점"]), current)
+        self.assertEqual((len(changed.added), len(changed.removed), len(changed.changed)), (1, 0, 1))
+
+
+class DefinitionHashTest(unittest.TestCase):
+    def test_stable_under_value_reordering(self):
+        first = definition_hash(make_model(branches=("강남점", "홍대점", "잠실점")), "ko_KR", "0.40")
+        again = definition_hash(make_model(branches=("잠실점", "강남점", "홍대점")), "ko_KR", "0.4")
+        self.assertEqual(first, again)
+
+    def test_changes_with_definition_or_locale(self):
+        base = definition_hash(make_model(), "ko_KR", "0.40")
+        self.assertNotEqual(base, definition_hash(make_model(branch_prompt="지점은요?"), "ko_KR", "0.40"))
+        self.assertNotEqual(base, definition_hash(make_model(), "en_US", "0.40"))
+        self.assertNotEqual(base, definition_hash(make_model(), "ko_KR", "0.50"))
+
+
+class ApplyPlanTest(unittest.TestCase):
+    def test_empty_plan_makes_no_calls(self):
+        model = make_model()
+        aws = RecordingAws()
+        self.assertEqual(apply_plan(aws, LOCALE_ARGS, model, make_snapshot(model), diff(model, make_snapshot(model))), [])
+        self.assertEqual(aws.calls, [])
+
+    def test_missing_slot_is_created_existing_slot_updated(self):
+        model = make_model(branch_prompt="지점을 알려주세요.")
+        snapshot = make_snapshot(make_model(), skip_slots=("Date",))
+        aws = RecordingAws()
+        results = apply_plan(aws, LOCALE_ARGS, model, snapshot, diff(model, snapshot))
+
+        self.assertEqual(aws.operations(), ["create-slot", "update-intent", "update-slot"])
+        self.assertIn("S11", aws.args_of("update-slot"))
+        self.assertNotIn("--slot-id", aws.args_of("create-slot"))
+        # intent 최종 갱신은 slot 작업이 끝난 뒤 새 slotId 로 우선순위를 다시 씁니다.
+        self.assertEqual([r.name for r in results][-1], "intent:MakeReservation")
+        created = next(r.value for r in results if r.name == "slot:MakeReservation.Date")
+        self.assertIn(created, " ".join(aws.args_of("update-intent")))
+
+    def test_slot_type_update_keeps_id(self):
+        model = make_model(branches=("강남점", "홍대점", "잠실점"))
+        snapshot = make_snapshot(make_model())
+        aws = RecordingAws()
+        results = apply_plan(aws, LOCALE_ARGS, model, snapshot, diff(model, snapshot))
+        self.assertEqual(aws.operations(), ["update-slot-type"])
+        self.assertEqual([(r.name, r.value) for r in results], [("slot-type:BranchType", "T1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""의존성 기반 작업 스케줄러(``infra/lex_scheduler.py``)를 확인합니다.
+
+    python3 -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import contextvars
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "infra"))
+
+from lex_client import ScriptError  # noqa: E402
+from lex_scheduler import TaskGraph, raise_for_errors  # noqa: E402
+
+REQUEST_ID = contextvars.ContextVar("REQUEST_ID", default="")
+
+
+class TaskGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.order = []
+        self.lock = threading.Lock()
+
+    def task(self, name, value=None, delay=0.0, error=None):
+        def run():
+            if delay:
+                time.sleep(delay)
+            with self.lock:
+                self.order.append(name)
+            if error is not None:
+                raise error
+            return name if value is None else value
+
+        return run
+
+    def test_dependencies_run_after_their_prerequisites(self):
+        graph = TaskGraph()
+        # 선행 작업을 늦게 끝나게 해도 의존 작업은 그 뒤에 시작합니다.
+        graph.add("slot-type", self.task("slot-type", delay=0.05))
+        graph.add("intent", self.task("intent", delay=0.02))
+        graph.add("slot", self.task("slot"), ["slot-type", "intent"])
+        graph.add("priorities", self.task("priorities"), ["slot"])
+        raise_for_errors(graph.run(4))
+        self.assertEqual(self.order[2:], ["slot", "priorities"])
+        self.assertEqual(set(self.order[:2]), {"slot-type", "intent"})
+
+    def test_dependents_read_prerequisite_values(self):
+        graph = TaskGraph()
+        graph.add("create", self.task("create", value="T1"))
+        graph.add("use", lambda: f"uses {graph.value('create')}", ["create"])
+        results = graph.run(2)
+        self.assertEqual(graph.value("use"), "uses T1")
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_failure_skips_all_downstream_tasks(self):
+        graph = TaskGraph()
+        graph.add("bad", self.task("bad", error=RuntimeError("boom")))
+        graph.add("child", self.task("child"), ["bad"])
+        graph.add("grandchild", self.task("grandchild"), ["child"])
+        graph.add("independent", self.task("independent"))
+        results = {r.name: r for r in graph.run(4)}
+
+        self.assertIsInstance(results["bad"].error, RuntimeError)
+        self.assertTrue(results["child"].skipped and results["grandchild"].skipped)
+        self.assertTrue(results["independent"].ok)
+        self.assertNotIn("child", self.order)
+        self.assertNotIn("grandchild", self.order)
+        with self.assertRaises(ScriptError) as ctx:
+            raise_for_errors(list(results.values()))
+        self.assertIn("bad: boom", str(ctx.exception))
+        self.assertIn("건너뜀: child, grandchild", str(ctx.exception))
+
+    def test_results_are_in_add_order(self):
+        graph = TaskGraph()
+        delays = {"a": 0.06, "b": 0.0, "c": 0.03, "d": 0.01}
+        for name, delay in delays.items():
+            graph.add(name, self.task(name, delay=delay))
+        results = graph.run(4)
+        self.assertEqual([r.name for r in results], list(delays))
+        self.assertEqual([r.value for r in results], list(delays))
+        self.assertNotEqual(self.order, list(delays))
+
+    def test_contextvars_are_carried_into_workers(self):
+        graph = TaskGraph()
+        for n in range(6):
+            graph.add(f"t{n}", REQUEST_ID.get)
+        token = REQUEST_ID.set("bot-a")
+        try:
+            results = graph.run(3)
+        finally:
+            REQUEST_ID.reset(token)
+        self.assertEqual({r.value for r in results}, {"bot-a"})
+
+    def test_rejects_unknown_dependency_and_duplicate_name(self):
+        graph = TaskGraph()
+        graph.add("a", self.task("a"))
+        with self.assertRaises(ScriptError):
+            graph.add("a", self.task("a"))
+        with self.assertRaises(ScriptError):
+            graph.add("b", self.task("b"), ["missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()